@@ -0,0 +1,137 @@
+"""Compare compression algorithms and levels for the output archive.
+
+Usage:
+    python benchmarks/bench_compression.py --clusters 2000 --runs 3000
+
+A generated output folder mimics an extraction: split "runs_NN.json" parts, one
+"events_<cluster>.json" file per cluster and one "runs_details_<run>.json" file per
+run. The baseline zips it as compress_folder_to_zip did before, with ZipFile.write()
+and ZIP_DEFLATED. Every other variant goes through ZipVolumeWriter with the given
+algorithm and level. For each, the best time of repeat runs and the archive size
+are printed.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from collections.abc import Callable
+
+from workspace_extractor.utils.zip_volume_writer import ZipVolumeWriter
+
+
+def write_output(output: str, clusters: int, runs: int) -> None:
+    """Write an output folder with the given number of clusters and runs."""
+    generator = random.Random(42)
+    os.makedirs(output, exist_ok=True)
+
+    def dump(name: str, records: list[dict]) -> None:
+        with open(os.path.join(output, f"{name}.json"), "w") as file:
+            json.dump(records, file)
+
+    for cluster in range(clusters):
+        cluster_id = f"0612-{cluster:06d}-abcdef{cluster % 10}"
+        events = [
+            {
+                "cluster_id": cluster_id,
+                "timestamp": 1_700_000_000_000 + generator.randrange(10**9),
+                "type": generator.choice(["RUNNING", "RESIZING", "UPSIZE_COMPLETED", "TERMINATING"]),
+                "details": {
+                    "current_num_workers": generator.randrange(16),
+                    "target_num_workers": generator.randrange(16),
+                },
+            }
+            for _ in range(generator.randrange(5, 60))
+        ]
+        dump(f"events_{cluster_id}", events)
+    all_runs = []
+    for run in range(runs):
+        run_id = 10_000_000 + run
+        tasks = [
+            {
+                "task_key": f"task_{t}",
+                "existing_cluster_id": f"0612-{generator.randrange(clusters):06d}-abcdef{t}",
+                "start_time": 1_700_000_000_000 + run * 1000,
+                "end_time": 1_700_000_000_000 + run * 1000 + generator.randrange(10**6),
+                "state": {"result_state": generator.choice(["SUCCESS", "FAILED"]), "life_cycle_state": "TERMINATED"},
+            }
+            for t in range(generator.randrange(1, 6))
+        ]
+        details = {"run_id": run_id, "run_name": f"job_{run % 300}", "tasks": tasks, "trigger": "PERIODIC"}
+        all_runs.append(details)
+        dump(f"runs_details_{run_id}", [details])
+    part_size = max(len(all_runs) // 3, 1)
+    for part, start in enumerate(range(0, len(all_runs), part_size), start=1):
+        dump(f"runs_{part:02d}", all_runs[start : start + part_size])
+
+
+def zip_with_zipfile(source: str, target: str) -> str:
+    """Zip the folder with ZipFile.write() and ZIP_DEFLATED, the previous compress_folder_to_zip."""
+    with zipfile.ZipFile(f"{target}.zip", "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for file_path, arcname in ZipVolumeWriter.get_folder_entries(source):
+            zip_file.write(file_path, arcname)
+    return f"{target}.zip"
+
+
+def zip_with_writer(source: str, target: str, compression: str, level: int | None) -> str:
+    """Zip the folder with ZipVolumeWriter."""
+    method = ZipVolumeWriter.get_compression(compression)
+    writer = ZipVolumeWriter(target, None, compression=method, compresslevel=level)
+    writer.write_all(ZipVolumeWriter.get_folder_entries(source))
+    return writer.close()[0]
+
+
+def measure(build: Callable[[], str], repeat: int) -> tuple[float, int]:
+    """Return the best time of repeat runs and the size of the archive built."""
+    seconds = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path = build()
+        seconds.append(time.perf_counter() - start)
+        size = os.path.getsize(path)
+        os.remove(path)
+    return min(seconds), size
+
+
+def main() -> None:
+    """Run the benchmark and print one line per variant."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        source = os.path.join(folder, "output")
+        target = os.path.join(folder, "archive")
+        write_output(source, args.clusters, args.runs)
+        entries = list(ZipVolumeWriter.get_folder_entries(source))
+        total = sum(os.path.getsize(file_path) for file_path, _ in entries)
+        print(f"{len(entries)} files, {total / 2**20:.1f} MB")
+        variants: dict[str, Callable[[], str]] = {"ZipFile.write deflate": lambda: zip_with_zipfile(source, target)}
+        algorithms = [("stored", None), ("deflate", 1), ("deflate", None), ("deflate", 9), ("bzip2", None)]
+        algorithms.append(("lzma", None))
+        if "zstd" in ZipVolumeWriter.compressions:
+            algorithms += [("zstd", None), ("zstd", 10)]
+        for compression, level in algorithms:
+            name = f"{compression} level {level if level is not None else 'default'}"
+            variants[name] = lambda c=compression, lv=level: zip_with_writer(source, target, c, lv)
+        print(f"{'variant':<30}{'seconds':>10}{'MB':>10}{'ratio':>8}  speedup")
+        baseline = None
+        for name, build in variants.items():
+            seconds, size = measure(build, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<30}{seconds:>10.3f}{size / 2**20:>10.2f}{total / size:>8.1f}  {baseline / seconds:.1f}x")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
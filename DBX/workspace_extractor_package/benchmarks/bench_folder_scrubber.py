@@ -0,0 +1,119 @@
+"""Measure the files and bytes scrubbed per second by FolderScrubber for several process counts.
+
+Usage:
+    python benchmarks/bench_folder_scrubber.py --files 2000 --runs 40000 --processes 8
+
+A generated output folder holds one "runs_details_<run>.json" file per item and a
+large split "runs_NN.json" output. The baseline scrubs it as a script would have
+before: every file loaded, passed to UtilFile.filter_data() and dumped, one after
+another. FolderScrubber then scrubs a fresh copy with 1 process and with the given
+number of processes, with and without the entities' ScrubPlans. For each, the time,
+files per second and megabytes per second are printed, and the outputs of the full
+scrubs are checked to be identical to the baseline.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from workspace_extractor.utils.folder_scrubber import FolderScrubber
+from workspace_extractor.utils.util_file import UtilFile
+
+
+def get_run(generator: random.Random, run_id: int) -> dict:
+    """Return a run record shaped like the extracted ones."""
+    user = f"user{generator.randrange(50)}.name@example.com"
+    return {
+        "run_id": run_id,
+        "run_name": f"nightly_etl_{run_id % 300}",
+        "creator_user_name": user,
+        "start_time": 1_700_000_000_000 + run_id * 1000,
+        "state": {"life_cycle_state": "TERMINATED", "result_state": "SUCCESS", "state_message": ""},
+        "tasks": [
+            {
+                "task_key": f"task_{t}",
+                "cluster_instance": {"cluster_id": f"0612-{run_id:06d}-abcdef{t}", "spark_context_id": "1234"},
+                "notebook_task": {"notebook_path": f"/Repos/{user}/etl/step_{t}"},
+                "new_cluster": {"spark_version": "14.3.x-scala2.12", "custom_tags": {"team": "data-platform"}},
+            }
+            for t in range(3)
+        ],
+    }
+
+
+def write_output(output: str, files: int, runs: int) -> None:
+    """Write an output folder with per run files and a split runs output."""
+    generator = random.Random(42)
+    os.makedirs(output)
+    for run_id in range(files):
+        UtilFile.write_file_request_(output, f"runs_details_{run_id}", [get_run(generator, run_id)])
+    all_runs = [get_run(generator, run_id) for run_id in range(runs)]
+    half = len(all_runs) // 2
+    for part, records in enumerate([all_runs[:half], all_runs[half:]], start=1):
+        UtilFile.write_file_request_(output, f"runs_{part:02d}", records, "runs", part)
+
+
+def scrub_serially(source: str) -> None:
+    """Scrub every JSON file in place with filter_data(), one after another."""
+    for name in sorted(os.listdir(source)):
+        if name.endswith(".json"):
+            path = os.path.join(source, name)
+            with open(path) as file:
+                data = UtilFile.filter_data(json.load(file), [])
+            with open(path, "w") as file:
+                file.write(json.dumps(data))
+
+
+def read_folder(folder: str) -> dict[str, str]:
+    """Return the content of every JSON file of a folder."""
+    contents = {}
+    for name in os.listdir(folder):
+        if name.endswith(".json"):
+            with open(os.path.join(folder, name)) as file:
+                contents[name] = file.read()
+    return contents
+
+
+def main() -> None:
+    """Run the benchmark and print one line per variant."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=40_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        source = os.path.join(folder, "source")
+        write_output(source, args.files, args.runs)
+        names = [name for name in os.listdir(source) if name.endswith(".json")]
+        total = sum(os.path.getsize(os.path.join(source, name)) for name in names)
+        print(f"{len(names)} files, {total / 2**20:.1f} MB, {os.cpu_count()} CPUs")
+        print(f"{'variant':<28}{'seconds':>10}{'files/s':>10}{'MB/s':>8}")
+
+        def report(name: str, seconds: float) -> None:
+            print(f"{name:<28}{seconds:>10.2f}{len(names) / seconds:>10.0f}{total / 2**20 / seconds:>8.1f}")
+
+        baseline = os.path.join(folder, "baseline")
+        shutil.copytree(source, baseline)
+        start = time.perf_counter()
+        scrub_serially(baseline)
+        report("serial filter_data", time.perf_counter() - start)
+        expected = read_folder(baseline)
+        for use_plans in (False, True):
+            for processes in sorted({1, args.processes}):
+                target = os.path.join(folder, f"scrubbed_{use_plans}_{processes}")
+                stats = FolderScrubber(source, target, processes=processes, use_plans=use_plans).run()
+                report(f"FolderScrubber{' plans' if use_plans else ''} x{processes}", stats["seconds"])
+                if not use_plans:
+                    assert read_folder(target) == expected
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare building the runs table as a DataFrame of dicts and as a columnar table.
+
+Usage:
+    python benchmarks/bench_mapping_tables.py --runs 50000 --tasks 4
+
+Both variants stream the same generated "runs.json" file. The dict variant builds
+pd.DataFrame(Mapping.get_runs(output)) as the mapping did before; the columnar
+variant builds MappingIndex.build_runs_table(output). For each, the best build time,
+the tracemalloc peak and the memory still held by the result are printed, next to
+the time spent decoding the JSON alone, which both variants share.
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+
+from workspace_extractor.mapping import Mapping
+from workspace_extractor.mapping_index import MappingIndex
+
+
+def write_runs(output: str, runs: int, tasks: int, jobs: int) -> None:
+    """Write a "runs.json" file with the given number of runs, tasks per run and job names."""
+    records = [
+        {
+            "run_id": 10_000_000 + i,
+            "run_name": f"job_{i % jobs}",
+            "start_time": 1_700_000_000_000 + i * 1000,
+            "end_time": 1_700_000_000_000 + i * 1000 + 500,
+            "tasks": [
+                {
+                    "existing_cluster_id": f"0612-{i % (jobs * 2):06d}-abcdef{t}",
+                    "state": {"result_state": "SUCCESS" if i % 7 else "FAILED"},
+                }
+                for t in range(tasks)
+            ],
+        }
+        for i in range(runs)
+    ]
+    with open(os.path.join(output, "runs.json"), "w") as file:
+        json.dump(records, file)
+
+
+def measure(build: Callable[[], Any], repeat: int) -> tuple[float, int, int]:
+    """Return the best build time of repeat runs, then the peak and held memory of one traced run.
+
+    Memory is traced separately since tracemalloc slows allocations down.
+    """
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = build()
+        seconds.append(time.perf_counter() - start)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(seconds), peak, held
+
+
+def main() -> None:
+    """Run the benchmark and print one line per variant."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50_000)
+    parser.add_argument("--tasks", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    output = tempfile.mkdtemp()
+    try:
+        write_runs(output, args.runs, args.tasks, args.jobs)
+        variants = {
+            "JSON decoding only": lambda: deque(MappingIndex.iter_run_values(output), maxlen=0),
+            "DataFrame of dicts": lambda: pd.DataFrame(Mapping.get_runs(output)),
+            "ColumnarTable": lambda: MappingIndex.build_runs_table(output),
+        }
+        print(f"{args.runs} runs x {args.tasks} tasks, {args.jobs} jobs")
+        print(f"{'variant':<20}{'seconds':>10}{'peak MB':>10}{'held MB':>10}")
+        results = {}
+        for name, build in variants.items():
+            seconds, peak, held = measure(build, args.repeat)
+            results[name] = (seconds, peak, held)
+            print(f"{name:<20}{seconds:>10.3f}{peak / 2**20:>10.1f}{held / 2**20:>10.1f}")
+        decoding = results["JSON decoding only"][0]
+        baseline, columnar = results["DataFrame of dicts"], results["ColumnarTable"]
+        print(
+            f"ColumnarTable: table construction (time beyond JSON decoding) "
+            f"{(baseline[0] - decoding) / max(columnar[0] - decoding, 1e-9):.1f}x faster, "
+            f"{baseline[1] / columnar[1]:.1f}x lower peak, {baseline[2] / max(columnar[2], 1):.1f}x less memory held"
+        )
+    finally:
+        shutil.rmtree(output, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
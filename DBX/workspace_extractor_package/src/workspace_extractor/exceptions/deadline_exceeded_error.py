@@ -0,0 +1,4 @@
+class DeadlineExceededError(Exception):
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(message)
@@ -0,0 +1,5 @@
+class ThrottledError(Exception):
+    def __init__(self, message=None, status_code=None):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
@@ -0,0 +1,272 @@
+import glob
+import itertools
+import json
+import os
+import re
+import shutil
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from workspace_extractor.utils.json_stream import JsonArrayReader, RollingJsonWriter
+from workspace_extractor.utils.manifest import Manifest
+
+
+class Incremental:
+    @staticmethod
+    def get_output_files(output: str, name: str) -> list[str]:
+        """List the files holding one output, whether it was split or not.
+
+        Args:
+            output (str): Output directory.
+            name (str): Output name without extension, e.g. "runs" or "events_1234".
+
+        Returns:
+            list[str]: Paths of "<name>.json" or of its "<name>_NN.json" split parts,
+                in part order, as listed in the output manifest. Files of other outputs
+                sharing the prefix are excluded.
+
+        """
+        return Manifest.get_files(output, name)
+
+    @staticmethod
+    def read_records(output: str | None, name: str) -> list[Any]:
+        """Read every record of an output, concatenating its split parts.
+
+        Args:
+            output (str | None): Output directory. If None, returns an empty list.
+            name (str): Output name without extension.
+
+        Returns:
+            list[Any]: Records in file order. Empty if the output doesn't exist.
+
+        """
+        if not output:
+            return []
+        records = []
+        for f in Incremental.get_output_files(output, name):
+            with open(f) as file:
+                records.extend(json.load(file))
+        return records
+
+    @staticmethod
+    def get_watermarks(previous_output: str) -> dict[str, Any]:
+        """Compute the points up to which a previous extraction already has data.
+
+        Args:
+            previous_output (str): Output directory of the previous extraction.
+
+        Returns:
+            dict[str, Any]: Dictionary with the following keys:
+                - runs: Highest run end_time, lowered to the start_time of any run that
+                  was still active (end_time 0) so it is fetched again; None if no runs
+                - queries: Highest query_start_time_ms; None if no queries
+                - events: Highest event timestamp, keyed by cluster ID
+
+        Example:
+            watermarks = Incremental.get_watermarks("./output_last_week")
+            # {"runs": 1718000000000, "queries": 1718000100000, "events": {"0612-abc": 1717999000000}}
+
+        """
+        runs = [run for run in Incremental.read_records(previous_output, "runs") if run]
+        end_times = [run.get("end_time") or 0 for run in runs]
+        runs_watermark = max(end_times) if end_times and max(end_times) > 0 else None
+        active_starts = [run.get("start_time") or 0 for run in runs if not run.get("end_time")]
+        if runs_watermark is not None and active_starts:
+            runs_watermark = min(runs_watermark, min(active_starts))
+
+        query_starts = [
+            query.get("query_start_time_ms") or 0 for query in Incremental.read_records(previous_output, "queries")
+        ]
+        queries_watermark = max(query_starts) if query_starts and max(query_starts) > 0 else None
+
+        return {
+            "runs": runs_watermark,
+            "queries": queries_watermark,
+            "events": Incremental.get_events_watermarks(previous_output),
+        }
+
+    @staticmethod
+    def get_events_watermarks(previous_output: str) -> dict[str, int]:
+        """Return the timestamp of the last event saved for each cluster.
+
+        Args:
+            previous_output (str): Output directory of the previous extraction.
+
+        Returns:
+            dict[str, int]: Highest event timestamp in milliseconds, keyed by cluster ID.
+                Clusters without events are left out. The events files are taken from the
+                manifest, or from an "events_*.json" scan for outputs written without one.
+
+        """
+        watermarks: dict[str, int] = {}
+        entries = Manifest.load(previous_output) or {}
+        files = [
+            (entry["name"][len("events_") :], os.path.join(previous_output, entry["file"]))
+            for entry in entries.values()
+            if entry.get("entity") == "events"
+        ]
+        if not files:
+            pattern = re.compile(r"^events_(.+?)(_\d{2,})?\.json$")
+            for f in glob.glob(os.path.join(glob.escape(previous_output), "events_*.json")):
+                match = pattern.match(os.path.basename(f))
+                if match:
+                    files.append((match.group(1), f))
+        for cluster_id, f in files:
+            if not os.path.exists(f):
+                continue
+            with open(f) as file:
+                timestamps = [event.get("timestamp") or 0 for event in json.load(file) if event]
+            if timestamps:
+                watermarks[cluster_id] = max(watermarks.get(cluster_id, 0), max(timestamps))
+        return watermarks
+
+    @staticmethod
+    def get_finished_run_ids(previous_output: str) -> set[str]:
+        """Return the IDs of the runs that had already ended in a previous extraction.
+
+        Their details can't change anymore, so the saved runs_details files can be
+        reused instead of being fetched again.
+
+        Args:
+            previous_output (str): Output directory of the previous extraction.
+
+        Returns:
+            set[str]: Run IDs (as strings) with a non-zero end_time.
+
+        """
+        return {
+            str(run.get("run_id"))
+            for run in Incremental.read_records(previous_output, "runs")
+            if run and (run.get("end_time") or 0) > 0
+        }
+
+    @staticmethod
+    def iter_records(files: list[str]) -> Iterator[Any]:
+        """Yield the records of output files one at a time, in file order."""
+        for f in files:
+            yield from JsonArrayReader(f)
+
+    @staticmethod
+    def dedupe(
+        records: Iterable[Any],
+        key: tuple[str, ...],
+        time_field: str | None = None,
+        since: int | None = None,
+    ) -> Iterator[Any]:
+        """Yield the first record of each key, skipping empty records and records older than since.
+
+        Only the keys seen so far are kept in memory, so records can be streamed.
+
+        """
+        seen = set()
+        for record in records:
+            if not record:
+                continue
+            record_key = tuple(record.get(field) for field in key)
+            if record_key in seen:
+                continue
+            if since is not None and time_field and (record.get(time_field) or 0) < since:
+                continue
+            seen.add(record_key)
+            yield record
+
+    @staticmethod
+    def merge_records(
+        new_records: list[Any],
+        previous_records: list[Any],
+        key: tuple[str, ...],
+        time_field: str | None = None,
+        since: int | None = None,
+    ) -> list[Any]:
+        """Merge freshly fetched records with the records of a previous extraction.
+
+        New records come first, as the APIs return the newest data first, followed by
+        the previous records whose key was not fetched again. When since is given,
+        records older than it are dropped so the result covers the same window as a
+        full extraction.
+
+        Args:
+            new_records (list[Any]): Records fetched by the incremental run.
+            previous_records (list[Any]): Records of the previous extraction.
+            key (tuple[str, ...]): Fields identifying a record, e.g. ("run_id",).
+            time_field (str | None): Field holding the record time in milliseconds.
+                Defaults to None.
+            since (int | None): Oldest time to keep, in milliseconds. Defaults to None.
+
+        Returns:
+            list[Any]: Merged records without duplicates.
+
+        """
+        return list(Incremental.dedupe(itertools.chain(new_records, previous_records), key, time_field, since))
+
+    @staticmethod
+    def merge_output(
+        previous_output: str,
+        output: str,
+        name: str,
+        key: tuple[str, ...],
+        time_field: str | None = None,
+        since: int | None = None,
+        max_file_bytes: int = 10 * 1024 * 1024,
+    ) -> tuple[int, int]:
+        """Merge an output fetched incrementally with the same output of a previous run.
+
+        Rewrites "<output>/<name>.json", split into "<name>_NN.json" parts at
+        max_file_bytes, with the merged records, as merge_records() would order them.
+        Both outputs are streamed record by record into a RollingJsonWriter, so only
+        the keys already written are held in memory. The fetched files are moved to
+        a hidden ".merge_<name>" folder while they are read, and put back if the
+        merge fails.
+
+        Args:
+            previous_output (str): Output directory of the previous extraction.
+            output (str): Output directory of the current extraction.
+            name (str): Output name without extension, e.g. "runs".
+            key (tuple[str, ...]): Fields identifying a record.
+            time_field (str | None): Field holding the record time. Defaults to None.
+            since (int | None): Oldest time to keep, in milliseconds. Defaults to None.
+            max_file_bytes (int): Maximum size of a merged file in bytes. Defaults to 10 MiB.
+
+        Returns:
+            tuple[int, int]: Number of merged records and number of freshly fetched records.
+
+        """
+        staging = os.path.join(output, f".merge_{name}")
+        entries = Manifest.load(output) or {}
+        os.makedirs(staging, exist_ok=True)
+        moved = []
+        for f in Incremental.get_output_files(output, name):
+            moved.append((f, os.path.join(staging, os.path.basename(f))))
+            os.replace(*moved[-1])
+        new_count = 0
+
+        def read_new() -> Iterator[Any]:
+            nonlocal new_count
+            for record in Incremental.iter_records([staged for _, staged in moved]):
+                new_count += 1
+                yield record
+
+        previous_files = Incremental.get_output_files(previous_output, name) if previous_output else []
+        records = itertools.chain(read_new(), Incremental.iter_records(previous_files))
+        writer = RollingJsonWriter(output, name, max_file_bytes)
+        try:
+            for record in Incremental.dedupe(records, key, time_field, since):
+                writer.write([record])
+            writer.close()
+        except Exception:
+            writer.discard()
+            for f, staged in moved:
+                os.replace(staged, f)
+                entry = entries.get(os.path.basename(f))
+                if entry:
+                    Manifest.record(output, name, entry["records"], entry.get("part"), entry.get("sha256"))
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        shutil.rmtree(staging)
+        for f, _ in moved:
+            # Fetched parts beyond the last merged one are gone; the others were rewritten.
+            part = os.path.basename(f)[len(name) + 1 : -len(".json")]
+            if part.isdigit() and writer.part and int(part) > writer.part:
+                Manifest.record_removal(output, name, int(part))
+        return writer.count, new_count
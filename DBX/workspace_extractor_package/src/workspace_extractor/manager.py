@@ -1,4 +1,5 @@
 import os
+import threading
 
 from collections.abc import Generator
 from typing import Any
@@ -8,6 +9,15 @@ import requests
 from tqdm.notebook import tqdm_notebook
 
 from workspace_extractor.exceptions.no_cluster_events_error import NoClusterEventsError
+from workspace_extractor.utils.checkpoint import Checkpoint
+from workspace_extractor.utils.deadline import Deadline
+from workspace_extractor.utils.fan_out import FanOut
+from workspace_extractor.utils.hedger import Hedger
+from workspace_extractor.utils.http_session import HttpSession
+from workspace_extractor.utils.json_stream import RollingJsonWriter
+from workspace_extractor.utils.projection import Projection
+from workspace_extractor.utils.rate_limiter import RateLimiter
+from workspace_extractor.utils.time_slicer import TimeSlicer
 from workspace_extractor.utils.util import Util
 
 
@@ -15,7 +25,22 @@ class Manager:
     results_count: dict[str, int] = {}
 
     def __init__(
-        self, input_url: str | None = None, input_token: str | None = None, input_output: str = "./output"
+        self,
+        input_url: str | None = None,
+        input_token: str | None = None,
+        input_output: str = "./output",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = True,
+        keep_alive: bool = True,
+        max_workers: int = 1,
+        checkpoint: bool = False,
+        max_concurrency: int = 16,
+        max_retries: int = 5,
+        timeout: tuple[float, float] | None = (10.0, 300.0),
+        hedge: bool = False,
+        max_file_bytes: int = 10 * 1024 * 1024,
+        projections: dict[str, Projection] | None = None,
     ) -> None:
         """Initialize the Manager instance for API data extraction.
 
@@ -29,6 +54,40 @@ class Manager:
                 Defaults to None.
             input_output (str): Directory path for saving output files. Directory will be
                 created if it doesn't exist. Defaults to "./output".
+            pool_connections (int): Number of per-host connection pools cached by the
+                shared HTTP session. Defaults to 10.
+            pool_maxsize (int): Maximum number of open connections per host in the
+                shared HTTP session. Defaults to 10.
+            pool_block (bool): Whether requests wait for a free connection once
+                pool_maxsize connections to the workspace are in use. Defaults to True.
+            keep_alive (bool): Whether connections are kept open and reused between
+                requests. Defaults to True.
+            max_workers (int): Maximum number of concurrent requests used by fan-out
+                operations such as per-cluster events. 1 keeps them serial. Defaults to 1.
+            checkpoint (bool): Whether to persist pagination cursors and completed fan-out
+                items under "<input_output>/.checkpoints" so that an interrupted extraction
+                resumes where it stopped when run again on the same output directory.
+                Defaults to False.
+            max_concurrency (int): Maximum number of requests in flight per endpoint
+                family. The rate limiter lowers it when the workspace throttles requests
+                and raises it back as they succeed. Defaults to 16.
+            max_retries (int): Number of times a throttled (429 or 503) request is
+                retried before the endpoint fails. Defaults to 5.
+            timeout (tuple[float, float] | None): (connect, read) timeouts in seconds of
+                every request, so a stalled call fails instead of hanging. None waits
+                forever. Defaults to (10.0, 300.0).
+            hedge (bool): Whether GET requests still running after the p95 latency
+                measured so far for their endpoint are sent a second time, keeping
+                whichever copy answers first. The copy takes its own rate limiter slot.
+                Call close() to stop the hedging threads. Defaults to False.
+            max_file_bytes (int): Maximum size in bytes of an output file. Larger outputs
+                are written as "<name>_01.json", "<name>_02.json", ... parts of at most
+                this size. Defaults to 10 MiB.
+            projections (dict[str, Projection] | None): Projection applied to each page
+                of an endpoint as it is received, keyed by output name (e.g. "runs"),
+                dropping or keeping fields and anonymizing records before they are
+                written. Projection.get_defaults() drops notebook parameters and Spark
+                environment variables. Defaults to None (records are saved as received).
 
         Returns:
             None
@@ -36,6 +95,9 @@ class Manager:
         Side Effects:
             - Creates output directory if it doesn't exist
             - Initializes internal utility instance
+            - Creates the shared connection-pooled HTTP session reused by every get_and_save call
+            - Creates the rate limiter shared by every request
+            - Sets self.deadline to None; assign a Deadline to bound the whole extraction
             - Stores configuration for subsequent API calls
 
         """
@@ -45,6 +107,22 @@ class Manager:
         self.token = input_token
         self.output = input_output
         self.api_utl = Util()
+        self.http_session = HttpSession(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
+        self.rate_limiter = RateLimiter(max_concurrency=max_concurrency, max_retries=max_retries)
+        self.hedger = Hedger(rate_limiter=self.rate_limiter) if hedge else None
+        self.deadline: Deadline | None = None
+        self.max_workers = max_workers
+        self.max_file_bytes = max_file_bytes
+        self.projections = projections or {}
+        self.summary_sections: dict[str, Any] = {}
+        self.checkpoint = Checkpoint(self.output) if checkpoint else None
+        self._lock = threading.Lock()
         os.makedirs(self.output, exist_ok=True)
 
     def show_results(self, days: int | str) -> None:
@@ -83,7 +161,10 @@ class Manager:
         """Write the results_count dictionary to a JSON file using the Util class.
 
         Saves the current results_count dictionary containing the counts of different
-        data types collected to a JSON file in the configured output directory.
+        data types collected to a JSON file in the configured output directory, together
+        with the extra summary_sections (e.g. the get_metadata schedule), the
+        connection-reuse statistics of the shared HTTP session and the per-endpoint
+        statistics of the rate limiter (and of the hedger when hedging is enabled).
 
         Args:
             filename (str): Name of the output file (without extension).
@@ -95,13 +176,34 @@ class Manager:
         Side Effects:
             - Creates a JSON file in the output directory
             - File will be named "{filename}.json"
+            - Adds every summary_sections entry, a "connections" entry with the
+              HTTP session statistics and a "rate_limits" entry with the throttles
+              and effective requests per second of each endpoint family
 
         Example:
             manager.write_results_count_json("summary_counts")
             # Creates: ./output/summary_counts.json
 
         """
-        Util.write_file_request_(self.output, filename, self.results_count)
+        summary = dict(self.results_count)
+        summary.update(self.summary_sections)
+        summary["connections"] = self.http_session.get_stats()
+        summary["rate_limits"] = self.rate_limiter.get_stats()
+        if self.hedger:
+            summary["hedging"] = self.hedger.get_stats()
+        Util.write_file_request_(self.output, filename, summary)
+
+    def close(self) -> None:
+        """Stop the hedging threads and close the pooled HTTP connections.
+
+        Side Effects:
+            - Shuts down the hedger's thread pool, once its requests are done
+            - Closes the connections of the shared HTTP session
+
+        """
+        if self.hedger:
+            self.hedger.close()
+        self.http_session.close()
 
     def generator(self) -> Generator[None, None, None]:
         """Create an infinite generator for pagination loops.
@@ -145,6 +247,13 @@ class Manager:
         pb_message: str | None = None,
         paging_pb: bool = False,
         full_response: bool = False,
+        accumulate: bool = False,
+        stream: bool = False,
+        checkpoint_group: str | None = None,
+        time_slicing: str | None = None,
+        time_window: tuple[int, int] | None = None,
+        max_slices: int = 8,
+        projection: Projection | None = None,
     ) -> tuple[bool, str]:
         """Fetch data from an API endpoint with pagination support and save results to a file.
 
@@ -178,6 +287,30 @@ class Manager:
                 Defaults to False.
             full_response (bool): Whether to save the complete API response or just
                 the extracted data. Defaults to False.
+            accumulate (bool): Whether to add the number of records to the existing
+                results_count entry instead of replacing it. Used by fan-out calls that
+                share one name_output across many suffixes. Defaults to False.
+            stream (bool): Whether to append each page's records to the output file as
+                the page arrives instead of collecting every page in memory first. The
+                file layout and content are identical in both modes; streaming keeps
+                memory flat for endpoints with many pages. Defaults to False.
+            checkpoint_group (str | None): Fan-out group the call belongs to, e.g. "events".
+                When checkpointing is enabled, a successful call is recorded as a completed
+                item of the group instead of keeping a per-page checkpoint. Defaults to None.
+            time_slicing (str | None): TimeSlicer preset ("runs" or "queries") naming the
+                time filter of a cursor-paginated endpoint. With time_window, the window
+                is split into time slices whose cursor chains are fetched concurrently.
+                Defaults to None (a single cursor chain).
+            time_window (tuple[int, int] | None): (start, end) of the window in
+                milliseconds, used with time_slicing. Defaults to None.
+            max_slices (int): Maximum number of time slices, and of slices fetched at the
+                same time. The actual count adapts to the volume seen in the first page.
+                Defaults to 8.
+            projection (Projection | None): Fields to keep or drop and anonymization
+                applied to the records of each page before they are written or kept in
+                memory. Time-sliced calls apply it once the slices are merged, as the
+                merge needs the time and key fields. Defaults to None (the projection
+                configured for name_output in self.projections, if any).
 
         Returns:
             tuple[bool, str]: A tuple containing:
@@ -189,8 +322,14 @@ class Manager:
             Exception: For other API errors or connection failures
 
         Side Effects:
-            - Creates output files in the configured output directory
+            - Creates output files in the configured output directory, rolling over to
+              "<name>_NN.json" parts whenever a file reaches max_file_bytes (in streaming
+              mode, partially written files are removed if the request fails, unless they
+              are kept for resuming from a checkpoint)
+            - With checkpointing enabled, saves the pagination cursor after every streamed
+              page and resumes from it, or skips the call entirely if it already completed
             - Updates self.results_count with the number of records processed
+              (thread-safe, so concurrent calls can share one Manager)
             - Updates progress bars if provided
             - Writes error logs to the output directory if exceptions occur
 
@@ -232,54 +371,339 @@ class Manager:
         if default_params is None:
             default_params = {}
         skip = 0
+        writer = None
+        file_output = f"{name_output}{suffix}"
+        projection = projection or self.projections.get(name_output)
+        checkpoint = self.checkpoint if self.checkpoint and not checkpoint_group else None
+        state = checkpoint.load(file_output) if checkpoint else None
         if pb:
             (pb.set_description(f"{pb_message}") if pb_message else pb.set_description(f"Processing {path}"))
+        if state and state.get("done"):
+            if pb:
+                pb.update(1)
+            self.add_results_count(name_output, state["records"], accumulate)
+            return False, "Data restored from checkpoint"
         result = False, "Data fetched and saved successfully"
+        sliced = bool(time_slicing and time_window)
+        streaming = stream and not sliced
         try:
             new_params = default_params.copy()
             pb_paging = None
-            file_output = f"{name_output}{suffix}"
-            gen = self.generator()
-            if paging_pb:
-                pb_paging = tqdm_notebook(gen, desc=f"Pages in {path}")
-            for _ in gen:
-                new_params = self.api_utl.get_params(counter, new_params, next_page_token, offset, use_paging, skip)
-                response = self.get_response(body, new_params, path, post, url_api)
-                json_data = self.api_utl.get_full_json(
-                    array_field,
-                    full_json,
-                    name_output,
+            if streaming:
+                writer = self.resume_writer(file_output, state) if state else None
+                if writer:
+                    new_params = state["params"]
+                    counter = state["pages"]
+                    next_page_token = state["next_page_token"]
+                    offset = state["offset"]
+                    skip = state["skip"]
+                    has_more = state["has_more"]
+                else:
+                    writer = RollingJsonWriter(self.output, file_output, self.max_file_bytes)
+            if sliced:
+                full_json = self.get_time_slices(
                     path,
-                    response,
-                    full_response,
+                    name_output,
+                    new_params,
+                    time_slicing,
+                    time_window,
+                    max_slices,
+                    array_field=array_field,
+                    use_paging=use_paging,
+                    post=post,
+                    body=body,
+                    url_api=url_api,
                     cloud_provider=cloud_provider,
+                    full_response=full_response,
                 )
-                paging = self.api_utl.get_paging(json_data)
-                offset = self.api_utl.get_offset(json_data, offset)
-                skip = paging.get("has_skip")
-                has_more = self.api_utl.get_has_more(json_data, offset)
-                next_page_token = self.api_utl.get_page_token(paging)
-                counter += 1
+                if projection:
+                    full_json = projection.apply(full_json)
+            else:
+                gen = self.generator()
+                if paging_pb:
+                    pb_paging = tqdm_notebook(gen, desc=f"Pages in {path}")
+                for _ in gen:
+                    if not has_more:
+                        break
+                    new_params = self.api_utl.get_params(counter, new_params, next_page_token, offset, use_paging, skip)
+                    response = self.get_response(body, new_params, path, post, url_api)
+                    page_json = [] if writer or projection else full_json
+                    json_data = self.api_utl.get_full_json(
+                        array_field,
+                        page_json,
+                        name_output,
+                        path,
+                        response,
+                        full_response,
+                        cloud_provider=cloud_provider,
+                    )
+                    if projection:
+                        page_json = projection.apply(page_json)
+                    if writer:
+                        writer.write(page_json)
+                    elif projection:
+                        full_json.extend(page_json)
+                    paging = self.api_utl.get_paging(json_data)
+                    offset = self.api_utl.get_offset(json_data, offset)
+                    skip = paging.get("has_skip")
+                    has_more = self.api_utl.get_has_more(json_data, offset)
+                    next_page_token = self.api_utl.get_page_token(paging)
+                    counter += 1
+                    if checkpoint and writer:
+                        writer.flush()
+                        page_state = {
+                            "params": new_params,
+                            "pages": counter,
+                            "next_page_token": next_page_token,
+                            "offset": offset,
+                            "skip": skip,
+                            "has_more": bool(has_more),
+                            **writer.get_state(),
+                        }
+                        checkpoint.save_page(file_output, page_state)
+                    if paging_pb and pb_paging:
+                        pb_paging.update(1)
                 if paging_pb and pb_paging:
-                    pb_paging.update(1)
-                if not has_more:
-                    break
-            if paging_pb and pb_paging:
-                pb_paging.close()
-            Util.write_file_request_(self.output, file_output, full_json)
-            Util.check_file_request_(self.output, file_output, full_json)
+                    pb_paging.close()
+            if not writer:
+                writer = RollingJsonWriter(self.output, file_output, self.max_file_bytes)
+                writer.write(full_json)
+            writer.close()
+            records = writer.count
+            if checkpoint:
+                checkpoint.complete(file_output, records)
+            elif self.checkpoint and checkpoint_group:
+                self.checkpoint.add_completed_item(checkpoint_group, file_output, records)
         except Exception as e:
+            if writer and checkpoint and streaming:
+                writer.suspend()
+            elif writer:
+                writer.discard()
             local_vars = locals().copy()
-            Util.write_log(self.output, e, local_vars)
+            with self._lock:
+                Util.write_log(self.output, e, local_vars)
             error_message = f"Error while processing url: {url_api}. {str(e)}"
             result = True, error_message
             print(f"Error fetching {name_output.replace('_', ' ')}: {error_message}")
         if pb:
             pb.update(1)
-        self.results_count[name_output] = len(full_json)
+        self.add_results_count(name_output, writer.count if writer else len(full_json), accumulate)
 
         return result
 
+    def get_pages(
+        self,
+        path: str | None,
+        name_output: str,
+        params: dict[str, Any],
+        array_field: str | None = None,
+        use_paging: bool = False,
+        post: bool = False,
+        body: dict[str, Any] | None = None,
+        url_api: str = "",
+        cloud_provider: str = "",
+        full_response: bool = False,
+        max_pages: int | None = None,
+    ) -> tuple[list[Any], bool]:
+        """Follow the cursor chain of an endpoint and collect its records in memory.
+
+        Args:
+            path (str | None): API endpoint path, as in get_and_save().
+            name_output (str): Output name, used as the array field when array_field is None.
+            params (dict[str, Any]): Query parameters of the first page.
+            array_field (str | None): JSON field containing the records. Defaults to None.
+            use_paging (bool): Whether to follow pagination. Defaults to False.
+            post (bool): Whether to use POST instead of GET. Defaults to False.
+            body (dict[str, Any] | None): Request body for POST requests. Defaults to None.
+            url_api (str): Base URL of the API. Defaults to "".
+            cloud_provider (str): Cloud provider identifier. Defaults to "".
+            full_response (bool): Whether to keep the complete responses. Defaults to False.
+            max_pages (int | None): Stop after this many pages. Defaults to None (all pages).
+
+        Returns:
+            tuple[list[Any], bool]: Records of every page fetched, and whether the
+                endpoint had more pages when the chain was stopped.
+
+        """
+        records: list[Any] = []
+        new_params = params.copy()
+        counter = 0
+        next_page_token = ""
+        offset = -1
+        skip = 0
+        has_more = True
+        while has_more and (max_pages is None or counter < max_pages):
+            new_params = self.api_utl.get_params(counter, new_params, next_page_token, offset, use_paging, skip)
+            response = self.get_response(body or {}, new_params, path, post, url_api)
+            json_data = self.api_utl.get_full_json(
+                array_field, records, name_output, path, response, full_response, cloud_provider=cloud_provider
+            )
+            paging = self.api_utl.get_paging(json_data)
+            offset = self.api_utl.get_offset(json_data, offset)
+            skip = paging.get("has_skip")
+            has_more = self.api_utl.get_has_more(json_data, offset) if use_paging else False
+            next_page_token = self.api_utl.get_page_token(paging)
+            counter += 1
+        return records, bool(has_more)
+
+    def get_time_slices(
+        self,
+        path: str | None,
+        name_output: str,
+        params: dict[str, Any],
+        time_slicing: str,
+        time_window: tuple[int, int],
+        max_slices: int = 8,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Fetch a newest-first, cursor-paginated endpoint as concurrent time slices.
+
+        The first page of the whole window is fetched first. If the endpoint has more
+        pages, the time span covered by that page sets how many slices the rest of
+        the window is split into (see TimeSlicer.get_slice_count()), and the cursor
+        chain of every slice is followed on its own thread. Records are merged newest
+        first and the duplicates found on slice boundaries are dropped.
+
+        Args:
+            path (str | None): API endpoint path.
+            name_output (str): Output name, e.g. "runs".
+            params (dict[str, Any]): Query parameters shared by every slice.
+            time_slicing (str): TimeSlicer preset, "runs" or "queries".
+            time_window (tuple[int, int]): (start, end) of the window in milliseconds.
+            max_slices (int): Maximum number of slices. Defaults to 8.
+            **kwargs (Any): Other get_pages() arguments (array_field, use_paging, post,
+                body, url_api, cloud_provider, full_response).
+
+        Returns:
+            list[Any]: Records of the window, newest first, without duplicates.
+
+        Raises:
+            Exception: If any slice failed, with the number of failed slices.
+
+        Side Effects:
+            - Stores the number of slices and first page records in
+              self.summary_sections["time_slices"][name_output]
+
+        """
+        preset = TimeSlicer.get_preset(time_slicing)
+        start, end = time_window
+        first_page, has_more = self.get_pages(
+            path, name_output, {**params, preset["from"]: start, preset["to"]: end}, max_pages=1, **kwargs
+        )
+        slices: list[tuple[int, int]] = []
+        if has_more:
+            times = [record.get(preset["time_field"]) for record in first_page if record.get(preset["time_field"])]
+            oldest = min(times) if times else end
+            count = TimeSlicer.get_slice_count(first_page, preset["time_field"], start, max_slices)
+            slices = TimeSlicer.get_slices(start, oldest, count) if times else [(start, end)]
+        slice_records: list[list[Any]] = [[] for _ in slices]
+
+        def fetch_slice(index: int) -> tuple[bool, str]:
+            slice_start, slice_end = slices[index]
+            slice_params = {**params, preset["from"]: slice_start, preset["to"]: slice_end}
+            slice_records[index], _ = self.get_pages(path, name_output, slice_params, **kwargs)
+            return False, "Data fetched successfully"
+
+        results = FanOut.run(range(len(slices)), fetch_slice, max_workers=len(slices))
+        failed = [message for error, message in results if error]
+        if failed:
+            raise Exception(f"{len(failed)} of {len(slices)} time slices failed: {failed[0]}")
+        with self._lock:
+            self.summary_sections.setdefault("time_slices", {})[name_output] = {
+                "slices": len(slices),
+                "first_page_records": len(first_page),
+            }
+        return TimeSlicer.merge([first_page, *slice_records], preset["key"])
+
+    def add_results_count(self, name_output: str, records: int, accumulate: bool = False) -> None:
+        """Record the number of records saved for an output.
+
+        Args:
+            name_output (str): Key in results_count, e.g. "runs" or "events".
+            records (int): Number of records saved.
+            accumulate (bool): Whether to add to the existing count instead of
+                replacing it. Defaults to False.
+
+        """
+        with self._lock:
+            previous = self.results_count.get(name_output, 0) if accumulate else 0
+            self.results_count[name_output] = previous + records
+
+    def get_pending_items(self, name_output: str, items: list[Any]) -> list[Any]:
+        """Return the fan-out items that still have to be fetched.
+
+        Resets results_count[name_output] and, when checkpointing is enabled, adds the
+        records of the items already completed by a previous run to it.
+
+        Args:
+            name_output (str): Fan-out group and base name of the per-item files,
+                e.g. "events" for "events_{cluster_id}".
+            items (list[Any]): All items of the fan-out.
+
+        Returns:
+            list[Any]: Items without a completed checkpoint, in their original order.
+
+        """
+        self.results_count[name_output] = 0
+        if not self.checkpoint:
+            return list(items)
+        completed = self.checkpoint.get_completed_items(name_output)
+        pending = []
+        for item in items:
+            records = completed.get(f"{name_output}_{item}")
+            if records is None:
+                pending.append(item)
+            else:
+                self.add_results_count(name_output, records, accumulate=True)
+        return pending
+
+    def resume_writer(self, file_output: str, state: dict[str, Any]) -> RollingJsonWriter | None:
+        """Reopen a streamed output at the position saved in its checkpoint.
+
+        Args:
+            file_output (str): Output file name without extension.
+            state (dict[str, Any]): Pagination state loaded from the checkpoint.
+
+        Returns:
+            RollingJsonWriter | None: Writer positioned after the last checkpointed page,
+                or None if the parts written so far no longer match the checkpoint, in
+                which case the checkpoint is dropped and the endpoint starts over.
+
+        """
+        part = state.get("part", 0)
+        paths = [os.path.join(self.output, f"{file_output}_{i:02d}.json") for i in range(1, part + 1)]
+        file_path = paths.pop() if paths else os.path.join(self.output, f"{file_output}.json")
+        if not os.path.exists(file_path) or os.path.getsize(file_path) < state["bytes"]:
+            self.checkpoint.reset(file_output)
+            return None
+        if not all(os.path.exists(path) for path in paths):
+            self.checkpoint.reset(file_output)
+            return None
+        return RollingJsonWriter(self.output, file_output, self.max_file_bytes, resume_state=state)
+
+    def get_request_timeout(self, what: str) -> tuple[float, float] | None:
+        """Return the (connect, read) timeouts of the next request.
+
+        Args:
+            what (str): Request about to be sent, used in the deadline error message.
+
+        Returns:
+            tuple[float, float] | None: The session timeouts, each capped by the time
+                left before self.deadline when one is set.
+
+        Raises:
+            DeadlineExceededError: If self.deadline has already passed.
+
+        """
+        timeout = self.http_session.timeout
+        if not self.deadline:
+            return timeout
+        self.deadline.check(what)
+        remaining = self.deadline.remaining()
+        if timeout is None:
+            return remaining, remaining
+        return min(timeout[0], remaining), min(timeout[1], remaining)
+
     def get_response(
         self, body: dict[str, Any], new_params: dict[str, Any], path: str | None, post: bool, url: str
     ) -> requests.Response:
@@ -301,11 +725,19 @@ class Manager:
 
         Raises:
             NoClusterEventsError: When API response indicates the requested cluster events don't exist.
+            ThrottledError: When the request is still throttled (429 or 503) after the
+                retries allowed by the rate limiter.
+            DeadlineExceededError: When self.deadline has passed before the request is sent.
+            requests.Timeout: When connecting or reading exceeds the timeout, capped by
+                the time left before self.deadline.
             Exception: For HTTP errors (non-200 status codes) or connection failures.
 
         Side Effects:
-            - Makes HTTP request to external API
-            - May trigger rate limiting or authentication challenges
+            - Makes HTTP request to external API through the shared pooled session
+            - Waits for a free slot of the endpoint family in the rate limiter, and
+              retries throttled requests after Retry-After or an exponential backoff
+            - With hedging enabled, may send a GET twice when it is slower than the
+              endpoint's p95 latency
 
         Example:
             response = manager.get_response(
@@ -322,10 +754,19 @@ class Manager:
         url_not_query = url_path if path else url
         new_url = f"{url_path}?{query}" if query else url_not_query
         headers = {"Authorization": f"Bearer {self.token}"}
-        if post:
-            response = requests.post(new_url, headers=headers, json=body)
-        else:
-            response = requests.get(new_url, headers=headers)
+        family = RateLimiter.get_family(path)
+
+        def send() -> requests.Response:
+            timeout = self.get_request_timeout(path or url)
+            if post:
+                return self.http_session.post(new_url, headers=headers, json=body, timeout=timeout)
+            if self.hedger:
+                return self.hedger.request(
+                    path or url, lambda: self.http_session.get(new_url, headers=headers, timeout=timeout), family
+                )
+            return self.http_session.get(new_url, headers=headers, timeout=timeout)
+
+        response = self.rate_limiter.request(family, send)
         if response.status_code != 200:
             error = f"Failed connection - {response.content}"
             if "does not exist" in error:
@@ -1,23 +1,26 @@
-import glob
-import json
-import os
-
-import pandas as pd
-
-from workspace_extractor.utils.util import Util
+from workspace_extractor.mapping_index import MappingIndex
 
 
 class Mapping:
     @staticmethod
-    def get_clusters_ids(output: str | None = None) -> list[str | int]:
+    def get_clusters_ids(output: str | None = None, cache: bool = False, columnar: bool = False) -> list[str | int]:
         """Get all cluster IDs from both runs and clusters data.
 
         Combines cluster IDs extracted from job runs and cluster configurations
-        to provide a comprehensive list of all clusters in the workspace.
+        to provide a comprehensive list of all clusters in the workspace. The run
+        and cluster files are parsed once for both sources through a MappingIndex;
+        callers that also need run IDs should use a MappingIndex directly so the
+        files are parsed a single time.
 
         Args:
             output (str | None): Path to the directory containing JSON files.
                                   If None, returns an empty list.
+            cache (bool): Reuse the selection kept in "<output>/.index_cache" by a
+                previous call over the same files, and keep it there otherwise
+                (see MappingIndex). Defaults to False.
+            columnar (bool): Select from the dictionary-encoded columnar tables
+                instead of streaming the rows, with the same result (see
+                MappingIndex). Defaults to False.
 
         Returns:
             list[str | int]: Combined list of cluster IDs from runs and clusters.
@@ -30,14 +33,16 @@ class Mapping:
             # Returns empty list if no output directory specified
             empty_list = Mapping.get_clusters_ids(None)
 
+            # Parse the files on the first call only
+            cluster_ids = Mapping.get_clusters_ids("./output", cache=True)
+
         """
-        results = []
-        results.extend(Mapping.get_clusters_ids_from_runs(output))
-        results.extend(Mapping.get_clusters_ids_from_clusters(output))
-        return results
+        return MappingIndex(output, columnar=columnar, cache=cache).get_clusters_ids()
 
     @staticmethod
-    def get_clusters_ids_from_runs(output: str | None = None) -> set[str | int]:
+    def get_clusters_ids_from_runs(
+        output: str | None = None, cache: bool = False, columnar: bool = False
+    ) -> set[str | int]:
         """Extract cluster IDs from job run data files.
 
         Processes job run data to identify clusters used by successful runs,
@@ -47,18 +52,23 @@ class Mapping:
         Args:
             output (str | None): Path to the directory containing run JSON files.
                                   If None, returns an empty set.
+            cache (bool): Reuse the selection kept in "<output>/.index_cache" by a
+                previous call over the same files, and keep it there otherwise
+                (see MappingIndex). Defaults to False.
+            columnar (bool): Select from the dictionary-encoded columnar tables
+                instead of streaming the rows, with the same result (see
+                MappingIndex). Defaults to False.
 
         Returns:
             set[str | int]: Set of unique cluster IDs from successful job runs.
                                 Empty set if no output directory or no successful runs found.
 
         Processing Logic:
-            1. Loads all run data using get_runs()
+            1. Streams the run tasks from the "runs" files, one run at a time
             2. Calculates run duration (end_time - start_time)
             3. Filters for successful runs with positive duration
-            4. Ranks runs by end_time within each run_name group
-            5. Selects the most recent run for each job
-            6. Extracts cluster IDs from selected runs
+            4. Keeps the run with the highest end_time within each run_name group
+            5. Extracts cluster IDs from selected runs
 
         Example:
             # Extract cluster IDs from job runs
@@ -66,22 +76,12 @@ class Mapping:
             print(f"Found {len(run_cluster_ids)} unique clusters from job runs")
 
         """
-        if not output:
-            return set()
-        runs_list = Mapping.get_runs(output)
-        if len(runs_list) > 0:
-            result_df = pd.DataFrame(runs_list)
-            result_df["duration"] = result_df["end_time"] - result_df["start_time"]
-            result_df = result_df[(result_df["duration"] > 0) & (result_df["result_state"] == "SUCCESS")]
-            result_df["rank"] = result_df.groupby(["run_name"])["end_time"].rank("first", ascending=False)
-            rank_first_df = result_df[result_df["rank"] == 1]
-            rank_first_df = rank_first_df[rank_first_df["cluster_id"].notna()]
-            cluster_ids = rank_first_df["cluster_id"].values
-            return set(cluster_ids)
-        return set()
+        return MappingIndex(output, columnar=columnar, cache=cache).get_clusters_ids_from_runs()
 
     @staticmethod
-    def get_clusters_ids_from_clusters(output: str | None = None) -> list[str | int]:
+    def get_clusters_ids_from_clusters(
+        output: str | None = None, cache: bool = False, columnar: bool = False
+    ) -> list[str | int]:
         """Extract cluster IDs from cluster configuration data files.
 
         Processes cluster configuration data to identify both UI-created clusters
@@ -91,18 +91,23 @@ class Mapping:
         Args:
             output (str | None): Path to the directory containing cluster JSON files.
                                   If None, returns an empty list.
+            cache (bool): Reuse the selection kept in "<output>/.index_cache" by a
+                previous call over the same files, and keep it there otherwise
+                (see MappingIndex). Defaults to False.
+            columnar (bool): Select from the dictionary-encoded columnar tables
+                instead of streaming the rows, with the same result (see
+                MappingIndex). Defaults to False.
 
         Returns:
             list[str | int]: List of cluster IDs from both UI and job clusters.
                                  Includes all UI clusters and filtered job clusters.
 
         Processing Logic:
-            1. Loads all cluster data using get_clusters()
+            1. Streams the cluster rows from the "clusters" files
             2. Separates UI clusters (cluster_source != "JOB") - includes all
             3. For job clusters (cluster_source == "JOB"):
                - Filters for successful clusters with positive duration
-               - Ranks by end_time within each run_name group
-               - Selects most recent cluster for each job
+               - Keeps the cluster with the highest end_time within each run_name group
             4. Combines both UI and filtered job cluster IDs
 
         Example:
@@ -111,30 +116,10 @@ class Mapping:
             print(f"Found {len(config_cluster_ids)} clusters from configurations")
 
         """
-        if not output:
-            return []
-        cluster_list = Mapping.get_clusters(output)
-        if len(cluster_list) > 0:
-            new_clusters = []
-            result_df = pd.DataFrame(cluster_list)
-            ui_clusters = result_df[result_df["cluster_source"] != "JOB"]["cluster_id"].values
-            new_clusters.extend(set(ui_clusters))
-            result_df["duration"] = result_df["end_time"] - result_df["start_time"]
-            result_df = result_df[
-                (result_df["duration"] > 0)
-                & (result_df["cluster_source"] == "JOB")
-                & (result_df["result_state"] == "SUCCESS")
-            ]
-            result_df["rank"] = result_df.groupby(["run_name"])["end_time"].rank("first", ascending=False)
-            rank_first_df = result_df[result_df["rank"] == 1]
-            rank_first_df = rank_first_df[rank_first_df["cluster_id"].notna()]
-            cluster_ids = rank_first_df["cluster_id"].values
-            new_clusters.extend(set(cluster_ids))
-            return new_clusters
-        return []
+        return MappingIndex(output, columnar=columnar, cache=cache).get_clusters_ids_from_clusters()
 
     @staticmethod
-    def get_runs_ids(output: str | None = None) -> set[str | int]:
+    def get_runs_ids(output: str | None = None, cache: bool = False, columnar: bool = False) -> set[str | int]:
         """Extract job run IDs from run data files.
 
         Processes job run data to identify successful runs, applying the same
@@ -143,18 +128,23 @@ class Mapping:
         Args:
             output (str | None): Path to the directory containing run JSON files.
                                   If None, returns an empty set.
+            cache (bool): Reuse the selection kept in "<output>/.index_cache" by a
+                previous call over the same files, and keep it there otherwise
+                (see MappingIndex). Defaults to False.
+            columnar (bool): Select from the dictionary-encoded columnar tables
+                instead of streaming the rows, with the same result (see
+                MappingIndex). Defaults to False.
 
         Returns:
             set[str | int]: Set of unique run IDs from successful job runs.
                                 Empty set if no output directory or no successful runs found.
 
         Processing Logic:
-            1. Loads all run data using get_runs()
+            1. Streams the run tasks from the "runs" files, one run at a time
             2. Calculates run duration (end_time - start_time)
             3. Filters for successful runs with positive duration
-            4. Ranks runs by end_time within each run_name group
-            5. Selects the most recent run for each job
-            6. Extracts run IDs from selected runs
+            4. Keeps the run with the highest end_time within each run_name group
+            5. Extracts run IDs from selected runs
 
         Use Cases:
             - Identifying successful job runs for detailed analysis
@@ -167,19 +157,7 @@ class Mapping:
             print(f"Found {len(successful_runs)} successful job runs")
 
         """
-        if not output:
-            return set()
-        runs_list = Mapping.get_runs(output)
-        if len(runs_list) > 0:
-            result_df = pd.DataFrame(runs_list)
-            result_df["duration"] = result_df["end_time"] - result_df["start_time"]
-            result_df = result_df[(result_df["duration"] > 0) & (result_df["result_state"] == "SUCCESS")]
-            result_df["rank"] = result_df.groupby(["run_name"])["end_time"].rank("first", ascending=False)
-            rank_first_df = result_df[result_df["rank"] == 1]
-            rank_first_df = rank_first_df[rank_first_df["run_id"].notna()]
-            runs_ids = rank_first_df["run_id"].values
-            return set(runs_ids)
-        return set()
+        return MappingIndex(output, columnar=columnar, cache=cache).get_runs_ids()
 
     @staticmethod
     def get_clusters(output: str) -> list[dict[str, str | int | None]]:
@@ -191,7 +169,7 @@ class Mapping:
 
         Args:
             output (str): Path to the directory containing cluster JSON files.
-                        Must be a valid directory path containing "clusters*.json" files.
+                        Must be a valid directory path containing the "clusters" output files.
 
         Returns:
             ist[dict[str, str | int | None]]: List of dictionaries containing
@@ -205,7 +183,7 @@ class Mapping:
                 - result_state: Cluster termination state
 
         Data Processing:
-            - Reads all files matching "clusters*.json" pattern
+            - Reads the "clusters.json" / "clusters_NN.json" files listed in the output manifest
             - Extracts default_tags for job and run information
             - Processes termination_reason for result state
             - Applies name cleaning via Util.get_clean_name()
@@ -227,33 +205,7 @@ class Mapping:
                 print(f"Cluster {cluster['cluster_id']}: {cluster['cluster_source']}")
 
         """
-        result = []
-        files = glob.glob(os.path.join(output, "clusters*.json"))
-        for f in files:
-            with open(f) as file:
-                clusters = json.load(file)
-                for cluster in clusters:
-                    cluster_id = cluster.get("cluster_id", None) if cluster else None
-                    cluster_source = cluster.get("cluster_source", None) if cluster else None
-                    tags = cluster.get("default_tags", None) if cluster else None
-                    job_id = tags.get("JobId", "NO_ID_FOUND") if tags else "NO_TAG_FOUND"
-                    run_name = tags.get("RunName", "NO_NAME_FOUND") if tags else "NO_TAG_FOUND"
-                    start_time = cluster.get("start_time", 0)
-                    end_time = cluster.get("end_time", 0)
-                    termination_reason = cluster.get("termination_reason")
-                    result_state = termination_reason.get("type") if termination_reason else None
-                    result.append(
-                        {
-                            "cluster_id": cluster_id,
-                            "cluster_source": cluster_source,
-                            "run_name": Util.get_clean_name(run_name),
-                            "job_id": job_id,
-                            "start_time": start_time,
-                            "end_time": end_time,
-                            "result_state": result_state,
-                        }
-                    )
-        return result
+        return MappingIndex.parse_clusters(output)
 
     @staticmethod
     def get_runs(output: str) -> list[dict[str, str | int | dict | None]]:
@@ -266,7 +218,7 @@ class Mapping:
 
         Args:
             output (str): Path to the directory containing run JSON files.
-                        Must be a valid directory path containing "run*.json" files.
+                        Must be a valid directory path containing the "runs" output files.
 
         Returns:
             list[dict[str, str | int | dict | None]]: List of dictionaries containing
@@ -280,7 +232,7 @@ class Mapping:
                 - result_state: Run execution result state
 
         Data Processing:
-            - Reads all files matching "run*.json" pattern
+            - Reads the "runs.json" / "runs_NN.json" files listed in the output manifest (not "runs_details_*")
             - Processes task-level information for cluster associations
             - Handles both existing_cluster_id and cluster_instance patterns
             - Special handling for ADF runs (removes 37-character suffix)
@@ -315,37 +267,4 @@ class Mapping:
                 print(f"Run {run['run_id']}: {run['run_name']} -> Cluster {run['cluster_id']}")
 
         """
-        result = []
-        files = glob.glob(os.path.join(output, "run*.json"))
-        for f in files:
-            with open(f) as file:
-                runs = json.load(file)
-                for run in runs:
-                    run_id = run.get("run_id", None) if run else None
-                    run_name = run.get("run_name", None) if run else None
-                    start_time = run.get("start_time", None) if run else None
-                    end_time = run.get("end_time", None) if run else None
-                    if "tasks" in run:
-                        tasks = run["tasks"]
-                        for task in tasks:
-                            existing_cluster_id = task.get("existing_cluster_id", None)
-                            cluster_instance = task.get("cluster_instance", None)
-                            cluster_id = (
-                                cluster_instance.get("cluster_id", None) if cluster_instance else existing_cluster_id
-                            )
-                            state = task.get("state", None)
-                            result_state = state.get("result_state", None) if state else None
-                            if run_name:
-                                run_name = run_name[:-37] if "ADF" in run_name else run_name
-                            result.append(
-                                {
-                                    "run_name": Util.get_clean_name(run_name),
-                                    "run_id": run_id,
-                                    "start_time": start_time,
-                                    "end_time": end_time,
-                                    "cluster_instance": cluster_instance,
-                                    "cluster_id": cluster_id,
-                                    "result_state": result_state,
-                                }
-                            )
-        return result
+        return MappingIndex.parse_runs(output)
@@ -0,0 +1,436 @@
+import os
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+
+from workspace_extractor.utils.columnar_table import ColumnarTable
+from workspace_extractor.utils.index_cache import IndexCache
+from workspace_extractor.utils.json_stream import JsonArrayReader
+from workspace_extractor.utils.latest_reducer import LatestReducer
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util import Util
+
+
+class MappingIndex:
+    cache_folder = ".index_cache"
+    run_fields = ("run_name", "run_id", "start_time", "end_time", "cluster_instance", "cluster_id", "result_state")
+    cluster_fields = ("cluster_id", "cluster_source", "run_name", "job_id", "start_time", "end_time", "result_state")
+    runs_schema = {
+        "run_name": ColumnarTable.CATEGORY,
+        "run_id": ColumnarTable.CATEGORY,
+        "start_time": ColumnarTable.FLOAT,
+        "end_time": ColumnarTable.FLOAT,
+        "cluster_id": ColumnarTable.CATEGORY,
+        "result_state": ColumnarTable.CATEGORY,
+    }
+    clusters_schema = {
+        "cluster_id": ColumnarTable.CATEGORY,
+        "cluster_source": ColumnarTable.CATEGORY,
+        "run_name": ColumnarTable.CATEGORY,
+        "job_id": ColumnarTable.CATEGORY,
+        "start_time": ColumnarTable.FLOAT,
+        "end_time": ColumnarTable.FLOAT,
+        "result_state": ColumnarTable.CATEGORY,
+    }
+
+    def __init__(
+        self,
+        output: str | None = None,
+        columnar: bool = False,
+        processes: int | None = None,
+        cache: bool = False,
+        cache_dir: str | None = None,
+        checksum: bool = False,
+    ) -> None:
+        """Initialize a shared, single-pass view of the run and cluster outputs.
+
+        The "runs" and "clusters" files are streamed record by record, and the
+        latest successful run of every job is selected on the fly, so the mapping
+        keeps one row per job name instead of one row per task. Each file is read at
+        most once and every cluster and run ID set is derived from the selection.
+
+        Args:
+            output (str | None): Path to the directory containing the JSON files.
+                If None, every ID set is empty.
+            columnar (bool): Select from runs_table and clusters_table with the
+                vectorized LatestReducer.select_indices() instead of streaming the rows.
+                Faster when the tables are reused, at the cost of holding them in
+                memory. Defaults to False.
+            processes (int | None): Number of worker processes parsing and pre-reducing
+                the "runs" and "clusters" files in parallel, one file per task, when
+                the output has several split parts. Only applies to the streaming
+                selection. Defaults to None (files parsed one by one in this process).
+            cache (bool): Keep the selected runs and clusters and the columnar tables
+                in a persistent IndexCache, shared across instances and sessions.
+                Entries are reused while the input files keep their paths, sizes and
+                modification times, and are kept apart for the streaming and columnar
+                selections. Defaults to False.
+            cache_dir (str | None): Directory of the cache. Defaults to None
+                ("<output>/.index_cache", removed with the output).
+            checksum (bool): Validate cache entries with the files' SHA-256 checksums
+                instead of their sizes and modification times. Defaults to False.
+
+        Returns:
+            None
+
+        Example:
+            index = MappingIndex("./output")
+            cluster_ids = index.get_clusters_ids()
+            run_ids = index.get_runs_ids()
+
+        """
+        self.output = output
+        self.columnar = columnar
+        self.processes = processes
+        cache_dir = cache_dir or os.path.join(output or "", MappingIndex.cache_folder)
+        self.cache = IndexCache(cache_dir, output, checksum) if cache and output else None
+
+    @cached_property
+    def runs(self) -> list[dict[str, str | int | dict | None]]:
+        return MappingIndex.parse_runs(self.output) if self.output else []
+
+    @cached_property
+    def clusters(self) -> list[dict[str, str | int | None]]:
+        return MappingIndex.parse_clusters(self.output) if self.output else []
+
+    @cached_property
+    def runs_table(self) -> ColumnarTable:
+        """Return the run tasks as a columnar table, see build_runs_table()."""
+        return self.get_cached_table("runs", MappingIndex.build_runs_table)
+
+    @cached_property
+    def clusters_table(self) -> ColumnarTable:
+        """Return the clusters as a columnar table, see build_clusters_table()."""
+        return self.get_cached_table("clusters", MappingIndex.build_clusters_table)
+
+    @cached_property
+    def latest_runs(self) -> list[dict[str, str | int | dict | None]]:
+        return self.get_cached("runs", self.get_cache_kind("latest_runs"), self.select_latest_runs)
+
+    @cached_property
+    def selected_clusters(self) -> list[str | int]:
+        return self.get_cached("clusters", self.get_cache_kind("selected_clusters"), self.select_clusters)
+
+    def get_cache_kind(self, kind: str) -> str:
+        """Return the cache name of a selection, which depends on the selection mode."""
+        return f"{kind}_columnar" if self.columnar else kind
+
+    def get_cached(self, name: str, kind: str, compute: Callable[[], Any]) -> Any:
+        """Return a value derived from an output, from the IndexCache when it is still valid.
+
+        Args:
+            name (str): Output the value is derived from, "runs" or "clusters".
+            kind (str): Name of the value in the cache.
+            compute (Callable[[], Any]): Function computing the value on a cache miss.
+
+        Returns:
+            Any: The cached or freshly computed value.
+
+        """
+        if not self.output:
+            return compute()
+        value = self.cache.load(name, kind) if self.cache else None
+        if value is None:
+            value = compute()
+            if self.cache:
+                self.cache.save(name, kind, value)
+        return value
+
+    def get_cached_table(self, name: str, build: Callable[[str], ColumnarTable]) -> ColumnarTable:
+        if not self.output:
+            return ColumnarTable({}, {})
+        table = self.cache.load_table(name) if self.cache else None
+        if table is None:
+            table = build(self.output)
+            if self.cache:
+                self.cache.save_table(name, table)
+        return table
+
+    def select_latest_runs(self) -> list[dict[str, str | int | dict | None]]:
+        """Return the most recent successful run task of every job.
+
+        Keeps the tasks with a positive duration and a SUCCESS result state and, within
+        each run_name, the one with the highest end_time, ties going to the task read
+        first. Each "runs" file is streamed through its own LatestReducer (see
+        reduce_runs_file()) and the partial states are merged in file order, or the
+        tasks are selected from runs_table when the index is columnar.
+
+        Returns:
+            list[dict[str, str | int | dict | None]]: One row per run_name.
+
+        """
+        if not self.output:
+            return []
+        if self.columnar:
+            return MappingIndex.select_from_table(self.runs_table)
+        latest = LatestReducer()
+        for partial in self.map_files("runs", MappingIndex.reduce_runs_file):
+            latest.merge(partial)
+        return latest.get_rows()
+
+    def select_clusters(self) -> list[str | int]:
+        """Return the non-job clusters, then the cluster of the latest successful run of every job.
+
+        Returns:
+            list[str | int]: See Mapping.get_clusters_ids_from_clusters().
+
+        """
+        if not self.output:
+            return []
+        if self.columnar:
+            table = self.clusters_table
+            if not len(table):
+                return []
+            is_job = table.columns["cluster_source"] == table.get_code("cluster_source", "JOB")
+            ui_clusters = set(table.get_values("cluster_id", np.flatnonzero(~is_job)))
+            latest = MappingIndex.select_from_table(table, is_job)
+        else:
+            ui_clusters = set()
+            reducer = LatestReducer()
+            for partial_ui_clusters, partial in self.map_files("clusters", MappingIndex.reduce_clusters_file):
+                ui_clusters.update(partial_ui_clusters)
+                reducer.merge(partial)
+            latest = reducer.get_rows()
+        new_clusters = []
+        new_clusters.extend(ui_clusters)
+        new_clusters.extend({row["cluster_id"] for row in latest if row["cluster_id"] is not None})
+        return new_clusters
+
+    def map_files(self, name: str, reduce_file: Callable[[str], Any]) -> list[Any]:
+        """Apply a per-file reduction to every file of an output, in a process pool if configured.
+
+        Args:
+            name (str): Output name, e.g. "runs".
+            reduce_file (Callable[[str], Any]): Picklable function turning a file path
+                into a partial state.
+
+        Returns:
+            list[Any]: The partial states, in file order.
+
+        """
+        files = Manifest.get_files(self.output, name)
+        if not self.processes or self.processes <= 1 or len(files) <= 1:
+            return [reduce_file(f) for f in files]
+        with ProcessPoolExecutor(max_workers=min(self.processes, len(files))) as executor:
+            return list(executor.map(reduce_file, files))
+
+    def get_clusters_ids(self) -> list[str | int]:
+        results = []
+        results.extend(self.get_clusters_ids_from_runs())
+        results.extend(self.get_clusters_ids_from_clusters())
+        return results
+
+    def get_clusters_ids_from_runs(self) -> set[str | int]:
+        return {row["cluster_id"] for row in self.latest_runs if row["cluster_id"] is not None}
+
+    def get_runs_ids(self) -> set[str | int]:
+        return {row["run_id"] for row in self.latest_runs if row["run_id"] is not None}
+
+    def get_clusters_ids_from_clusters(self) -> list[str | int]:
+        return self.selected_clusters
+
+    @staticmethod
+    def get_candidates(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Yield the rows that can be selected as the latest run of a job.
+
+        Args:
+            rows (Iterable[dict[str, Any]]): Rows with start_time, end_time and result_state.
+
+        Returns:
+            Iterator[dict[str, Any]]: Rows with a positive duration and a SUCCESS result state.
+
+        """
+        for row in rows:
+            start_time, end_time = row["start_time"], row["end_time"]
+            if start_time is None or end_time is None or not end_time - start_time > 0:
+                continue
+            if row["result_state"] == "SUCCESS":
+                yield row
+
+    @staticmethod
+    def reduce_runs_file(f: str) -> LatestReducer:
+        """Return the latest candidate task of every run_name found in one "runs" file."""
+        rows = (dict(zip(MappingIndex.run_fields, values, strict=True)) for values in MappingIndex.iter_file_runs(f))
+        return LatestReducer().update_all(MappingIndex.get_candidates(rows))
+
+    @staticmethod
+    def reduce_clusters_file(f: str) -> tuple[set[str | int | None], LatestReducer]:
+        """Return the non-job cluster IDs and the latest candidate job cluster per run_name of one file."""
+        ui_clusters = set()
+
+        def job_clusters() -> Iterator[dict[str, str | int | None]]:
+            for values in MappingIndex.iter_file_clusters(f):
+                row = dict(zip(MappingIndex.cluster_fields, values, strict=True))
+                if row["cluster_source"] != "JOB":
+                    ui_clusters.add(row["cluster_id"])
+                else:
+                    yield row
+
+        reducer = LatestReducer().update_all(MappingIndex.get_candidates(job_clusters()))
+        return ui_clusters, reducer
+
+    @staticmethod
+    def select_from_table(table: ColumnarTable, mask: np.ndarray | None = None) -> list[dict[str, Any]]:
+        """Select the latest candidate row of every run_name from a columnar table.
+
+        Vectorized counterpart of streaming get_candidates() into a LatestReducer.
+
+        Args:
+            table (ColumnarTable): Runs or clusters table.
+            mask (np.ndarray | None): Rows to consider. Defaults to None (all).
+
+        Returns:
+            list[dict[str, Any]]: The selected rows, decoded.
+
+        """
+        if not len(table):
+            return []
+        columns = table.columns
+        candidates = (columns["end_time"] - columns["start_time"] > 0) & (
+            columns["result_state"] == table.get_code("result_state", "SUCCESS")
+        )
+        if mask is not None:
+            candidates &= mask
+        indices = LatestReducer.select_indices(columns["run_name"], columns["end_time"], candidates)
+        values = {name: table.get_values(name, indices) for name in columns}
+        return [{name: values[name][i] for name in columns} for i in range(len(indices))]
+
+    @staticmethod
+    def build_runs_table(output: str) -> ColumnarTable:
+        """Build the run tasks table straight from the "runs" files.
+
+        The columns of runs_schema are filled from the streamed task values, so no
+        dict is created per task. run_name, run_id, cluster_id and result_state are
+        dictionary-encoded, and cluster_instance is left out.
+
+        Args:
+            output (str): Path to the directory containing the JSON files.
+
+        Returns:
+            ColumnarTable: One row per task, as in Mapping.get_runs().
+
+        Example:
+            table = MappingIndex.build_runs_table("./output")
+            df = table.to_pandas()
+
+        """
+        project = itemgetter(*[MappingIndex.run_fields.index(name) for name in MappingIndex.runs_schema])
+        rows = map(project, MappingIndex.iter_run_values(output))
+        return ColumnarTable.from_rows(rows, MappingIndex.runs_schema)
+
+    @staticmethod
+    def build_clusters_table(output: str) -> ColumnarTable:
+        """Build the clusters table straight from the "clusters" files, as build_runs_table() does for runs."""
+        return ColumnarTable.from_rows(MappingIndex.iter_cluster_values(output), MappingIndex.clusters_schema)
+
+    @staticmethod
+    def parse_clusters(output: str) -> list[dict[str, str | int | None]]:
+        """Parse the "clusters" output files listed in the manifest. See Mapping.get_clusters()."""
+        return list(MappingIndex.iter_clusters(output))
+
+    @staticmethod
+    def iter_clusters(output: str) -> Iterator[dict[str, str | int | None]]:
+        """Yield one row per cluster of the "clusters" output files, streaming each file.
+
+        Only the fields used by the mapping are kept, so memory doesn't grow with the
+        size of the files.
+
+        Args:
+            output (str): Path to the directory containing the JSON files.
+
+        Returns:
+            Iterator[dict[str, str | int | None]]: Rows as in Mapping.get_clusters().
+
+        """
+        for values in MappingIndex.iter_cluster_values(output):
+            yield dict(zip(MappingIndex.cluster_fields, values, strict=True))
+
+    @staticmethod
+    def iter_cluster_values(output: str) -> Iterator[tuple[str | int | None, ...]]:
+        """Yield the values of every cluster row as a tuple ordered like cluster_fields."""
+        for f in Manifest.get_files(output, "clusters"):
+            yield from MappingIndex.iter_file_clusters(f)
+
+    @staticmethod
+    def iter_file_clusters(f: str) -> Iterator[tuple[str | int | None, ...]]:
+        """Yield the values of the cluster rows of one file, see iter_cluster_values()."""
+        for cluster in JsonArrayReader(f):
+            cluster_id = cluster.get("cluster_id", None) if cluster else None
+            cluster_source = cluster.get("cluster_source", None) if cluster else None
+            tags = cluster.get("default_tags", None) if cluster else None
+            job_id = tags.get("JobId", "NO_ID_FOUND") if tags else "NO_TAG_FOUND"
+            run_name = tags.get("RunName", "NO_NAME_FOUND") if tags else "NO_TAG_FOUND"
+            start_time = cluster.get("start_time", 0)
+            end_time = cluster.get("end_time", 0)
+            termination_reason = cluster.get("termination_reason")
+            result_state = termination_reason.get("type") if termination_reason else None
+            yield (
+                cluster_id,
+                cluster_source,
+                Util.get_clean_name(run_name),
+                job_id,
+                start_time,
+                end_time,
+                result_state,
+            )
+
+    @staticmethod
+    def parse_runs(output: str) -> list[dict[str, str | int | dict | None]]:
+        """Parse the "runs" output files listed in the manifest, one row per task. See Mapping.get_runs()."""
+        return list(MappingIndex.iter_runs(output))
+
+    @staticmethod
+    def iter_runs(output: str) -> Iterator[dict[str, str | int | dict | None]]:
+        """Yield one row per task of the "runs" output files, streaming each file.
+
+        Runs are decoded one at a time and only the fields used by the mapping are
+        kept, so memory is bounded by the largest run rather than by the files.
+
+        Args:
+            output (str): Path to the directory containing the JSON files.
+
+        Returns:
+            Iterator[dict[str, str | int | dict | None]]: Rows as in Mapping.get_runs().
+
+        """
+        for values in MappingIndex.iter_run_values(output):
+            yield dict(zip(MappingIndex.run_fields, values, strict=True))
+
+    @staticmethod
+    def iter_run_values(output: str) -> Iterator[tuple[str | int | dict | None, ...]]:
+        """Yield the values of every run task row as a tuple ordered like run_fields."""
+        for f in Manifest.get_files(output, "runs"):
+            yield from MappingIndex.iter_file_runs(f)
+
+    @staticmethod
+    def iter_file_runs(f: str) -> Iterator[tuple[str | int | dict | None, ...]]:
+        """Yield the values of the run task rows of one file, see iter_run_values()."""
+        for run in JsonArrayReader(f):
+            run_id = run.get("run_id", None) if run else None
+            run_name = run.get("run_name", None) if run else None
+            start_time = run.get("start_time", None) if run else None
+            end_time = run.get("end_time", None) if run else None
+            if "tasks" in run:
+                tasks = run["tasks"]
+                for task in tasks:
+                    existing_cluster_id = task.get("existing_cluster_id", None)
+                    cluster_instance = task.get("cluster_instance", None)
+                    cluster_id = cluster_instance.get("cluster_id", None) if cluster_instance else existing_cluster_id
+                    state = task.get("state", None)
+                    result_state = state.get("result_state", None) if state else None
+                    if run_name:
+                        run_name = run_name[:-37] if "ADF" in run_name else run_name
+                    yield (
+                        Util.get_clean_name(run_name),
+                        run_id,
+                        start_time,
+                        end_time,
+                        cluster_instance,
+                        cluster_id,
+                        result_state,
+                    )
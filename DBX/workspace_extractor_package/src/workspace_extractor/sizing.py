@@ -1,16 +1,27 @@
 import os
+import shutil
 
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 from tqdm.notebook import tqdm_notebook
 
+from workspace_extractor.incremental import Incremental
 from workspace_extractor.manager import Manager
 from workspace_extractor.mapping import Mapping
+from workspace_extractor.mapping_index import MappingIndex
+from workspace_extractor.utils.dag_scheduler import DagScheduler
+from workspace_extractor.utils.deadline import Deadline
+from workspace_extractor.utils.fan_out import FanOut
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.time_slicer import TimeSlicer
 
 
 class Sizing(Manager):
-    def __init__(self, input_url: str, input_token: str | None = None, input_output: str = "./output") -> None:
+    def __init__(
+        self, input_url: str, input_token: str | None = None, input_output: str = "./output", **kwargs: Any
+    ) -> None:
         """Initialize the Sizing instance for workspace resource estimation.
 
         Extends the Manager class with specialized functionality for collecting
@@ -27,6 +38,12 @@ class Sizing(Manager):
             input_output (str): Directory path for saving collected data files.
                 Directory will be created if it doesn't exist. All output files
                 will be saved in JSON format within this directory. Defaults to "./output".
+            **kwargs (Any): Additional Manager options such as the HTTP connection pool
+                settings (pool_connections, pool_maxsize, pool_block, keep_alive) or the
+                per-endpoint projections applied to each page as it arrives. Anonymizing
+                "runs", "runs_details" or "clusters" rewrites the run names the mapping
+                step groups runs and job clusters by, so anonymize the output folder with
+                FolderScrubber once the extraction is done instead.
 
         Returns:
             None
@@ -41,6 +58,7 @@ class Sizing(Manager):
             - self.token: Authentication token for API requests
             - self.output: Output directory path
             - self.api_utl: Utility instance for API operations
+            - self.http_session: Shared connection-pooled HTTP session
             - self.results_count: Dictionary tracking collected record counts
 
         Example:
@@ -51,13 +69,30 @@ class Sizing(Manager):
                 input_output="./workspace_data"
             )
 
+            # Drop notebook parameters and Spark environment variables from every page
+            # before it is written, then anonymize the finished output
+            sizing = Sizing(
+                input_url="https://dbc-12345678-9abc.cloud.databricks.com",
+                input_token="dapi1234567890abcdef",
+                projections=Projection.get_defaults(),
+            )
+            sizing.get_metadata()
+            FolderScrubber(sizing.output, "./output_shared").run()
+
         """
-        super().__init__(input_url, input_token=input_token, input_output=input_output)
+        super().__init__(input_url, input_token=input_token, input_output=input_output, **kwargs)
         self.token = input_token
         self.output = input_output
         os.makedirs(self.output, exist_ok=True)
 
-    def get_clusters_events(self, timestamp: int, pb: Any | None = None) -> tuple[bool, str]:
+    def get_clusters_events(
+        self,
+        timestamp: int,
+        pb: Any | None = None,
+        max_workers: int | None = None,
+        cluster_ids: list[str | int] | None = None,
+        previous_output: str | None = None,
+    ) -> tuple[bool, str]:
         """Fetch cluster lifecycle events for all clusters from a specified timestamp.
 
         This method retrieves detailed event information for each cluster in the workspace,
@@ -70,6 +105,14 @@ class Sizing(Manager):
                 Typically calculated as: int(datetime.timestamp() * 1000)
             pb (Any | None): Progress bar instance for tracking overall progress.
                 If provided, will be updated to show processing status. Defaults to None.
+            max_workers (int | None): Maximum number of clusters fetched concurrently.
+                If None, uses the max_workers configured on the instance. Defaults to None.
+            cluster_ids (list[str | int] | None): Clusters to fetch events for. If None,
+                they are read from the output directory with Mapping.get_clusters_ids().
+                Defaults to None.
+            previous_output (str | None): Output directory of a previous extraction. If
+                provided, only the events after the last one saved there for each cluster
+                are fetched, then merged with the saved ones. Defaults to None.
 
         Returns:
             tuple[bool, str]: A tuple containing:
@@ -79,8 +122,11 @@ class Sizing(Manager):
         Side Effects:
             - Reads cluster IDs from the output directory using Mapping.get_clusters_ids()
             - Creates individual event files for each cluster in format: "events_{cluster_id}"
+            - Sets results_count["events"] to the total number of events across all clusters
+            - In incremental mode, rewrites each "events_{cluster_id}" file with the new and
+              previous events, without duplicates and without events older than timestamp
             - Updates progress bars to show current processing status
-            - Displays a secondary progress bar showing individual cluster processing
+            - Displays a secondary progress bar aggregating the progress of all workers
 
         API Details:
             - Endpoint: "api/2.0/clusters/events"
@@ -103,11 +149,13 @@ class Sizing(Manager):
             - Catches and logs all exceptions during processing
             - Returns error status and message if any cluster processing fails
             - Individual cluster failures don't stop processing of remaining clusters
+            - With checkpointing enabled, clusters completed by a previous run are skipped
 
         Dependencies:
             - Requires cluster list file to exist in output directory
             - Uses Mapping.get_clusters_ids() to retrieve cluster identifiers
             - Leverages inherited get_and_save() method for API calls and file management
+            - Uses FanOut.run() to bound the number of clusters processed concurrently
 
         Note:
             This method uses pagination automatically through the get_and_save() method
@@ -133,38 +181,65 @@ class Sizing(Manager):
             pb.set_description(f"Processing {events_path}")
 
         result = False, "Data fetched and saved successfully"
+        watermarks = Incremental.get_events_watermarks(previous_output) if previous_output else {}
+
+        def fetch_events(cluster: str | int) -> tuple[bool, str]:
+            fetched = self.get_and_save(
+                path=events_path,
+                name_output="events",
+                suffix=f"_{cluster}",
+                post=True,
+                default_params={
+                    "cluster_id": f"{cluster}",
+                    "limit": 250,
+                    "start_time": max(timestamp, watermarks.get(f"{cluster}", timestamp)),
+                },
+                body={
+                    "event_types": (
+                        "CREATING",
+                        "STARTING",
+                        "RESTARTING",
+                        "TERMINATING",
+                        "RUNNING",
+                        "RESIZING",
+                        "UPSIZE_COMPLETED",
+                        "EDITED",
+                    )
+                },
+                use_paging=True,
+                url_api=self.url if self.url else "",
+                accumulate=True,
+                checkpoint_group="events",
+            )
+            if previous_output and not fetched[0]:
+                merged, new = Incremental.merge_output(
+                    previous_output,
+                    self.output,
+                    f"events_{cluster}",
+                    ("timestamp", "type"),
+                    "timestamp",
+                    timestamp,
+                    self.max_file_bytes,
+                )
+                self.add_results_count("events", merged - new, accumulate=True)
+            return fetched
 
         try:
-            cluster_list = Mapping.get_clusters_ids(self.output)
+            cluster_list = cluster_ids if cluster_ids is not None else Mapping.get_clusters_ids(self.output)
+            pending = self.get_pending_items("events", cluster_list)
             with tqdm_notebook(range(len(cluster_list)), desc="Fetching Cluster Events") as pb2:
-                for cluster in cluster_list:
-                    self.get_and_save(
-                        path=events_path,
-                        name_output="events",
-                        suffix=f"_{cluster}",
-                        post=True,
-                        default_params={
-                            "cluster_id": f"{cluster}",
-                            "limit": 250,
-                            "start_time": timestamp,
-                        },
-                        body={
-                            "event_types": (
-                                "CREATING",
-                                "STARTING",
-                                "RESTARTING",
-                                "TERMINATING",
-                                "RUNNING",
-                                "RESIZING",
-                                "UPSIZE_COMPLETED",
-                                "EDITED",
-                            )
-                        },
-                        use_paging=True,
-                        url_api=self.url if self.url else "",
-                        pb=pb2,
-                        pb_message=f"Fetching {cluster} events",
-                    )
+                pb2.update(len(cluster_list) - len(pending))
+                results = FanOut.run(
+                    pending,
+                    fetch_events,
+                    max_workers=max_workers if max_workers is not None else self.max_workers,
+                    pb=pb2,
+                    deadline=self.deadline,
+                    describe=lambda cluster: f"Fetching {cluster} events",
+                )
+            failed = sum(1 for error, _ in results if error)
+            if failed:
+                result = True, f"Error while processing url: {events_path}. {failed} of {len(results)} clusters failed"
         except Exception as e:
             result = True, f"Error while processing url: {events_path}. {str(e)}"
 
@@ -173,7 +248,13 @@ class Sizing(Manager):
 
         return result
 
-    def get_runs_details(self, pb: Any | None = None) -> tuple[bool, str]:
+    def get_runs_details(
+        self,
+        pb: Any | None = None,
+        max_workers: int | None = None,
+        run_ids: list[str | int] | None = None,
+        previous_output: str | None = None,
+    ) -> tuple[bool, str]:
         """Fetch detailed information for all job runs in the workspace.
 
         This method retrieves comprehensive details for each job run identified in the workspace,
@@ -183,6 +264,13 @@ class Sizing(Manager):
         Args:
             pb (Any | None): Progress bar instance for tracking overall progress.
                 If provided, will be updated to show processing status. Defaults to None.
+            max_workers (int | None): Maximum number of runs/get requests in flight.
+                If None, uses the max_workers configured on the instance. Defaults to None.
+            run_ids (list[str | int] | None): Runs to fetch details for. If None, they are
+                read from the output directory with Mapping.get_runs_ids(). Defaults to None.
+            previous_output (str | None): Output directory of a previous extraction. If
+                provided, the details saved there for runs that had already ended are
+                copied instead of being fetched again. Defaults to None.
 
         Returns:
             tuple[bool, str]: A tuple containing:
@@ -192,8 +280,11 @@ class Sizing(Manager):
         Side Effects:
             - Reads job run IDs from the output directory using Mapping.get_runs_ids()
             - Creates individual detail files for each run in format: "runs_details_{run_id}"
+            - Sets results_count["runs_details"] to the total number of run details saved
+            - In incremental mode, copies the reusable "runs_details_{run_id}" files from
+              previous_output into the output directory
             - Updates progress bars to show current processing status
-            - Displays a secondary progress bar showing individual run processing
+            - Displays a secondary progress bar aggregating the progress of all workers
             - Saves complete API responses including all nested details
 
         API Details:
@@ -221,6 +312,7 @@ class Sizing(Manager):
             - Returns error status and message if any run processing fails
             - Individual run failures don't stop processing of remaining runs
             - Continues processing even if some runs are inaccessible
+            - With checkpointing enabled, runs completed by a previous run are skipped
 
         Dependencies:
             - Requires job runs list file to exist in output directory
@@ -229,7 +321,9 @@ class Sizing(Manager):
             - Depends on prior execution of job runs list collection
 
         Performance Notes:
-            - Processes runs sequentially to avoid API rate limiting
+            - Processes runs sequentially by default; max_workers > 1 hydrates runs
+              concurrently through FanOut.run() with the same per-run output files
+            - Results are collected in the order of the run IDs, whatever the completion order
             - Uses full_response=True to capture complete run details
             - May take significant time for workspaces with many job runs
             - Progress tracking helps monitor long-running operations
@@ -259,20 +353,38 @@ class Sizing(Manager):
         if pb:
             pb.set_description(f"Processing {runs_details_path}")
         result = False, "Data fetched and saved successfully"
+
+        def fetch_run_details(run_id: str | int) -> tuple[bool, str]:
+            return self.get_and_save(
+                path=runs_details_path,
+                name_output="runs_details",
+                suffix=f"_{run_id}",
+                default_params={"run_id": run_id},
+                url_api=self.url if self.url else "",
+                full_response=True,
+                accumulate=True,
+                checkpoint_group="runs_details",
+            )
+
         try:
-            runs_list = Mapping.get_runs_ids(self.output)
+            runs_list = list(run_ids) if run_ids is not None else Mapping.get_runs_ids(self.output)
+            pending = self.get_pending_items("runs_details", runs_list)
+            if previous_output:
+                pending = self.reuse_runs_details(previous_output, pending)
             with tqdm_notebook(range(len(runs_list)), desc="Fetching Runs Details") as pb2:
-                for run_id in runs_list:
-                    self.get_and_save(
-                        path=runs_details_path,
-                        name_output="runs_details",
-                        suffix=f"_{run_id}",
-                        default_params={"run_id": run_id},
-                        url_api=self.url if self.url else "",
-                        pb=pb2,
-                        pb_message=f"Fetching details of run:{run_id}",
-                        full_response=True,
-                    )
+                pb2.update(len(runs_list) - len(pending))
+                results = FanOut.run(
+                    pending,
+                    fetch_run_details,
+                    max_workers=max_workers if max_workers is not None else self.max_workers,
+                    pb=pb2,
+                    deadline=self.deadline,
+                    describe=lambda run_id: f"Fetching details of run:{run_id}",
+                )
+            failed = sum(1 for error, _ in results if error)
+            if failed:
+                message = f"{failed} of {len(results)} runs failed"
+                result = True, f"Error while processing url: {runs_details_path}. {message}"
         except Exception as e:
             result = True, f"Error while processing url: {runs_details_path}. {str(e)}"
 
@@ -281,7 +393,46 @@ class Sizing(Manager):
 
         return result
 
-    def get_metadata(self, days: int | float = 60) -> None:
+    def reuse_runs_details(self, previous_output: str, run_ids: list[str | int]) -> list[str | int]:
+        """Copy the details of finished runs from a previous extraction.
+
+        Args:
+            previous_output (str): Output directory of the previous extraction.
+            run_ids (list[str | int]): Runs whose details are needed.
+
+        Returns:
+            list[str | int]: Runs whose details still have to be fetched, in the same order.
+
+        Side Effects:
+            - Copies "runs_details_{run_id}.json" from previous_output for every run that
+              had ended, records it in the output manifest and adds its records to
+              results_count["runs_details"]
+
+        """
+        finished = Incremental.get_finished_run_ids(previous_output)
+        pending = []
+        for run_id in run_ids:
+            source = os.path.join(previous_output, f"runs_details_{run_id}.json")
+            if f"{run_id}" not in finished or not os.path.exists(source):
+                pending.append(run_id)
+                continue
+            shutil.copyfile(source, os.path.join(self.output, f"runs_details_{run_id}.json"))
+            records = len(Incremental.read_records(self.output, f"runs_details_{run_id}"))
+            Manifest.record(self.output, f"runs_details_{run_id}", records)
+            self.add_results_count("runs_details", records, True)
+        return pending
+
+    def get_metadata(
+        self,
+        days: int | float = 60,
+        max_workers: int | None = None,
+        previous_output: str | None = None,
+        max_slices: int = 1,
+        deadline: float | None = None,
+        mapping_processes: int | None = None,
+        mapping_cache: bool = False,
+        mapping_columnar: bool = False,
+    ) -> None:
         """Collect comprehensive workspace metadata for sizing analysis.
 
         This method orchestrates the collection of all necessary workspace data
@@ -289,25 +440,62 @@ class Sizing(Manager):
         job configurations, execution history, and detailed events from the
         specified time period.
 
+        The collection is declared as a dependency graph and executed by a
+        DagScheduler: independent endpoints start together, and the steps that
+        read earlier outputs start as soon as those outputs are on disk.
+
         Args:
             days (int | float): Number of days to look back for historical data.
                 Used to calculate the timestamp for cluster events and other
                 time-based data collection. Must be a positive number.
                 Defaults to 60 days.
+            max_workers (int | None): Maximum number of steps running at the same time.
+                If None, uses the max_workers configured on the instance. With 1, the
+                steps run one after another in the order listed below. Defaults to None.
+            previous_output (str | None): Output directory of a previous extraction of the
+                same workspace. If provided, the extraction is incremental: job runs, SQL
+                queries and cluster events are only fetched after the watermarks computed
+                from that directory, merged with its files and trimmed to the days window.
+                Defaults to None (full extraction).
+            max_slices (int): Maximum number of time slices fetched concurrently for job
+                runs and SQL query history. With more than 1, both are restricted to the
+                days window, which is split into slices whose count adapts to the volume
+                seen in the first page (see Manager.get_time_slices()). Defaults to 1
+                (a single cursor chain per endpoint).
+            deadline (float | None): Time budget of the whole extraction in seconds.
+                Once it is spent, requests fail with DeadlineExceededError instead of
+                being sent, and the steps, clusters and runs not started yet are
+                skipped and reported as failed. Defaults to None (no deadline).
+            mapping_processes (int | None): Number of processes parsing the split "runs"
+                and "clusters" files in parallel during the mapping step (see
+                MappingIndex). Defaults to None (single process).
+            mapping_cache (bool): Keep the mapping selection in "<output>/.index_cache"
+                and reuse it when the mapping step runs again over the same "runs" and
+                "clusters" files, e.g. when a failed extraction is resumed. Defaults to
+                False.
+            mapping_columnar (bool): Select the mapping from the dictionary-encoded
+                columnar tables of the "runs" and "clusters" files instead of streaming
+                their rows, with the same result (see MappingIndex). Defaults to False.
 
         Returns:
             None
 
-        Data Collection Sequence:
-            1. **Node Types**: Available cluster node types and specifications
-            2. **Clusters**: All cluster configurations and current state
-            3. **Jobs**: Job definitions with expanded task configurations
-            4. **Job Runs**: Historical job execution records with task details
-            5. **SQL Warehouses**: SQL compute endpoint configurations
-            6. **Pipelines**: Delta Live Tables pipeline statuses
-            7. **SQL Queries**: SQL query execution history
-            8. **Cluster Events**: Detailed lifecycle events for all clusters
-            9. **Run Details**: Comprehensive details for each job run
+        Raises:
+            ValueError: If previous_output is the output directory of this instance.
+
+        Data Collection Graph:
+            Independent steps:
+            1. **node_types**: Available cluster node types and specifications
+            2. **clusters**: All cluster configurations and current state
+            3. **jobs**: Job definitions with expanded task configurations
+            4. **runs**: Historical job execution records with task details
+            5. **warehouses**: SQL compute endpoint configurations
+            6. **pipelines**: Delta Live Tables pipeline statuses
+            7. **queries**: SQL query execution history
+            Dependent steps:
+            8. **mapping**: Cluster and run IDs selected from clusters and runs
+            9. **events**: Detailed lifecycle events for all clusters (after mapping)
+            10. **runs_details**: Comprehensive details for each job run (after mapping)
 
         API Endpoints Used:
             - api/2.0/clusters/list-node-types: Available node types
@@ -323,11 +511,19 @@ class Sizing(Manager):
         Side Effects:
             - Creates multiple JSON files in the output directory
             - Updates self.results_count with record counts for each data type
+            - Stores per-step timings and the critical path in
+              self.summary_sections["schedule"], written to summary.json by show_results()
+            - With a deadline, sets self.deadline, which every request of this
+              instance respects, and marks the skipped steps in the schedule
+            - In incremental mode, stores the watermarks in self.summary_sections["incremental"]
+            - With checkpointing enabled, resumes the endpoints and fan-out items left
+              unfinished by a previous run, and removes the checkpoints once every step
+              succeeded
             - Displays progress bars for tracking collection status
             - May take significant time depending on workspace size and history
 
         Progress Tracking:
-            - Main progress bar shows overall collection progress (9 steps)
+            - Main progress bar shows overall collection progress (one tick per step)
             - Individual operations may show additional progress bars
             - Cluster events and run details show nested progress for individual items
 
@@ -344,7 +540,12 @@ class Sizing(Manager):
 
         Performance Considerations:
             - Uses pagination for large datasets
-            - Sequential processing to respect API rate limits
+            - Job runs and SQL query history are streamed to disk page by page, or
+              fetched as concurrent time slices when max_slices > 1
+            - Sequential processing by default; max_workers > 1 overlaps independent
+              endpoints and the events/run details fan-outs
+            - Cluster and run IDs are selected once, from a single parse of the run and
+              cluster files (MappingIndex), before events and run details start
             - Progress tracking for long-running operations
             - Automatic retry and error handling for individual API calls
 
@@ -357,74 +558,188 @@ class Sizing(Manager):
             # Collect 30 days of workspace data
             sizing.get_metadata(days=30)
 
-            # Collect 90 days of data for comprehensive analysis
-            sizing.get_metadata(days=90)
+            # Collect 90 days of data, running up to 4 steps at a time
+            sizing.get_metadata(days=90, max_workers=4)
 
             # Use default 60-day collection period
             sizing.get_metadata()
 
+            # Split the runs and query history windows into up to 8 concurrent slices
+            sizing.get_metadata(days=60, max_slices=8)
+
+            # Stop sending requests after two hours
+            sizing.get_metadata(days=60, max_workers=4, deadline=2 * 3600)
+
+            # Weekly refresh on top of last week's extraction
+            sizing.get_metadata(days=60, previous_output="./output_last_week")
+
         Note:
             This method is typically the primary entry point for workspace
             data collection and should be called after proper initialization
             of the Sizing instance with valid URL and authentication token.
 
         """
-        with tqdm_notebook(range(9), desc="Processing...") as pb:
-            date_days_ago = datetime.now() - timedelta(days=days)
-            timestamp = int(date_days_ago.timestamp() * 1000)
-            self.get_and_save(
-                path="api/2.0/clusters/list-node-types",
-                name_output="node_types",
-                url_api=self.url if self.url else "",
-                pb=pb,
+        self.deadline = Deadline(deadline) if deadline is not None else None
+        now = datetime.now()
+        timestamp = int((now - timedelta(days=days)).timestamp() * 1000)
+        url_api = self.url if self.url else ""
+        selected_ids: dict[str, list[str | int]] = {}
+        runs_params: dict[str, Any] = {"expand_tasks": "true"}
+        queries_params: dict[str, Any] = {}
+        if previous_output:
+            if os.path.abspath(previous_output) == os.path.abspath(self.output):
+                raise ValueError("previous_output must be different from the output directory.")
+            watermarks = Incremental.get_watermarks(previous_output)
+            if watermarks["runs"]:
+                runs_params["start_time_from"] = max(timestamp, watermarks["runs"])
+            if watermarks["queries"]:
+                queries_params["filter_by.query_start_time_range.start_time_ms"] = max(timestamp, watermarks["queries"])
+            self.summary_sections["incremental"] = {
+                "previous_output": previous_output,
+                "runs": watermarks["runs"],
+                "queries": watermarks["queries"],
+                "events_clusters": len(watermarks["events"]),
+            }
+
+        slicing: dict[str, dict[str, Any]] = {"runs": {}, "queries": {}}
+        if max_slices > 1:
+            window_end = int(now.timestamp() * 1000)
+            for name, params in [("runs", runs_params), ("queries", queries_params)]:
+                slicing[name] = {
+                    "time_slicing": name,
+                    "time_window": (params.get(TimeSlicer.get_preset(name)["from"], timestamp), window_end),
+                    "max_slices": max_slices,
+                }
+
+        def fetch_and_merge(name: str, key: tuple[str, ...], time_field: str, fetch: Any) -> tuple[bool, str]:
+            result = fetch()
+            if previous_output and not result[0]:
+                merged, _ = Incremental.merge_output(
+                    previous_output, self.output, name, key, time_field, timestamp, self.max_file_bytes
+                )
+                self.add_results_count(name, merged)
+            return result
+
+        def select_ids() -> None:
+            index = MappingIndex(
+                self.output, columnar=mapping_columnar, processes=mapping_processes, cache=mapping_cache
             )
-            self.get_and_save(
+            selected_ids["clusters"] = index.get_clusters_ids()
+            selected_ids["runs"] = list(index.get_runs_ids())
+
+        scheduler = DagScheduler(max_workers if max_workers is not None else self.max_workers)
+        scheduler.add_step(
+            "node_types",
+            partial(
+                self.get_and_save, path="api/2.0/clusters/list-node-types", name_output="node_types", url_api=url_api
+            ),
+        )
+        scheduler.add_step(
+            "clusters",
+            partial(
+                self.get_and_save,
                 path="api/2.0/clusters/list",
                 name_output="clusters",
                 use_paging=True,
-                url_api=self.url if self.url else "",
-                pb=pb,
-            )
-            self.get_and_save(
+                url_api=url_api,
+            ),
+        )
+        scheduler.add_step(
+            "jobs",
+            partial(
+                self.get_and_save,
                 path="api/2.2/jobs/list",
                 name_output="jobs",
                 use_paging=True,
-                url_api=self.url if self.url else "",
+                url_api=url_api,
                 default_params={"expand_tasks": "true"},
-                pb=pb,
-            )
-            self.get_and_save(
-                path="api/2.1/jobs/runs/list",
-                name_output="runs",
-                use_paging=True,
-                default_params={"expand_tasks": "true"},
-                url_api=self.url if self.url else "",
-                pb=pb,
-                paging_pb=True,
-            )
-            self.get_and_save(
+            ),
+        )
+        scheduler.add_step(
+            "runs",
+            partial(
+                fetch_and_merge,
+                "runs",
+                ("run_id",),
+                "start_time",
+                partial(
+                    self.get_and_save,
+                    path="api/2.1/jobs/runs/list",
+                    name_output="runs",
+                    use_paging=True,
+                    default_params=runs_params,
+                    url_api=url_api,
+                    paging_pb=True,
+                    stream=True,
+                    **slicing["runs"],
+                ),
+            ),
+        )
+        scheduler.add_step(
+            "warehouses",
+            partial(
+                self.get_and_save,
                 path="api/2.0/sql/warehouses",
                 name_output="warehouses",
                 use_paging=True,
-                url_api=self.url if self.url else "",
-                pb=pb,
-            )
-            self.get_and_save(
+                url_api=url_api,
+            ),
+        )
+        scheduler.add_step(
+            "pipelines",
+            partial(
+                self.get_and_save,
                 path="api/2.0/pipelines",
                 name_output="pipelines",
                 array_field="statuses",
                 use_paging=True,
                 default_params={"max_results": 100},
-                url_api=self.url if self.url else "",
-                pb=pb,
-            )
-            self.get_and_save(
-                path="api/2.0/sql/history/queries",
-                name_output="queries",
-                array_field="res",
-                use_paging=True,
-                url_api=self.url if self.url else "",
-                pb=pb,
-            )
-            self.get_clusters_events(timestamp, pb=pb)
-            self.get_runs_details(pb=pb)
+                url_api=url_api,
+            ),
+        )
+        scheduler.add_step(
+            "queries",
+            partial(
+                fetch_and_merge,
+                "queries",
+                ("query_id",),
+                "query_start_time_ms",
+                partial(
+                    self.get_and_save,
+                    path="api/2.0/sql/history/queries",
+                    name_output="queries",
+                    array_field="res",
+                    use_paging=True,
+                    default_params=queries_params,
+                    url_api=url_api,
+                    stream=True,
+                    **slicing["queries"],
+                ),
+            ),
+        )
+        scheduler.add_step("mapping", select_ids, depends_on=["clusters", "runs"])
+        scheduler.add_step(
+            "events",
+            lambda: self.get_clusters_events(
+                timestamp, cluster_ids=selected_ids.get("clusters", []), previous_output=previous_output
+            ),
+            depends_on=["mapping"],
+        )
+        scheduler.add_step(
+            "runs_details",
+            lambda: self.get_runs_details(run_ids=selected_ids.get("runs", []), previous_output=previous_output),
+            depends_on=["mapping"],
+        )
+        try:
+            with tqdm_notebook(range(len(scheduler.steps)), desc="Processing...") as pb:
+                schedule = scheduler.run(
+                    on_start=lambda name: pb.set_description(f"Processing {name}"),
+                    on_finish=lambda name: pb.update(1),
+                    deadline=self.deadline,
+                )
+        finally:
+            if self.hedger:
+                self.hedger.close()
+        self.summary_sections["schedule"] = schedule
+        if self.checkpoint and not any(step["error"] for step in schedule["steps"].values()):
+            self.checkpoint.clear()
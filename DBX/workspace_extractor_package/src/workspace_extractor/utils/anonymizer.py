@@ -0,0 +1,107 @@
+import functools
+import re
+import sys
+
+from typing import Any
+
+
+class Anonymizer:
+    email_pattern = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}")
+    url_parameters_pattern = re.compile("^(?:https?:\\/\\/)?(?:[^@\\/\n]+@)?(?:www\\.)?([^:?\n]+)")
+    dbx_pattern = re.compile(r"https?://adb-\d{4,16}\.\d{0,2}|https?://dbc-.{4,12}-.{2,4}")
+    jwt_pattern = re.compile(r"[A-Za-z0-9_-]{4,}(?:\.[A-Za-z0-9_-]{4,}){2}")
+
+    def __init__(self, cache_size: int = 65536, max_cached_length: int = 1024) -> None:
+        """Initialize the anonymizer applied to every string of the extracted payloads.
+
+        clean_str() gives exactly the result of the UtilFile chain replace_emails,
+        replace_adb_url, remove_url_parameters and remove_jwt, in that order, but
+        each step only runs its regex when the string contains what the pattern
+        needs to match: an "@" for emails, "://" for workspace URLs, a ":", "?",
+        newline or "@" (or a leading "www.") for URL parameters, and two dots for
+        JWTs. Those checks are plain substring searches, so most strings (names,
+        states, identifiers) are returned after a few fast scans without running
+        any regex. The steps stay separate and ordered because each one works on
+        the output of the previous one: a single alternation over the four
+        patterns would resolve overlapping matches differently.
+
+        Job names, owner emails, notebook paths, tags and Spark settings repeat
+        across thousands of records, so results are kept in a bounded LRU cache
+        keyed on the input string. Cached results are interned, so every copy of a
+        repeated value in the anonymized payload shares one string object. Strings
+        longer than max_cached_length, such as query texts, are rarely repeated and
+        are cleaned without the cache.
+
+        Args:
+            cache_size (int): Maximum number of cached strings. 0 disables the cache.
+                Defaults to 65536.
+            max_cached_length (int): Length above which strings bypass the cache.
+                Defaults to 1024.
+
+        Returns:
+            None
+
+        Example:
+            anonymizer = Anonymizer()
+            anonymizer.clean_str("Owner: jane.doe@example.com")  # "Owner"
+            anonymizer.get_stats()  # {"hits": 0, "misses": 1, ...}
+
+        """
+        self.max_cached_length = max_cached_length
+        self.cached_clean_str = functools.lru_cache(maxsize=cache_size)(self.clean_and_intern) if cache_size else None
+
+    def clean_str(self, text: str) -> str:
+        """Return a string with emails, workspace URLs, URL parameters and JWTs removed.
+
+        Args:
+            text (str): String to anonymize.
+
+        Returns:
+            str: The anonymized string, identical to UtilFile's regex chain.
+
+        """
+        if self.cached_clean_str is None or len(text) > self.max_cached_length:
+            return self.clean_uncached(text)
+        return self.cached_clean_str(text)
+
+    def clean_and_intern(self, text: str) -> str:
+        return sys.intern(self.clean_uncached(text))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the cache statistics.
+
+        Returns:
+            dict[str, Any]: hits, misses, hit_rate (hits over cached lookups, 0.0
+                before the first one), size (strings cached) and max_size.
+
+        """
+        if self.cached_clean_str is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0, "max_size": 0}
+        info = self.cached_clean_str.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    def clear_cache(self) -> None:
+        if self.cached_clean_str is not None:
+            self.cached_clean_str.cache_clear()
+
+    def clean_uncached(self, text: str) -> str:
+        if "@" in text:
+            text = self.email_pattern.sub("[EMAIL_REMOVED]", text)
+        if "://" in text:
+            text = self.dbx_pattern.sub("https://adb-0000000000000.00", text)
+        # Without these characters or a leading "www.", url_parameters_pattern matches
+        # the whole string, so the step can be skipped.
+        if ":" in text or "?" in text or "\n" in text or "@" in text or text.startswith("www."):
+            matches = self.url_parameters_pattern.match(text)
+            if matches:
+                text = matches.group(1)
+        if text.count(".") >= 2:
+            text = self.jwt_pattern.sub("[TOKEN_REMOVED]", text)
+        return text
@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import threading
+
+from typing import Any
+
+
+class Checkpoint:
+    def __init__(self, output: str) -> None:
+        """Initialize the checkpoint store of an extraction.
+
+        Checkpoints live in "<output>/.checkpoints" and record, per output file, the
+        pagination cursor reached so far, and per fan-out group (events, run details)
+        the items already saved. A restarted extraction pointed at the same output
+        directory resumes from them instead of starting every endpoint from page zero.
+
+        Args:
+            output (str): Output directory of the extraction.
+
+        Returns:
+            None
+
+        """
+        self.folder = os.path.join(output, ".checkpoints")
+        self._lock = threading.Lock()
+
+    def _path(self, name: str, extension: str) -> str:
+        return os.path.join(self.folder, f"{name}.{extension}")
+
+    def load(self, name: str) -> dict[str, Any] | None:
+        """Return the saved state of an output file, or None if there is none.
+
+        Args:
+            name (str): Output file name without extension, e.g. "runs".
+
+        Returns:
+            dict[str, Any] | None: State saved by save_page() or complete().
+
+        """
+        path = self._path(name, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            return json.load(file)
+
+    def save_page(self, name: str, state: dict[str, Any]) -> None:
+        """Persist the cursor reached after a page was written.
+
+        The state is replaced atomically, so an interruption at any point leaves a
+        state that matches a prefix of the output.
+
+        Args:
+            name (str): Output file name without extension.
+            state (dict[str, Any]): Pagination state with the keys params, counter,
+                next_page_token, offset, skip, pages, and the writer position: part,
+                records, part_records and bytes.
+
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        self._write_state(name, state)
+
+    def complete(self, name: str, records: int) -> None:
+        """Mark an output file as fully fetched.
+
+        Args:
+            name (str): Output file name without extension.
+            records (int): Number of records saved for the file.
+
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        self._write_state(name, {"done": True, "records": records})
+
+    def reset(self, name: str) -> None:
+        path = self._path(name, "json")
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_completed_items(self, group: str) -> dict[str, int]:
+        """Return the fan-out items already saved for a group.
+
+        Args:
+            group (str): Fan-out group, e.g. "events" or "runs_details".
+
+        Returns:
+            dict[str, int]: Number of records saved, keyed by item (as a string).
+
+        """
+        path = self._path(group, "items")
+        completed: dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    item, _, records = line.rstrip("\n").rpartition("\t")
+                    if item:
+                        completed[item] = int(records)
+        return completed
+
+    def add_completed_item(self, group: str, item: str | int, records: int) -> None:
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self._path(group, "items"), "a") as file:
+                file.write(f"{item}\t{records}\n")
+
+    def clear(self) -> None:
+        """Delete every checkpoint once the extraction has finished."""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _write_state(self, name: str, state: dict[str, Any]) -> None:
+        path = self._path(name, "json")
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(state, file)
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,126 @@
+from array import array
+from collections.abc import Hashable, Iterable
+from itertools import islice
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarTable:
+    CATEGORY = "category"
+    FLOAT = "float"
+    batch_size = 4096
+
+    def __init__(self, columns: dict[str, np.ndarray], categories: dict[str, list[Hashable]] | None = None) -> None:
+        """Initialize a table stored as one NumPy array per column.
+
+        String-like columns are dictionary-encoded: the column holds int32 codes into
+        a list of distinct values, with -1 for None, so a job name repeated on every
+        task is stored once. Numeric columns are float64 with NaN for None.
+
+        Args:
+            columns (dict[str, np.ndarray]): Column arrays, all of the same length.
+                Codes for category columns, values for float columns.
+            categories (dict[str, list[Hashable]] | None): Distinct values of each
+                category column, indexed by code. Defaults to None (no category column).
+
+        Returns:
+            None
+
+        Example:
+            schema = {"run_name": ColumnarTable.CATEGORY, "end_time": ColumnarTable.FLOAT}
+            table = ColumnarTable.from_rows([("nightly", 10), ("nightly", 30)], schema)
+            table.get_values("run_name")  # ["nightly", "nightly"]
+
+        """
+        self.columns = columns
+        self.categories = categories or {}
+
+    @staticmethod
+    def from_rows(rows: Iterable[tuple[Any, ...]], schema: dict[str, str]) -> "ColumnarTable":
+        """Build a table from row tuples in one pass, without a dict per row.
+
+        Rows are consumed in batches of batch_size and each batch is transposed and
+        encoded column by column, so only one batch of rows is held at a time.
+
+        Args:
+            rows (Iterable[tuple[Any, ...]]): Rows whose values follow the order of schema.
+            schema (dict[str, str]): Column names mapped to ColumnarTable.CATEGORY or
+                ColumnarTable.FLOAT.
+
+        Returns:
+            ColumnarTable: The table.
+
+        Raises:
+            ValueError: If a column kind is unknown.
+
+        """
+        kinds = list(schema.values())
+        unknown = [kind for kind in kinds if kind not in (ColumnarTable.CATEGORY, ColumnarTable.FLOAT)]
+        if unknown:
+            raise ValueError(f"Unknown column kind '{unknown[0]}'")
+        buffers = [array("i") if kind == ColumnarTable.CATEGORY else array("d") for kind in kinds]
+        # None is pre-registered with code -1, so codes of the values start at 0.
+        lookups = [{None: -1} if kind == ColumnarTable.CATEGORY else None for kind in kinds]
+        nan = float("nan")
+        rows = iter(rows)
+        while batch := list(islice(rows, ColumnarTable.batch_size)):
+            for values, buffer, lookup in zip(zip(*batch, strict=True), buffers, lookups, strict=True):
+                if lookup is None:
+                    buffer.extend([nan if value is None else value for value in values])
+                else:
+                    buffer.extend([lookup.setdefault(value, len(lookup) - 1) for value in values])
+        columns = {}
+        categories = {}
+        for name, buffer, lookup in zip(schema, buffers, lookups, strict=True):
+            columns[name] = np.frombuffer(buffer, dtype=np.int32 if lookup is not None else np.float64).copy()
+            if lookup is not None:
+                categories[name] = list(lookup)[1:]
+        return ColumnarTable(columns, categories)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def get_values(self, name: str, indices: np.ndarray | None = None) -> list[Any]:
+        """Return the decoded values of a column.
+
+        Args:
+            name (str): Column name.
+            indices (np.ndarray | None): Rows to decode. Defaults to None (every row).
+
+        Returns:
+            list[Any]: One value per row, None where the value is missing.
+
+        """
+        column = self.columns[name] if indices is None else self.columns[name][indices]
+        if name not in self.categories:
+            return [None if np.isnan(value) else value for value in column.tolist()]
+        categories = self.categories[name]
+        return [categories[code] if code >= 0 else None for code in column.tolist()]
+
+    def get_code(self, name: str, value: Hashable) -> int:
+        """Return the code of a value in a category column, or -2 if it never occurs.
+
+        -2 matches no row, so comparisons such as table.columns[name] == code stay
+        valid for absent values.
+
+        """
+        try:
+            return self.categories[name].index(value)
+        except ValueError:
+            return -2
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Return the table as a DataFrame with pandas categorical string columns."""
+        data = {}
+        for name, column in self.columns.items():
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(column, categories=pd.Index(self.categories[name], dtype=object))
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
@@ -0,0 +1,168 @@
+import time
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from workspace_extractor.utils.deadline import Deadline
+
+
+class DagScheduler:
+    def __init__(self, max_workers: int = 1) -> None:
+        """Initialize a scheduler for steps declared as a dependency graph.
+
+        Args:
+            max_workers (int): Maximum number of steps running at the same time.
+                With 1, steps run one at a time in declaration order, as long as
+                their dependencies allow it. Defaults to 1.
+
+        Returns:
+            None
+
+        """
+        self.max_workers = max(1, max_workers)
+        self.steps: dict[str, dict[str, Any]] = {}
+        self.results: dict[str, Any] = {}
+        self.timings: dict[str, dict[str, Any]] = {}
+
+    def add_step(self, name: str, task: Callable[[], Any], depends_on: Iterable[str] = ()) -> None:
+        """Declare a step and the steps whose output it needs.
+
+        Args:
+            name (str): Unique step name, e.g. "clusters" or "events".
+            task (Callable[[], Any]): Function executed for the step. Its return value
+                is stored in results. A returned (True, message) tuple, as produced by
+                Manager.get_and_save(), marks the step as failed.
+            depends_on (Iterable[str]): Names of steps that must finish before this one
+                starts. They must already be declared. Defaults to no dependencies.
+
+        Raises:
+            ValueError: If the name is already declared or a dependency is unknown.
+
+        """
+        depends_on = list(depends_on)
+        if name in self.steps:
+            raise ValueError(f"Step '{name}' is already declared.")
+        unknown = [dependency for dependency in depends_on if dependency not in self.steps]
+        if unknown:
+            raise ValueError(f"Step '{name}' depends on undeclared steps: {', '.join(unknown)}")
+        self.steps[name] = {"task": task, "depends_on": depends_on}
+
+    def run(
+        self,
+        on_start: Callable[[str], None] | None = None,
+        on_finish: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Run every step, starting each one as soon as its dependencies have finished.
+
+        Steps whose dependencies failed still run, matching the serial extraction where a
+        failed endpoint never stopped the following ones. Callbacks are invoked from the
+        calling thread only, so they can safely update a progress bar.
+
+        Args:
+            on_start (Callable[[str], None] | None): Called with the step name when a step
+                is submitted. Defaults to None.
+            on_finish (Callable[[str], None] | None): Called with the step name when a step
+                finishes. Defaults to None.
+            deadline (Deadline | None): Overall deadline. Steps that haven't started
+                when it passes are skipped: they are recorded as failed and skipped,
+                without running their task. Running steps are not interrupted.
+                Defaults to None.
+
+        Returns:
+            dict[str, Any]: Scheduling summary with the following keys:
+                - steps: Per-step start, end and duration in seconds (relative to the
+                  scheduler start), dependencies, error flag and skipped flag
+                - critical_path: Chain of steps that determined the total duration
+                - critical_path_seconds: Duration of the critical path
+                - wall_seconds: Total elapsed time
+
+        """
+        pending = list(self.steps)
+        finished: set[str] = set()
+        running: dict[Future, str] = {}
+        origin = time.perf_counter()
+
+        def execute(name: str) -> Any:
+            self.timings[name] = {"start": time.perf_counter() - origin}
+            try:
+                return self.steps[name]["task"]()
+            finally:
+                self.timings[name]["end"] = time.perf_counter() - origin
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+                    if all(dependency in finished for dependency in self.steps[name]["depends_on"]):
+                        pending.remove(name)
+                        if deadline and deadline.expired():
+                            now = time.perf_counter() - origin
+                            self.timings[name] = {"start": now, "end": now, "error": True, "skipped": True}
+                            self.results[name] = True, f"Deadline of {deadline.seconds}s exceeded before {name}"
+                            finished.add(name)
+                            if on_finish:
+                                on_finish(name)
+                            continue
+                        if on_start:
+                            on_start(name)
+                        running[executor.submit(execute, name)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                        error = isinstance(self.results[name], tuple) and self.results[name][:1] == (True,)
+                    except Exception as e:
+                        self.results[name] = True, str(e)
+                        error = True
+                    self.timings[name]["error"] = error
+                    finished.add(name)
+                    if on_finish:
+                        on_finish(name)
+
+        return self.get_summary(time.perf_counter() - origin)
+
+    def get_critical_path(self) -> list[str]:
+        """Return the chain of steps that gated the end of the run.
+
+        Starting from the step that finished last, walks back through the dependency
+        that finished last before it, i.e. the input the step was waiting for.
+
+        Returns:
+            list[str]: Step names from the first to the last step of the critical path.
+                Empty if no step has run.
+
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda step: self.timings[step]["end"])
+        path = [name]
+        while self.steps[name]["depends_on"]:
+            name = max(self.steps[name]["depends_on"], key=lambda step: self.timings[step]["end"])
+            path.append(name)
+        return path[::-1]
+
+    def get_summary(self, wall_seconds: float) -> dict[str, Any]:
+        steps = {
+            name: {
+                "start": round(timing["start"], 3),
+                "end": round(timing["end"], 3),
+                "duration": round(timing["end"] - timing["start"], 3),
+                "depends_on": self.steps[name]["depends_on"],
+                "error": timing.get("error", False),
+                "skipped": timing.get("skipped", False),
+            }
+            for name, timing in self.timings.items()
+        }
+        critical_path = self.get_critical_path()
+        return {
+            "steps": steps,
+            "critical_path": critical_path,
+            "critical_path_seconds": round(sum(steps[name]["duration"] for name in critical_path), 3),
+            "wall_seconds": round(wall_seconds, 3),
+        }
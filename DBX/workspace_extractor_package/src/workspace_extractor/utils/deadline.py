@@ -0,0 +1,45 @@
+import time
+
+from workspace_extractor.exceptions.deadline_exceeded_error import DeadlineExceededError
+
+
+class Deadline:
+    def __init__(self, seconds: float) -> None:
+        """Start the clock of an overall time budget.
+
+        Args:
+            seconds (float): Time allowed from now, in seconds.
+
+        Returns:
+            None
+
+        Example:
+            deadline = Deadline(3600)
+            ...
+            deadline.check("api/2.1/jobs/runs/get")
+            timeout = (10, min(300, deadline.remaining()))
+
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, what: str = "") -> None:
+        """Raise if the deadline has passed.
+
+        Args:
+            what (str): Operation about to start, included in the error message.
+                Defaults to "".
+
+        Raises:
+            DeadlineExceededError: If the time budget is exhausted.
+
+        """
+        if self.expired():
+            target = f" before {what}" if what else ""
+            raise DeadlineExceededError(f"Deadline of {self.seconds}s exceeded{target}")
@@ -0,0 +1,79 @@
+import threading
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from workspace_extractor.utils.deadline import Deadline
+
+
+class FanOut:
+    @staticmethod
+    def run(
+        items: Iterable[Any],
+        task: Callable[[Any], tuple[bool, str]],
+        max_workers: int = 1,
+        pb: Any | None = None,
+        describe: Callable[[Any], str] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[tuple[bool, str]]:
+        """Run a task for every item with bounded concurrency.
+
+        Items are processed inline when max_workers is 1, otherwise on a thread pool
+        with at most max_workers tasks in flight. Each item is isolated: an exception
+        raised by the task is converted into an error result for that item and does
+        not stop the remaining items.
+
+        Args:
+            items (Iterable[Any]): Items to process, e.g. cluster IDs or run IDs.
+            task (Callable[[Any], tuple[bool, str]]): Function called once per item.
+                Returns the same (error, message) tuple as Manager.get_and_save().
+            max_workers (int): Maximum number of items processed concurrently.
+                Values below 1 are treated as 1. Defaults to 1.
+            pb (Any | None): Progress bar shared by all workers. Updated once per
+                finished item. Defaults to None.
+            describe (Callable[[Any], str] | None): Builds the progress bar description
+                for an item when it starts. Defaults to None.
+            deadline (Deadline | None): Overall deadline. Items not started when it
+                passes are skipped with an error result. Defaults to None.
+
+        Returns:
+            list[tuple[bool, str]]: One (error, message) tuple per item, in the same
+                order as items regardless of completion order.
+
+        Example:
+            results = FanOut.run(
+                cluster_ids,
+                lambda cluster: manager.get_and_save(path="api/2.0/clusters/events", suffix=f"_{cluster}"),
+                max_workers=8,
+            )
+            failed = [message for error, message in results if error]
+
+        """
+        items = list(items)
+        results: list[tuple[bool, str]] = [(False, "")] * len(items)
+        pb_lock = threading.Lock()
+
+        def execute(index: int, item: Any) -> None:
+            if pb and describe:
+                with pb_lock:
+                    pb.set_description(describe(item))
+            try:
+                if deadline:
+                    deadline.check(f"{item}")
+                results[index] = task(item)
+            except Exception as e:
+                results[index] = True, str(e)
+            if pb:
+                with pb_lock:
+                    pb.update(1)
+
+        if max_workers <= 1:
+            for index, item in enumerate(items):
+                execute(index, item)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(execute, index, item) for index, item in enumerate(items)]
+                for future in futures:
+                    future.result()
+        return results
@@ -0,0 +1,266 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
+import time
+
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any
+
+from workspace_extractor.utils.json_stream import JsonArrayReader
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util_file import UtilFile
+
+
+class FolderScrubber:
+    part_pattern = re.compile(r"_\d{2,}$")
+
+    def __init__(
+        self,
+        source: str,
+        target: str | None = None,
+        processes: int | None = None,
+        keys: list[str] | None = None,
+        use_plans: bool = False,
+        chunk_bytes: int = 16 * 1024 * 1024,
+        chunk_records: int = 2000,
+    ) -> None:
+        """Initialize the anonymization of every JSON file of an output folder.
+
+        UtilFile.filter_data() is pure Python and runs on one core, so run() spreads
+        the files over a process pool. Files up to chunk_bytes are read, scrubbed and
+        written by a worker process. Larger files are parsed in this process and
+        their records are sent to the pool in batches of chunk_records, whose
+        scrubbed text is written back in order, so a single large "runs" part is
+        scrubbed on every core too. Every file is written to a temporary file that
+        replaces the destination once complete, so an interrupted run never leaves
+        a half-written file. Scrubbed files have the layout of the files written by
+        the extraction, and the manifest, if any, gets a new entry for each of them.
+
+        Args:
+            source (str): Output folder to scrub.
+            target (str | None): Folder receiving the scrubbed files. Files that are
+                not JSON are copied to it as they are. Defaults to None (the files
+                of source are replaced).
+            processes (int | None): Number of worker processes. 1 scrubs in this
+                process. Defaults to None (os.cpu_count()).
+            keys (list[str] | None): Keys removed from the records, as in
+                UtilFile.filter_data(). Defaults to None (no key removed).
+            use_plans (bool): Whether files of entities with a ScrubPlan ("runs",
+                "clusters", "jobs", ...) are scrubbed with it: every string is still
+                anonymized, and the plan's secret paths such as spark_env_vars are
+                dropped as well. Defaults to False (UtilFile.filter_data() alone).
+            chunk_bytes (int): Size above which a file is split into record batches.
+                Defaults to 16 MiB.
+            chunk_records (int): Number of records per batch of a split file.
+                Defaults to 2000.
+
+        Returns:
+            None
+
+        Example:
+            stats = FolderScrubber("./output", "./output_shared", processes=8).run()
+            print(f"{stats['files_per_second']:.0f} files/s, {stats['bytes_per_second'] / 2**20:.1f} MB/s")
+
+        """
+        self.source = source
+        self.target = target or source
+        self.processes = processes or os.cpu_count() or 1
+        self.keys = keys or []
+        self.use_plans = use_plans
+        self.chunk_bytes = chunk_bytes
+        self.chunk_records = chunk_records
+
+    def get_entity(self, relative_path: str) -> str | None:
+        """Return the entity whose ScrubPlan applies to a file, or None for filter_data() alone."""
+        if not self.use_plans:
+            return None
+        name = FolderScrubber.part_pattern.sub("", os.path.splitext(os.path.basename(relative_path))[0])
+        return Manifest.get_entity(name)
+
+    def run(self) -> dict[str, Any]:
+        """Scrub every JSON file of the source folder.
+
+        Returns:
+            dict[str, Any]: files (JSON files scrubbed), records, bytes (size of the
+                scrubbed source files), copied (other files copied to the target),
+                seconds, files_per_second and bytes_per_second.
+
+        Raises:
+            FileNotFoundError: If the source folder does not exist.
+
+        Side Effects:
+            - Writes the scrubbed files to the target folder, replacing the source
+              files when no target is given
+            - Appends an entry for every scrubbed file listed in the manifest
+
+        """
+        if not os.path.isdir(self.source):
+            raise FileNotFoundError(f"The source folder '{self.source}' does not exist.")
+        start = time.perf_counter()
+        stats: dict[str, Any] = {"files": 0, "records": 0, "bytes": 0, "copied": 0}
+        small: list[tuple[str, str]] = []
+        large: list[tuple[str, str]] = []
+        for file_path, relative_path in self.get_entries():
+            target_path = os.path.join(self.target, relative_path)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            if not relative_path.endswith(".json"):
+                if target_path != file_path:
+                    shutil.copyfile(file_path, target_path)
+                    stats["copied"] += 1
+                continue
+            (large if os.path.getsize(file_path) > self.chunk_bytes else small).append((file_path, relative_path))
+
+        results: dict[str, tuple[int, int, str]] = {}
+        executor: Executor | None = ProcessPoolExecutor(self.processes) if self.processes > 1 else None
+        try:
+            futures = {
+                relative_path: self.submit(
+                    executor,
+                    FolderScrubber.scrub_file,
+                    file_path,
+                    os.path.join(self.target, relative_path),
+                    self.keys,
+                    self.get_entity(relative_path),
+                )
+                for file_path, relative_path in small
+            }
+            for file_path, relative_path in large:
+                results[relative_path] = self.scrub_large_file(executor, file_path, relative_path)
+            for relative_path, future in futures.items():
+                results[relative_path] = future.result()
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        entries = Manifest.load(self.target) or {}
+        for relative_path, (size, records, sha256) in results.items():
+            stats["files"] += 1
+            stats["records"] += records
+            stats["bytes"] += size
+            entry = entries.get(relative_path)
+            if entry:
+                Manifest.record(self.target, entry["name"], records, entry.get("part"), sha256)
+        stats["seconds"] = time.perf_counter() - start
+        stats["files_per_second"] = stats["files"] / stats["seconds"] if stats["seconds"] else 0.0
+        stats["bytes_per_second"] = stats["bytes"] / stats["seconds"] if stats["seconds"] else 0.0
+        return stats
+
+    def get_entries(self) -> Iterator[tuple[str, str]]:
+        """Yield (file path, relative path) of every file of the source, skipping hidden directories."""
+        for root, dirs, files in os.walk(self.source):
+            dirs[:] = sorted(folder for folder in dirs if not folder.startswith("."))
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                yield file_path, os.path.relpath(file_path, self.source)
+
+    @staticmethod
+    def submit(executor: Executor | None, function: Any, *args: Any) -> Future:
+        """Run a function on the executor, or right away when there is none."""
+        if executor:
+            return executor.submit(function, *args)
+        future: Future = Future()
+        future.set_result(function(*args))
+        return future
+
+    def scrub_large_file(self, executor: Executor | None, file_path: str, relative_path: str) -> tuple[int, int, str]:
+        """Scrub a JSON array file in record batches spread over the pool.
+
+        Args:
+            executor (Executor | None): Process pool, or None to scrub in this process.
+            file_path (str): Path of the source file.
+            relative_path (str): Path of the file relative to the source folder.
+
+        Returns:
+            tuple[int, int, str]: Source file size, records and sha256 of the scrubbed file.
+
+        """
+        target_path = os.path.join(self.target, relative_path)
+        try:
+            batches = FolderScrubber.get_batches(file_path, self.chunk_records)
+            first = next(batches, [])
+        except ValueError:
+            # Not a JSON array: scrubbed whole, like a small file.
+            return FolderScrubber.scrub_file(file_path, target_path, self.keys, self.get_entity(relative_path))
+        entity = self.get_entity(relative_path)
+        digest = hashlib.sha256()
+        records = 0
+        pending: deque[tuple[int, Future]] = deque()
+        temp_path = f"{target_path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, "w") as file:
+
+                def write(text: str) -> None:
+                    file.write(text)
+                    digest.update(text.encode())
+
+                def write_next() -> None:
+                    nonlocal records
+                    count, future = pending.popleft()
+                    write(f"{', ' if records else ''}{future.result()}")
+                    records += count
+
+                write("[")
+                for batch in itertools.chain([first], batches) if first else []:
+                    if len(pending) >= 2 * self.processes:
+                        write_next()
+                    future = self.submit(executor, FolderScrubber.scrub_records, batch, self.keys, entity)
+                    pending.append((len(batch), future))
+                while pending:
+                    write_next()
+                write("]")
+            os.replace(temp_path, target_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return os.path.getsize(file_path), records, digest.hexdigest()
+
+    @staticmethod
+    def get_batches(file_path: str, chunk_records: int) -> Iterator[list[Any]]:
+        batch: list[Any] = []
+        for record in JsonArrayReader(file_path):
+            batch.append(record)
+            if len(batch) == chunk_records:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def scrub_records(records: list[Any], keys: list[str], entity: str | None) -> str:
+        """Return the scrubbed records serialized as the items of a JSON array."""
+        return ", ".join(json.dumps(record) for record in UtilFile.filter_data(records, keys, entity))
+
+    @staticmethod
+    def scrub_file(file_path: str, target_path: str, keys: list[str], entity: str | None) -> tuple[int, int, str]:
+        """Scrub a JSON file and write it atomically.
+
+        Args:
+            file_path (str): Path of the source file.
+            target_path (str): Path of the scrubbed file, which may be file_path.
+            keys (list[str]): Keys removed from the records.
+            entity (str | None): Entity whose ScrubPlan is used, or None for filter_data() alone.
+
+        Returns:
+            tuple[int, int, str]: Source file size, records and sha256 of the scrubbed file.
+
+        """
+        size = os.path.getsize(file_path)
+        with open(file_path) as file:
+            json_data = UtilFile.filter_data(json.load(file), keys, entity)
+        data = json.dumps(json_data)
+        temp_path = f"{target_path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, "w") as file:
+                file.write(data)
+            os.replace(temp_path, target_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return size, UtilFile.get_count(json_data), hashlib.sha256(data.encode()).hexdigest()
@@ -0,0 +1,173 @@
+import threading
+import time
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import requests
+
+from workspace_extractor.utils.rate_limiter import RateLimiter
+
+
+class Hedger:
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 500,
+        max_workers: int = 32,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        """Initialize hedging of idempotent requests against tail latency.
+
+        The latency of every request is recorded per endpoint. Once an endpoint has
+        min_samples measurements, a request still running after the quantile of the
+        latencies seen so far gets a second, identical copy, and whichever copy
+        finishes first is returned. The slower copy is left to finish in the
+        background and its response is discarded. With a rate limiter, the copy
+        holds a slot of the request's family while it runs, and is not sent when
+        the family has no free slot, so hedging never exceeds the family's limit.
+        The threads sending the requests are started on the first hedged endpoint
+        and stopped by close().
+
+        Args:
+            quantile (float): Latency quantile after which a request is hedged.
+                Defaults to 0.95 (p95).
+            min_samples (int): Measurements needed before an endpoint is hedged.
+                Defaults to 20.
+            window (int): Number of most recent measurements kept per endpoint.
+                Defaults to 500.
+            max_workers (int): Threads sending the requests and their copies.
+                Defaults to 32.
+            rate_limiter (RateLimiter | None): Limiter whose slots the copies take.
+                Defaults to None (copies are not limited).
+
+        Returns:
+            None
+
+        Example:
+            hedger = Hedger()
+            response = hedger.request("api/2.1/jobs/runs/get", lambda: session.get(url))
+            hedger.close()
+
+        """
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self.latencies: dict[str, deque] = {}
+        self.stats: dict[str, dict[str, int]] = {}
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def get_threshold(self, endpoint: str) -> float | None:
+        """Return the latency after which a request to the endpoint is hedged.
+
+        Args:
+            endpoint (str): API path, e.g. "api/2.1/jobs/runs/get".
+
+        Returns:
+            float | None: The configured quantile of the recorded latencies in seconds,
+                or None while fewer than min_samples were recorded.
+
+        """
+        with self._lock:
+            samples = sorted(self.latencies.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(self.quantile * len(samples)))]
+
+    def request(
+        self, endpoint: str, send: Callable[[], requests.Response], family: str | None = None
+    ) -> requests.Response:
+        """Send a request, and a copy of it if it is slower than the endpoint's threshold.
+
+        Args:
+            endpoint (str): API path the request is sent to.
+            send (Callable[[], requests.Response]): Function performing the request.
+                Must be idempotent, since it may be called twice.
+            family (str | None): Rate limiter family of the request, whose slot the
+                copy takes. Defaults to None (RateLimiter.get_family(endpoint)).
+
+        Returns:
+            requests.Response: Response of the first copy that succeeded.
+
+        Raises:
+            Exception: The error of the first copy if both copies failed.
+
+        """
+        threshold = self.get_threshold(endpoint)
+        start = time.perf_counter()
+        if threshold is None:
+            response = send()
+            self.record(endpoint, time.perf_counter() - start)
+            return response
+
+        executor = self._get_executor()
+        futures: list[Future] = [executor.submit(send)]
+        done, _ = wait(futures, timeout=threshold)
+        if not done:
+            family = family or RateLimiter.get_family(endpoint)
+            if self.rate_limiter is None or self.rate_limiter.try_acquire(family):
+                futures.append(executor.submit(self._send_copy, send, family))
+                self._count(endpoint, "hedged")
+            else:
+                self._count(endpoint, "skipped")
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in futures if future in done and not future.exception()), None)
+            if winner:
+                self.record(endpoint, time.perf_counter() - start)
+                if winner is not futures[0]:
+                    self._count(endpoint, "hedge_wins")
+                return winner.result()
+        return futures[0].result()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the hedging statistics of every endpoint that was hedged at least once.
+
+        Returns:
+            dict[str, dict[str, Any]]: Per endpoint, the number of hedged requests, how
+                many times the copy finished first, how many copies were not sent for
+                lack of a rate limiter slot, and the current threshold in seconds.
+
+        """
+        with self._lock:
+            endpoints = {endpoint: dict(counts) for endpoint, counts in self.stats.items()}
+        for endpoint, counts in endpoints.items():
+            threshold = self.get_threshold(endpoint)
+            counts["threshold_seconds"] = round(threshold, 3) if threshold is not None else None
+        return endpoints
+
+    def close(self) -> None:
+        """Stop the request threads once their requests are done. The next hedged request starts new ones."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def _send_copy(self, send: Callable[[], requests.Response], family: str) -> requests.Response:
+        try:
+            return send()
+        finally:
+            if self.rate_limiter is not None:
+                self.rate_limiter.release(family)
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(endpoint, {"hedged": 0, "hedge_wins": 0, "skipped": 0})
+            counts[counter] += 1
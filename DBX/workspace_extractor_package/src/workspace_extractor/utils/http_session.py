@@ -0,0 +1,166 @@
+import threading
+
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class CountingAdapter(HTTPAdapter):
+    def __init__(self, on_new_connection: Callable[[], None], **kwargs: Any) -> None:
+        self.on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingAdapter.get_pool_class(HTTPConnectionPool, self.on_new_connection),
+            "https": CountingAdapter.get_pool_class(HTTPSConnectionPool, self.on_new_connection),
+        }
+
+    @staticmethod
+    def get_pool_class(
+        pool_cls: type[HTTPConnectionPool], on_new_connection: Callable[[], None]
+    ) -> type[HTTPConnectionPool]:
+        """Return a pool class whose connections call on_new_connection every time they connect.
+
+        Only the public customization points of urllib3 are used: the pool's
+        ConnectionCls and the connection's connect(), which opens the TCP (and TLS)
+        connection, whether it is the first one or a reconnection after the server
+        closed the previous one.
+
+        Args:
+            pool_cls (type[HTTPConnectionPool]): HTTPConnectionPool or HTTPSConnectionPool.
+            on_new_connection (Callable[[], None]): Called after every connection opened.
+
+        Returns:
+            type[HTTPConnectionPool]: A subclass of pool_cls.
+
+        """
+
+        class CountingConnection(pool_cls.ConnectionCls):
+            def connect(self) -> None:
+                super().connect()
+                on_new_connection()
+
+        class CountingConnectionPool(pool_cls):
+            ConnectionCls = CountingConnection
+
+        return CountingConnectionPool
+
+
+class HttpSession:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = True,
+        keep_alive: bool = True,
+        timeout: tuple[float, float] | None = (10.0, 300.0),
+    ) -> None:
+        """Initialize a shared, connection-pooled HTTP session.
+
+        Wraps a requests.Session mounted with a single HTTPAdapter so every call
+        made through this instance reuses open TCP/TLS connections to the
+        workspace instead of performing a new handshake per request.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to cache.
+                Defaults to 10.
+            pool_maxsize (int): Maximum number of connections kept open per host.
+                Defaults to 10.
+            pool_block (bool): Whether callers wait for a free connection once
+                pool_maxsize connections to a host are in use, enforcing the
+                per-host limit. If False, extra connections are opened and
+                discarded after use. Defaults to True.
+            keep_alive (bool): Whether connections are kept open between requests.
+                If False, every request is sent with "Connection: close".
+                Defaults to True.
+            timeout (tuple[float, float] | None): (connect, read) timeouts in seconds
+                applied to requests that don't set their own. None waits forever.
+                Defaults to (10.0, 300.0).
+
+        Returns:
+            None
+
+        Example:
+            session = HttpSession(pool_maxsize=16)
+            response = session.get("https://dbc-12345678-9abc.cloud.databricks.com/api/2.0/clusters/list")
+            print(session.get_stats())
+
+        """
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.requests_count = 0
+        self.connections_opened = 0
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = CountingAdapter(
+            self.on_new_connection,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def on_new_connection(self) -> None:
+        with self.lock:
+            self.connections_opened += 1
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an HTTP request through the pooled session.
+
+        Args:
+            method (str): HTTP method name, e.g. "GET" or "POST".
+            url (str): Full URL including the query string.
+            **kwargs (Any): Additional arguments forwarded to requests.Session.request.
+                The session timeout is used when timeout isn't given.
+
+        Returns:
+            requests.Response: HTTP response object from the API call.
+
+        Raises:
+            requests.Timeout: If connecting or reading the response exceeds the timeout.
+
+        """
+        with self.lock:
+            self.requests_count += 1
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Return connection-reuse statistics for the session.
+
+        Returns:
+            dict[str, int | float]: Dictionary with the following keys:
+                - requests: Number of requests sent
+                - connections_opened: Number of new TCP/TLS connections established
+                - connections_reused: Number of requests served by an already open connection
+                - reuse_ratio: connections_reused / requests, rounded to 4 decimals
+
+        """
+        with self.lock:
+            requests_count = self.requests_count
+            connections_opened = self.connections_opened
+        reused = max(requests_count - connections_opened, 0)
+        return {
+            "requests": requests_count,
+            "connections_opened": connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_count, 4) if requests_count else 0.0,
+        }
+
+    def close(self) -> None:
+        self.session.close()
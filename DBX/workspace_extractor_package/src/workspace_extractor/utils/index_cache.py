@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+
+from typing import Any
+
+import numpy as np
+
+from workspace_extractor.utils.columnar_table import ColumnarTable
+from workspace_extractor.utils.manifest import Manifest
+
+
+class IndexCache:
+    version = 1
+
+    def __init__(self, cache_dir: str, output: str, checksum: bool = False) -> None:
+        """Initialize an on-disk cache of the values derived from an output directory.
+
+        Every entry is stored under a name derived from the output directory, the
+        input output name ("runs" or "clusters") and the kind of value, together with
+        a fingerprint of the input files: their paths, sizes and modification times,
+        or their SHA-256 checksums. An entry is only returned while the fingerprint
+        still matches, so rewriting, adding or removing an input file invalidates it,
+        and saving a new value replaces the stale one.
+
+        Args:
+            cache_dir (str): Directory holding the cache files. Created on first save,
+                readable by the current user only.
+            output (str): Output directory the cached values are derived from.
+            checksum (bool): Fingerprint the files by content instead of size and
+                modification time. Checksums recorded in the output manifest are
+                reused, other files are hashed. Defaults to False.
+
+        Returns:
+            None
+
+        Example:
+            cache = IndexCache("/tmp/index", "./output")
+            run_ids = cache.load("runs", "run_ids")
+            if run_ids is None:
+                run_ids = compute_run_ids()
+                cache.save("runs", "run_ids", run_ids)
+
+        """
+        self.cache_dir = cache_dir
+        self.output = os.path.realpath(output)
+        self.checksum = checksum
+        self.hits = 0
+        self.misses = 0
+        self.fingerprints: dict[str, str] = {}
+
+    def get_fingerprint(self, name: str) -> str:
+        """Return the fingerprint of the files currently holding an output.
+
+        Args:
+            name (str): Output name, e.g. "runs".
+
+        Returns:
+            str: Hex digest over the path and size plus modification time (or
+                checksum) of every file, in part order.
+
+        """
+        entries = (Manifest.load(self.output) or {}) if self.checksum else {}
+        digest = hashlib.sha256(f"{IndexCache.version}".encode())
+        for f in Manifest.get_files(self.output, name):
+            stat = os.stat(f)
+            if self.checksum:
+                entry = entries.get(os.path.basename(f))
+                listed = entry and entry.get("bytes") == stat.st_size and entry.get("sha256")
+                state = listed or Manifest.get_sha256(f)
+            else:
+                state = f"{stat.st_size}:{stat.st_mtime_ns}"
+            digest.update(f"{os.path.basename(f)}|{state}\n".encode())
+        return digest.hexdigest()
+
+    def load(self, name: str, kind: str) -> Any | None:
+        """Return a cached JSON value, or None if it is missing or its inputs changed.
+
+        Args:
+            name (str): Output name the value is derived from, e.g. "runs".
+            kind (str): Kind of value, e.g. "latest_runs".
+
+        Returns:
+            Any | None: The cached value.
+
+        """
+        self.fingerprints[name] = self.get_fingerprint(name)
+        entry = self._read_json(self._get_path(name, kind, "json"))
+        if entry is None or entry.get("fingerprint") != self.fingerprints[name]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["value"]
+
+    def save(self, name: str, kind: str, value: Any) -> None:
+        """Store a JSON-serializable value derived from an output.
+
+        The value is stored with the fingerprint taken by the last load() of the same
+        output, i.e. before the value was computed, so a file changing meanwhile
+        invalidates the entry instead of being hidden by it.
+
+        Side Effects:
+            - Atomically replaces "<cache_dir>/<output hash>_<name>_<kind>.json"
+
+        """
+        fingerprint = self.fingerprints.get(name) or self.get_fingerprint(name)
+        entry = {"fingerprint": fingerprint, "output": self.output, "value": value}
+        self._write(self._get_path(name, kind, "json"), json.dumps(entry).encode())
+
+    def load_table(self, name: str) -> ColumnarTable | None:
+        """Return a cached columnar table, or None if it is missing or its inputs changed."""
+        categories = self.load(name, "table")
+        path = self._get_path(name, "table", "npz")
+        if categories is None or not os.path.exists(path):
+            return None
+        with np.load(path) as arrays:
+            columns = {column: arrays[column] for column in arrays.files}
+        return ColumnarTable(columns, categories)
+
+    def save_table(self, name: str, table: ColumnarTable) -> None:
+        """Store a columnar table: the arrays in a .npz file and the categories as JSON."""
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        path = self._get_path(name, "table", "npz")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(file, **table.columns)
+        os.replace(temp_path, path)
+        self.save(name, "table", table.categories)
+
+    def _get_path(self, name: str, kind: str, extension: str) -> str:
+        output_hash = hashlib.sha256(self.output.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{output_hash}_{name}_{kind}.{extension}")
+
+    @staticmethod
+    def _read_json(path: str) -> dict[str, Any] | None:
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
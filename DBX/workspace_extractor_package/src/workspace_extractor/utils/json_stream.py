@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+
+from collections.abc import Iterator
+from typing import Any
+
+from workspace_extractor.utils.manifest import Manifest
+
+
+class RollingJsonWriter:
+    def __init__(
+        self,
+        output: str,
+        name_output: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        resume_state: dict[str, Any] | None = None,
+    ) -> None:
+        """Open a JSON array output that rolls over to a new part at a byte cap.
+
+        Records are written to "<output>/<name_output>.json" until the next one would
+        take the file over max_bytes. The file is then closed, renamed to
+        "<name_output>_01.json", and writing continues in "<name_output>_02.json",
+        "<name_output>_03.json" and so on. Every byte is written once, and only the
+        record being written is held, so the output is split without the full data
+        set in memory and without rewriting the file. A part holds at least one
+        record, so a single record larger than max_bytes gets a part of its own.
+        Each part is recorded in the output manifest with its SHA-256, computed as
+        it is written.
+
+        Args:
+            output (str): Output directory. Created if it doesn't exist.
+            name_output (str): Output name without part suffix or ".json" extension.
+            max_bytes (int): Maximum size of a part in bytes. Defaults to 10 MiB.
+            resume_state (dict[str, Any] | None): State returned by get_state() for
+                an interrupted output. The current part is truncated at the saved
+                position and writing continues from there. Defaults to None (start
+                a new output).
+
+        Returns:
+            None
+
+        Example:
+            writer = RollingJsonWriter("./output", "runs", max_bytes=10 * 1024 * 1024)
+            for page in pages:
+                writer.write(page)
+            writer.close()  # runs.json, or runs_01.json, runs_02.json, ...
+
+        """
+        os.makedirs(output, exist_ok=True)
+        self.output = output
+        self.name_output = name_output
+        self.max_bytes = max_bytes
+        self.part = 0
+        self.count = 0
+        self.part_count = 0
+        self.position = 1
+        self.digest = hashlib.sha256(b"[")
+        if resume_state is not None:
+            self.part = resume_state.get("part", 0)
+            self.count = resume_state["records"]
+            self.part_count = resume_state.get("part_records", self.count)
+            self.position = resume_state["bytes"]
+            file_path = self.get_part_path(self.part)
+            os.truncate(file_path, self.position)
+            with open(file_path, "rb") as file:
+                self.digest = hashlib.sha256(file.read())
+            self.file = open(file_path, "a")
+        else:
+            self.file = open(self.get_part_path(self.part), "w")
+            self.file.write("[")
+
+    def get_part_path(self, part: int) -> str:
+        """Return the path of a part, 0 being the unsplit "<name_output>.json"."""
+        name = f"{self.name_output}_{part:02d}" if part else self.name_output
+        return os.path.join(self.output, f"{name}.json")
+
+    def get_state(self) -> dict[str, Any]:
+        """Return the position reached, to be passed back as resume_state.
+
+        Returns:
+            dict[str, Any]: The current part number (0 while the output is a single
+                file), the number of records written in total and in the current
+                part, and the byte size of the current part.
+
+        """
+        return {"part": self.part, "records": self.count, "part_records": self.part_count, "bytes": self.position}
+
+    def write(self, records: list[Any]) -> None:
+        """Append records, starting a new part whenever the byte cap is reached.
+
+        Args:
+            records (list[Any]): JSON-serializable records, e.g. one API page.
+
+        Side Effects:
+            - Writes the serialized records to the current part
+            - Closes full parts and records them in the manifest
+
+        """
+        for record in records:
+            data = json.dumps(record)
+            # The closing "]" counts towards the cap, so a closed part never exceeds it.
+            if self.part_count and self.position + len(data) + 3 > self.max_bytes:
+                self.roll()
+            separator = ", " if self.part_count else ""
+            self.file.write(separator)
+            self.file.write(data)
+            self.digest.update(f"{separator}{data}".encode())
+            self.position += len(separator) + len(data)
+            self.part_count += 1
+            self.count += 1
+
+    def roll(self) -> None:
+        """Close the current part and continue in the next one.
+
+        Side Effects:
+            - Renames "<name_output>.json" to "<name_output>_01.json" on the first roll
+            - Records the closed part in the manifest
+            - Opens the next part
+
+        """
+        self.finish_part()
+        if not self.part:
+            os.replace(self.get_part_path(0), self.get_part_path(1))
+            Manifest.record_removal(self.output, self.name_output)
+            self.part = 1
+        Manifest.record(self.output, self.name_output, self.part_count, self.part, self.digest.hexdigest())
+        self.part += 1
+        self.part_count = 0
+        self.position = 1
+        self.digest = hashlib.sha256(b"[")
+        self.file = open(self.get_part_path(self.part), "w")
+        self.file.write("[")
+
+    def finish_part(self) -> None:
+        self.file.write("]")
+        self.file.close()
+        self.digest.update(b"]")
+        self.position += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        """Close the last part and record it in the manifest."""
+        if not self.file.closed:
+            self.finish_part()
+            Manifest.record(self.output, self.name_output, self.part_count, self.part or None, self.digest.hexdigest())
+
+    def suspend(self) -> None:
+        """Close the current part as it is, to be resumed from a state returned by get_state().
+
+        The part is left unterminated and unrecorded, and the parts closed before it
+        keep their manifest entries, so a writer opened with that resume_state
+        truncates the part at the saved position and continues it.
+
+        """
+        self.file.close()
+
+    def discard(self) -> None:
+        """Close the writer and delete every part written so far."""
+        self.file.close()
+        for part in range(self.part + 1):
+            if os.path.exists(self.get_part_path(part)):
+                os.remove(self.get_part_path(part))
+                if part:
+                    Manifest.record_removal(self.output, self.name_output, part)
+
+
+class JsonArrayReader:
+    def __init__(self, file_path: str, chunk_size: int = 1024 * 1024) -> None:
+        """Iterate over the records of a JSON array file without loading the whole file.
+
+        The file is read in chunks and each record is decoded on its own with
+        json.JSONDecoder.raw_decode(), so memory stays bounded by the chunk size and
+        the largest single record, whatever the size of the file.
+
+        Args:
+            file_path (str): Path of a file holding one JSON array.
+            chunk_size (int): Number of characters read at a time. Defaults to 1 MiB.
+
+        Returns:
+            None
+
+        Example:
+            for run in JsonArrayReader("./output/runs.json"):
+                print(run["run_id"])
+
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yield the records of the array one at a time, in file order.
+
+        Raises:
+            ValueError: If the file doesn't hold a JSON array.
+            json.JSONDecodeError: If a record is malformed or the file is truncated.
+
+        """
+        decoder = json.JSONDecoder()
+        with open(self.file_path) as file:
+            buffer, position, eof = "", 0, False
+            while position == len(buffer) and not eof:
+                buffer, position, eof = self._read_more(file, buffer, position)
+                position = self._skip_whitespace(buffer, position)
+            if buffer[position : position + 1] != "[":
+                raise ValueError(f"{self.file_path} doesn't hold a JSON array")
+            position += 1
+            count = 0
+            expect_value = True
+            while True:
+                position = self._skip_whitespace(buffer, position)
+                if position == len(buffer) and not eof:
+                    buffer, position, eof = self._read_more(file, buffer, position)
+                    continue
+                char = buffer[position : position + 1]
+                if char == "]" and (not expect_value or not count):
+                    return
+                if char == "," and not expect_value:
+                    position += 1
+                    expect_value = True
+                    continue
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    buffer, position, eof = self._read_more(file, buffer, position)
+                    continue
+                delimiter = self._skip_whitespace(buffer, end)
+                if buffer[delimiter : delimiter + 1] not in (",", "]"):
+                    # A number cut by the chunk boundary, e.g. "1.5e" of "1.5e10", decodes
+                    # without error, so the record only counts once its delimiter is read.
+                    if eof:
+                        raise json.JSONDecodeError("Expecting ',' delimiter", buffer, delimiter)
+                    buffer, position, eof = self._read_more(file, buffer, position)
+                    continue
+                yield record
+                position = end
+                count += 1
+                expect_value = False
+
+    def _read_more(self, file: Any, buffer: str, position: int) -> tuple[str, int, bool]:
+        """Drop the consumed part of the buffer and append the next chunk.
+
+        The chunk read grows with the unconsumed part, so a record larger than
+        chunk_size is decoded in amortized linear time.
+
+        """
+        rest = buffer[position:]
+        chunk = file.read(max(self.chunk_size, len(rest)))
+        return rest + chunk, 0, not chunk
+
+    @staticmethod
+    def _skip_whitespace(buffer: str, position: int) -> int:
+        while position < len(buffer) and buffer[position] in " \t\n\r":
+            position += 1
+        return position
@@ -0,0 +1,97 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+
+class LatestReducer:
+    def __init__(self, key: str = "run_name", order: str = "end_time") -> None:
+        """Initialize a single-pass "latest record per key" reduction.
+
+        Replaces groupby(key)[order].rank("first", ascending=False) == 1: for every
+        key, the record with the highest order value is kept, and on equal values
+        the record seen first wins. Records without a key or with a missing (None or
+        NaN) order value are skipped, as rank() leaves them unranked. Only one record
+        per key is held, so records can be streamed, and partial states built over
+        consecutive chunks of the input can be merged in input order.
+
+        Args:
+            key (str): Field grouping the records. Defaults to "run_name".
+            order (str): Field compared within a group. Defaults to "end_time".
+
+        Returns:
+            None
+
+        Example:
+            reducer = LatestReducer()
+            reducer.update_all(rows)
+            latest = reducer.get_rows()
+
+        """
+        self.key = key
+        self.order = order
+        self.latest: dict[Hashable, dict[str, Any]] = {}
+
+    def update(self, row: dict[str, Any]) -> None:
+        key = row[self.key]
+        value = row[self.order]
+        if key is None or value is None or value != value:
+            return
+        current = self.latest.get(key)
+        if current is None or value > current[self.order]:
+            self.latest[key] = row
+
+    def update_all(self, rows: Iterable[dict[str, Any]]) -> "LatestReducer":
+        for row in rows:
+            self.update(row)
+        return self
+
+    def merge(self, other: "LatestReducer") -> "LatestReducer":
+        """Fold in the state of a reducer that saw the records following this one's.
+
+        Args:
+            other (LatestReducer): Reducer built over a later part of the input.
+
+        Returns:
+            LatestReducer: This reducer, holding the result over both parts.
+
+        """
+        for row in other.latest.values():
+            self.update(row)
+        return self
+
+    def get_rows(self) -> list[dict[str, Any]]:
+        """Return the latest record of every key, in the order the keys were first kept."""
+        return list(self.latest.values())
+
+    @staticmethod
+    def select_indices(keys: np.ndarray, values: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """Return the index of the latest record per key, vectorized and without sorting.
+
+        The maximum of every key is found with np.maximum.at, then the first record
+        reaching it with np.minimum.at, so the result matches the streaming
+        reduction in O(n).
+
+        Args:
+            keys (np.ndarray): Integer key code of every record, negative when missing.
+            values (np.ndarray): Order value of every record, NaN when missing.
+            mask (np.ndarray | None): Records to consider. Defaults to None (all).
+
+        Returns:
+            np.ndarray: Indices of the selected records, ordered by key code.
+
+        """
+        valid = (keys >= 0) & ~np.isnan(values)
+        if mask is not None:
+            valid &= mask
+        indices = np.flatnonzero(valid)
+        if not len(indices):
+            return indices
+        codes = keys[indices]
+        size = int(codes.max()) + 1
+        best = np.full(size, -np.inf)
+        np.maximum.at(best, codes, values[indices])
+        winners = indices[values[indices] == best[codes]]
+        first = np.full(size, len(keys))
+        np.minimum.at(first, keys[winners], winners)
+        return first[first < len(keys)]
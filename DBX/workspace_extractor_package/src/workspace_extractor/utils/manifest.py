@@ -0,0 +1,160 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+
+from datetime import datetime
+from typing import Any
+
+
+class Manifest:
+    file_name = "manifest.jsonl"
+    fan_out_entities = ("runs_details", "events")
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_entity(name: str) -> str:
+        """Return the entity type of an output.
+
+        Args:
+            name (str): Output name without part suffix or extension, e.g. "runs",
+                "events_0612-abc" or "runs_details_42".
+
+        Returns:
+            str: "events" and "runs_details" for per-item fan-out outputs, the output
+                name itself otherwise.
+
+        """
+        for entity in Manifest.fan_out_entities:
+            if name.startswith(f"{entity}_"):
+                return entity
+        return name
+
+    @staticmethod
+    def record(
+        output: str,
+        name: str,
+        records: int,
+        part: int | None = None,
+        sha256: str | None = None,
+    ) -> None:
+        """Append the entry of a file just written to "<output>/manifest.jsonl".
+
+        Args:
+            output (str): Output directory holding the file and the manifest.
+            name (str): Output name the file belongs to, without part suffix or
+                extension, e.g. "runs".
+            records (int): Number of records in the file.
+            part (int | None): Split part number when the file is "<name>_NN.json".
+                None for "<name>.json", which supersedes every previous part of the
+                output. Defaults to None.
+            sha256 (str | None): Hex digest of the file content. Computed from the file
+                when None. Defaults to None.
+
+        Side Effects:
+            - Appends one JSON line with the keys file, name, entity, part, records,
+              bytes, sha256 and written_at
+
+        """
+        file = f"{name}_{part:02d}.json" if part else f"{name}.json"
+        file_path = os.path.join(output, file)
+        if sha256 is None:
+            sha256 = Manifest.get_sha256(file_path)
+        entry = {
+            "file": file,
+            "name": name,
+            "entity": Manifest.get_entity(name),
+            "part": part,
+            "records": records,
+            "bytes": os.path.getsize(file_path),
+            "sha256": sha256,
+            "written_at": datetime.now().isoformat(),
+        }
+        Manifest._append(output, entry)
+
+    @staticmethod
+    def record_removal(output: str, name: str, part: int | None = None) -> None:
+        file = f"{name}_{part:02d}.json" if part else f"{name}.json"
+        Manifest._append(output, {"file": file, "name": name, "part": part, "removed": True})
+
+    @staticmethod
+    def load(output: str) -> dict[str, dict[str, Any]] | None:
+        """Return the current entry of every file listed in the manifest.
+
+        Later entries of a file replace earlier ones, removed files are dropped, and
+        writing "<name>.json" drops the parts previously written for the same name.
+
+        Args:
+            output (str): Output directory.
+
+        Returns:
+            dict[str, dict[str, Any]] | None: Entries keyed by file name, in the order
+                they were first written, or None if the directory has no manifest.
+
+        """
+        manifest_path = os.path.join(output, Manifest.file_name)
+        if not os.path.exists(manifest_path):
+            return None
+        entries: dict[str, dict[str, Any]] = {}
+        with open(manifest_path) as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if not entry.get("part") and not entry.get("removed"):
+                    for key in [key for key, value in entries.items() if value["name"] == entry["name"]]:
+                        del entries[key]
+                if entry.get("removed"):
+                    entries.pop(entry["file"], None)
+                else:
+                    entries[entry["file"]] = entry
+        return entries
+
+    @staticmethod
+    def get_files(output: str, name: str) -> list[str]:
+        """Return the paths of the files holding one output.
+
+        The manifest is used when it lists the output, so only the files written for
+        it are returned. Otherwise the directory is scanned for exactly
+        "<name>.json" and "<name>_NN.json", NN having two digits or more, which,
+        unlike a "<name>*.json" glob, doesn't pick up other outputs sharing the
+        prefix (e.g. "runs_details_*" for "runs"). Parts are sorted by number, so
+        "<name>_100.json" comes after "<name>_99.json".
+
+        Args:
+            output (str): Output directory.
+            name (str): Output name without part suffix or extension, e.g. "runs".
+
+        Returns:
+            list[str]: Existing file paths, in part order.
+
+        """
+        entries = Manifest.load(output)
+        listed = [entry for entry in (entries or {}).values() if entry["name"] == name]
+        if listed:
+            listed.sort(key=lambda entry: entry.get("part") or 0)
+            paths = [os.path.join(output, entry["file"]) for entry in listed]
+            return [path for path in paths if os.path.exists(path)]
+        pattern = re.compile(rf"^{re.escape(name)}(?:_(\d{{2,}}))?\.json$")
+        parts = []
+        for f in glob.glob(os.path.join(glob.escape(output), f"{glob.escape(name)}*.json")):
+            match = pattern.match(os.path.basename(f))
+            if match:
+                parts.append((int(match.group(1) or 0), f))
+        return [f for _, f in sorted(parts)]
+
+    @staticmethod
+    def get_sha256(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _append(output: str, entry: dict[str, Any]) -> None:
+        with Manifest._lock:
+            with open(os.path.join(output, Manifest.file_name), "a") as file:
+                file.write(json.dumps(entry) + "\n")
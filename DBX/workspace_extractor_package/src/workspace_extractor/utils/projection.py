@@ -0,0 +1,138 @@
+from collections.abc import Iterable
+from typing import Any
+
+from workspace_extractor.utils.scrub_plan import ScrubPlan
+from workspace_extractor.utils.util_file import UtilFile
+
+
+class Projection:
+    # Fields the sizing analysis never reads and that can be large or hold secrets:
+    # notebook and job parameters and Spark environment variables.
+    default_drop: dict[str, list[str]] = {
+        "runs": [
+            "overriding_parameters",
+            "job_parameters",
+            "tasks.notebook_task.base_parameters",
+            "tasks.new_cluster.spark_env_vars",
+            "job_clusters.new_cluster.spark_env_vars",
+        ],
+        "jobs": [
+            "settings.parameters",
+            "settings.tasks.notebook_task.base_parameters",
+            "settings.tasks.new_cluster.spark_env_vars",
+            "settings.job_clusters.new_cluster.spark_env_vars",
+        ],
+        "clusters": ["spark_env_vars", "spec.spark_env_vars", "docker_image.basic_auth"],
+    }
+    default_drop["runs_details"] = default_drop["runs"]
+
+    def __init__(
+        self,
+        entity: str | None = None,
+        keep: Iterable[str] | None = None,
+        drop: Iterable[str] = (),
+        anonymize: bool = False,
+    ) -> None:
+        """Initialize the projection and anonymization policy applied to each page of an endpoint.
+
+        Manager.get_and_save() applies the projection to the records of every page as
+        soon as the page is received, before they are written or kept in memory, so
+        dropped fields never reach the output and no second pass over the files is
+        needed to clean them.
+
+        Args:
+            entity (str | None): Entity type of the records, e.g. "runs" or "clusters",
+                whose ScrubPlan drop paths are also removed when anonymizing.
+                Defaults to None.
+            keep (Iterable[str] | None): Dotted key paths kept in every record, e.g.
+                "tasks.task_key"; every other field is dropped. Lists along a path are
+                traversed transparently, and a path ending on an object keeps it whole.
+                Defaults to None (every field is kept).
+            drop (Iterable[str]): Dotted key paths removed from every record, e.g.
+                "tasks.new_cluster.spark_env_vars". Defaults to ().
+            anonymize (bool): Whether every string of the records goes through
+                UtilFile.clean_str(), as in UtilFile.filter_data(). Defaults to False.
+
+        Returns:
+            None
+
+        Example:
+            projection = Projection("runs", drop=Projection.default_drop["runs"], anonymize=True)
+            records = projection.apply(page_records)
+
+        """
+        self.entity = entity
+        self.keep = Projection.get_keep_tree(keep) if keep is not None else None
+        self.drop = list(drop)
+        self.anonymize = anonymize
+        self.plan = ScrubPlan.get(entity, self.drop) if anonymize and entity else None
+        if self.plan is None and (self.drop or anonymize):
+            self.plan = ScrubPlan(self.drop)
+
+    @staticmethod
+    def get_defaults(anonymize: bool = False) -> dict[str, "Projection"]:
+        """Return the projections dropping default_drop, keyed by output name.
+
+        Args:
+            anonymize (bool): Whether the projections also anonymize the records.
+                Anonymized runs and clusters no longer hold the run names Sizing's
+                mapping step groups by, so keep it False for a Sizing extraction and
+                anonymize its output with FolderScrubber afterwards. Defaults to False.
+
+        Returns:
+            dict[str, Projection]: Projections for the Manager's projections argument.
+
+        Example:
+            sizing = Sizing(url, token, projections=Projection.get_defaults())
+
+        """
+        return {
+            entity: Projection(entity, drop=drop, anonymize=anonymize)
+            for entity, drop in Projection.default_drop.items()
+        }
+
+    @staticmethod
+    def get_keep_tree(paths: Iterable[str]) -> dict[str, Any]:
+        """Compile dotted key paths into nested dicts, None marking a value kept whole."""
+        tree: dict[str, Any] = {}
+        for path in paths:
+            *parents, key = path.split(".")
+            node = tree
+            for parent in parents:
+                child = node.get(parent)
+                if child is None and parent in node:
+                    break
+                node = node.setdefault(parent, {})
+            else:
+                node[key] = None
+        return tree
+
+    @staticmethod
+    def project(value: Any, tree: dict[str, Any]) -> Any:
+        if isinstance(value, list):
+            return [Projection.project(item, tree) for item in value]
+        if not isinstance(value, dict):
+            return value
+        return {
+            key: value[key] if child is None else Projection.project(value[key], child)
+            for key, child in tree.items()
+            if key in value
+        }
+
+    def apply(self, records: list[Any]) -> list[Any]:
+        """Return the records of a page projected and anonymized.
+
+        Args:
+            records (list[Any]): Records of one page.
+
+        Returns:
+            list[Any]: The projected records. The input records are not modified.
+
+        """
+        if self.keep is not None:
+            records = Projection.project(records, self.keep)
+        if self.anonymize:
+            return self.plan.apply(UtilFile.filter_data(records, []), copy=False)
+        if self.plan is not None:
+            return self.plan.apply(records)
+        return records
@@ -0,0 +1,259 @@
+import random
+import threading
+import time
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import requests
+
+from workspace_extractor.exceptions.throttled_error import ThrottledError
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+        throttle_statuses: tuple[int, ...] = (429, 503),
+    ) -> None:
+        """Initialize a rate limiter shared by every request of a Manager.
+
+        Requests are grouped by endpoint family (see get_family()). Each family has
+        its own limit of requests in flight, adjusted with an additive-increase /
+        multiplicative-decrease (AIMD) controller: every successful response raises
+        the limit by 1/limit, i.e. by about one slot per round of requests, and every
+        throttled response (429 or 503) multiplies it by decrease_factor. Throttled
+        requests are retried after the Retry-After delay sent by the server, or after
+        an exponential backoff with full jitter when there is none, and the whole
+        family pauses for that delay. Throttled responses received during a pause
+        belong to the same burst and don't decrease the limit again.
+
+        Args:
+            max_concurrency (int): Upper bound, and starting value, of the number of
+                requests in flight per family. Defaults to 16.
+            min_concurrency (int): Lower bound of the number of requests in flight per
+                family. Defaults to 1.
+            decrease_factor (float): Factor applied to the limit on a throttled
+                response. Defaults to 0.5.
+            max_retries (int): Number of retries of a throttled request before
+                ThrottledError is raised. Defaults to 5.
+            base_delay (float): Backoff delay of the first retry, in seconds, doubled on
+                each attempt. Defaults to 0.5.
+            max_delay (float): Maximum delay between two attempts, in seconds, also
+                applied to Retry-After. Defaults to 60.0.
+            throttle_statuses (tuple[int, ...]): HTTP statuses treated as throttling.
+                Defaults to (429, 503).
+
+        Returns:
+            None
+
+        Example:
+            limiter = RateLimiter(max_concurrency=8)
+            response = limiter.request("api/2.1/jobs/runs/get", lambda: session.get(url))
+            print(limiter.get_stats())
+
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttle_statuses = throttle_statuses
+        self.families: dict[str, dict[str, Any]] = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def get_family(path: str | None) -> str:
+        """Return the endpoint family of an API path.
+
+        Args:
+            path (str | None): API path, e.g. "api/2.1/jobs/runs/get".
+
+        Returns:
+            str: First three path segments, e.g. "api/2.1/jobs". Workspace API limits
+                apply per service, so all the endpoints of a service share one family.
+
+        """
+        if not path:
+            return "default"
+        return "/".join(path.split("?")[0].strip("/").split("/")[:3])
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """Convert a Retry-After header to a number of seconds.
+
+        Args:
+            value (str | None): Header value, either delay-seconds or an HTTP-date.
+
+        Returns:
+            float | None: Seconds to wait (never negative), or None if the header is
+                missing or invalid.
+
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return how long to wait before retrying a throttled request.
+
+        Args:
+            attempt (int): Number of attempts already made, starting at 1.
+            retry_after (float | None): Delay requested by the server. Defaults to None.
+
+        Returns:
+            float: The Retry-After delay if any, otherwise a random delay between 0 and
+                base_delay * 2 ** (attempt - 1) (full jitter), capped at max_delay.
+
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def request(self, family: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Send a request within the limits of its family, retrying when throttled.
+
+        Args:
+            family (str): Endpoint family, as returned by get_family().
+            send (Callable[[], requests.Response]): Function performing the request.
+
+        Returns:
+            requests.Response: First response that is not a throttling status.
+
+        Raises:
+            ThrottledError: If the request is still throttled after max_retries retries.
+
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._acquire(family)
+            try:
+                response = send()
+            finally:
+                self.release(family)
+            if response.status_code not in self.throttle_statuses:
+                self._on_success(family)
+                return response
+            delay = self.get_delay(attempt, self.parse_retry_after(response.headers.get("Retry-After")))
+            self._on_throttle(family, delay)
+            if attempt > self.max_retries:
+                raise ThrottledError(
+                    f"Throttled by {family} after {attempt} attempts - {response.content}", response.status_code
+                )
+            time.sleep(delay)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the request statistics of every endpoint family.
+
+        Returns:
+            dict[str, dict[str, Any]]: Per family, the number of requests sent
+                (retries included) and of throttled responses, the current and lowest
+                concurrency limits, the peak number of requests in flight, and the
+                effective requests per second between the first request and the end
+                of the last one.
+
+        """
+        with self._condition:
+            stats = {}
+            for family, state in self.families.items():
+                elapsed = state["last"] - state["first"]
+                stats[family] = {
+                    "requests": state["requests"],
+                    "throttles": state["throttles"],
+                    "limit": round(state["limit"], 2),
+                    "min_limit": round(state["min_limit"], 2),
+                    "peak_in_flight": state["peak_in_flight"],
+                    "effective_rps": round(state["requests"] / elapsed, 2) if elapsed > 0 else None,
+                }
+            return stats
+
+    def _state(self, family: str) -> dict[str, Any]:
+        if family not in self.families:
+            self.families[family] = {
+                "limit": float(self.max_concurrency),
+                "min_limit": float(self.max_concurrency),
+                "in_flight": 0,
+                "peak_in_flight": 0,
+                "paused_until": 0.0,
+                "requests": 0,
+                "throttles": 0,
+                "first": 0.0,
+                "last": 0.0,
+            }
+        return self.families[family]
+
+    def _acquire(self, family: str) -> None:
+        with self._condition:
+            state = self._state(family)
+            while True:
+                pause = state["paused_until"] - time.monotonic()
+                if pause <= 0 and state["in_flight"] < int(state["limit"]):
+                    break
+                self._condition.wait(pause if pause > 0 else None)
+            self._take_slot(state)
+
+    @staticmethod
+    def _take_slot(state: dict[str, Any]) -> None:
+        state["in_flight"] += 1
+        state["peak_in_flight"] = max(state["peak_in_flight"], state["in_flight"])
+        state["first"] = state["first"] or time.monotonic()
+        state["requests"] += 1
+
+    def try_acquire(self, family: str) -> bool:
+        """Take a slot of the family if one is free right away, for an extra request.
+
+        Args:
+            family (str): Endpoint family, as returned by get_family().
+
+        Returns:
+            bool: True if a slot was taken, to be given back with release(). False
+                while the family is paused or all its slots are in use.
+
+        """
+        with self._condition:
+            state = self._state(family)
+            if state["paused_until"] > time.monotonic() or state["in_flight"] >= int(state["limit"]):
+                return False
+            self._take_slot(state)
+            return True
+
+    def release(self, family: str) -> None:
+        with self._condition:
+            self.families[family]["in_flight"] -= 1
+            self.families[family]["last"] = time.monotonic()
+            self._condition.notify_all()
+
+    def _on_success(self, family: str) -> None:
+        with self._condition:
+            state = self.families[family]
+            state["limit"] = min(float(self.max_concurrency), state["limit"] + 1 / state["limit"])
+            self._condition.notify_all()
+
+    def _on_throttle(self, family: str, delay: float) -> None:
+        with self._condition:
+            state = self.families[family]
+            state["throttles"] += 1
+            now = time.monotonic()
+            if now >= state["paused_until"]:
+                state["limit"] = max(float(self.min_concurrency), state["limit"] * self.decrease_factor)
+                state["min_limit"] = min(state["min_limit"], state["limit"])
+            state["paused_until"] = max(state["paused_until"], now + delay)
@@ -0,0 +1,114 @@
+from collections.abc import Iterable
+from typing import Any
+
+
+class ScrubPlan:
+    # Key paths holding secrets, dropped from the records of each entity on top of the
+    # anonymization of every string. Lists are traversed transparently, so
+    # "tasks.new_cluster.spark_env_vars" applies to the new_cluster of every task.
+    entity_drop: dict[str, list[str]] = {
+        "runs": ["tasks.new_cluster.spark_env_vars", "job_clusters.new_cluster.spark_env_vars"],
+        "clusters": ["spark_env_vars", "docker_image.basic_auth", "spec.spark_env_vars"],
+        "jobs": ["settings.tasks.new_cluster.spark_env_vars", "settings.job_clusters.new_cluster.spark_env_vars"],
+        "queries": [],
+        "warehouses": [],
+        "pipelines": [],
+    }
+    entity_drop["runs_details"] = entity_drop["runs"]
+    _plans: dict[tuple[str, tuple[str, ...]], "ScrubPlan"] = {}
+
+    def __init__(self, drop: Iterable[str] = ()) -> None:
+        """Compile the key paths dropped from the records of an output.
+
+        UtilFile.filter_data() anonymizes every string of the records and then, for
+        an entity with a plan, removes the plan's paths from its copy: a plan only
+        ever adds to the scrubbing. apply() only follows the plan's paths, so its
+        cost depends on the paths, not on the size of the records.
+
+        Args:
+            drop (Iterable[str]): Dotted key paths removed from the records, e.g.
+                "tasks.new_cluster.spark_env_vars". Lists along a path are traversed
+                transparently. Defaults to ().
+
+        Returns:
+            None
+
+        Example:
+            plan = ScrubPlan(drop=["tasks.new_cluster.spark_env_vars"])
+            runs_without_env_vars = plan.apply(runs)
+
+        """
+        self.root = ScrubPlan.new_node()
+        for path in drop:
+            *parents, key = path.split(".")
+            ScrubPlan.get_node(self.root, parents)["drop"].add(key)
+
+    @staticmethod
+    def new_node() -> dict[str, Any]:
+        return {"children": {}, "drop": set()}
+
+    @staticmethod
+    def get_node(root: dict[str, Any], keys: list[str]) -> dict[str, Any]:
+        node = root
+        for key in keys:
+            node = node["children"].setdefault(key, ScrubPlan.new_node())
+        return node
+
+    @staticmethod
+    def get(entity: str, drop: Iterable[str] = ()) -> "ScrubPlan | None":
+        """Return the compiled plan of an entity, or None if the entity has no plan.
+
+        Plans are compiled on first use and reused afterwards.
+
+        Args:
+            entity (str): Entity type, e.g. "runs" or "queries".
+            drop (Iterable[str]): Extra dotted key paths to drop. Defaults to ().
+
+        Returns:
+            ScrubPlan | None: The plan.
+
+        """
+        paths = ScrubPlan.entity_drop.get(entity)
+        if paths is None:
+            return None
+        key = (entity, tuple(drop))
+        if key not in ScrubPlan._plans:
+            ScrubPlan._plans[key] = ScrubPlan([*paths, *key[1]])
+        return ScrubPlan._plans[key]
+
+    def apply(self, data: Any, copy: bool = True) -> Any:
+        """Return the data without the plan's paths.
+
+        Args:
+            data (Any): One record or a list of records.
+            copy (bool): Whether the containers along the paths are copied, leaving the
+                input as it was. False removes the paths in place, for data that is
+                already a copy. Defaults to True.
+
+        Returns:
+            Any: The data without the plan's paths. Values off the paths are shared
+                with the input.
+
+        """
+        return ScrubPlan.drop(data, self.root, copy)
+
+    @staticmethod
+    def drop(value: Any, node: dict[str, Any], copy: bool) -> Any:
+        if isinstance(value, list):
+            if not copy:
+                for index, item in enumerate(value):
+                    value[index] = ScrubPlan.drop(item, node, copy)
+                return value
+            return [ScrubPlan.drop(item, node, copy) for item in value]
+        if not isinstance(value, dict):
+            return value
+        children = [key for key in node["children"] if key in value]
+        if not children and not node["drop"] & value.keys():
+            return value
+        result = dict(value) if copy else value
+        for key in node["drop"]:
+            result.pop(key, None)
+        for key in children:
+            if key in result:
+                result[key] = ScrubPlan.drop(result[key], node["children"][key], copy)
+        return result
@@ -0,0 +1,121 @@
+import math
+
+from typing import Any
+
+
+class TimeSlicer:
+    PRESETS: dict[str, dict[str, Any]] = {
+        "runs": {
+            "from": "start_time_from",
+            "to": "start_time_to",
+            "key": ("run_id",),
+            "time_field": "start_time",
+        },
+        "queries": {
+            "from": "filter_by.query_start_time_range.start_time_ms",
+            "to": "filter_by.query_start_time_range.end_time_ms",
+            "key": ("query_id",),
+            "time_field": "query_start_time_ms",
+        },
+    }
+
+    @staticmethod
+    def get_preset(name: str) -> dict[str, Any]:
+        """Return the time filter parameters and record fields of a sliceable endpoint.
+
+        Args:
+            name (str): Preset name, "runs" (api/2.1/jobs/runs/list) or "queries"
+                (api/2.0/sql/history/queries).
+
+        Returns:
+            dict[str, Any]: Dictionary with the following keys:
+                - from: Query parameter holding the start of the time range
+                - to: Query parameter holding the end of the time range
+                - key: Record fields identifying a record
+                - time_field: Record field the time range filters on
+
+        Raises:
+            ValueError: If the preset doesn't exist.
+
+        """
+        if name not in TimeSlicer.PRESETS:
+            raise ValueError(f"Unknown time slicing preset '{name}'. Expected one of: {', '.join(TimeSlicer.PRESETS)}")
+        return TimeSlicer.PRESETS[name]
+
+    @staticmethod
+    def get_slice_count(
+        records: list[Any], time_field: str, window_start: int, max_slices: int, pages_per_slice: int = 2
+    ) -> int:
+        """Estimate how many slices the rest of a window should be split into.
+
+        The first page of a newest-first endpoint covers the time span between its
+        newest and oldest record. Assuming the same density over the rest of the
+        window gives the number of pages left, which is spread over slices of about
+        pages_per_slice pages each.
+
+        Args:
+            records (list[Any]): Records of the first page, newest first.
+            time_field (str): Record field holding the record time in milliseconds.
+            window_start (int): Start of the window in milliseconds.
+            max_slices (int): Upper bound on the number of slices.
+            pages_per_slice (int): Target number of pages per slice. Defaults to 2.
+
+        Returns:
+            int: Number of slices, between 1 and max_slices.
+
+        Example:
+            # 100 records over 1 hour on the first page, 10 hours left in the window:
+            # about 10 pages left, so 5 slices of 2 pages
+            TimeSlicer.get_slice_count(page, "start_time", start, max_slices=8)
+
+        """
+        times = [record.get(time_field) for record in records if record and record.get(time_field)]
+        if not times or max_slices <= 1:
+            return 1
+        span = max(max(times) - min(times), 1)
+        pages_left = max(min(times) - window_start, 0) / span
+        return max(1, min(max_slices, math.ceil(pages_left / max(pages_per_slice, 1))))
+
+    @staticmethod
+    def get_slices(start: int, end: int, count: int) -> list[tuple[int, int]]:
+        """Split a time range into contiguous slices, newest first.
+
+        Consecutive slices share their boundary, so a record exactly on it is returned
+        by both and removed by merge().
+
+        Args:
+            start (int): Start of the range in milliseconds.
+            end (int): End of the range in milliseconds.
+            count (int): Number of slices. Values below 1 are treated as 1.
+
+        Returns:
+            list[tuple[int, int]]: (from, to) pairs ordered from the newest slice to the
+                oldest one.
+
+        """
+        count = max(1, min(count, max(end - start, 1)))
+        bounds = [start + (end - start) * i // count for i in range(count + 1)]
+        return [(bounds[i], bounds[i + 1]) for i in reversed(range(count))]
+
+    @staticmethod
+    def merge(slices: list[list[Any]], key: tuple[str, ...]) -> list[Any]:
+        """Concatenate the records of every slice, dropping duplicates.
+
+        Args:
+            slices (list[list[Any]]): Records of each slice, newest slice first.
+            key (tuple[str, ...]): Fields identifying a record.
+
+        Returns:
+            list[Any]: Records in slice order, keeping the first occurrence of each key.
+
+        """
+        merged = []
+        seen = set()
+        for records in slices:
+            for record in records:
+                record_key = tuple(record.get(field) for field in key) if isinstance(record, dict) else None
+                if record_key is not None and record_key in seen:
+                    continue
+                seen.add(record_key)
+                merged.append(record)
+        return merged
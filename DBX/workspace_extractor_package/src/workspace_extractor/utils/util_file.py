@@ -1,3 +1,4 @@
+import hashlib
 import json
 import math
 import os
@@ -8,14 +9,19 @@ import zipfile
 from datetime import datetime
 
 from workspace_extractor.exceptions.no_cluster_events_error import NoClusterEventsError
+from workspace_extractor.utils.anonymizer import Anonymizer
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.scrub_plan import ScrubPlan
+from workspace_extractor.utils.zip_volume_writer import ZipVolumeWriter
 
 
 class UtilFile:
-    email_pattern = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}")
-    url_parameters_pattern = re.compile("^(?:https?:\\/\\/)?(?:[^@\\/\n]+@)?(?:www\\.)?([^:?\n]+)")
+    email_pattern = Anonymizer.email_pattern
+    url_parameters_pattern = Anonymizer.url_parameters_pattern
     url_pattern = re.compile(r"https?://\S+|www\.\S+")
-    jwt_pattern = re.compile(r"[A-Za-z0-9_-]{4,}(?:\.[A-Za-z0-9_-]{4,}){2}")
-    dbx_pattern = re.compile(r"https?://adb-\d{4,16}\.\d{0,2}|https?://dbc-.{4,12}-.{2,4}")
+    jwt_pattern = Anonymizer.jwt_pattern
+    dbx_pattern = Anonymizer.dbx_pattern
+    anonymizer = Anonymizer()
 
     @staticmethod
     def check_file_request_(output, name_output, json_data_check):
@@ -36,14 +42,13 @@ class UtilFile:
                 parts = math.ceil(size_value / size_max_value)
                 count = UtilFile.get_count(json_data_check)
                 size_part = math.ceil(count / parts)
-                end = 0
-                for i in range(parts):
-                    start = end + 1 if end != 0 else 0
-                    end = end + size_part if i != parts else count - 1
-                    json_data_part = json_data_check[start:end]
-                    UtilFile.write_file_request_(output, f"{name_output}_{i + 1:02d}", json_data_part)
+                for i, start in enumerate(range(0, count, size_part)):
+                    json_data_part = json_data_check[start : start + size_part]
+                    part_name = f"{name_output}_{i + 1:02d}"
+                    UtilFile.write_file_request_(output, part_name, json_data_part, name_output, i + 1)
                 file_path = os.path.join(output, f"{name_output}.json")
                 os.remove(file_path)
+                Manifest.record_removal(output, name_output)
                 return True
         else:
             return False
@@ -68,14 +73,16 @@ class UtilFile:
         output_zip_file_no_extension: str,
         extension: str = "zip",
         split_size_mb: int = 195,
+        compression: str = "deflate",
+        compresslevel: int | None = None,
     ) -> str | None:
-        """Compresses a specified folder into a zip archive, optionally splitting it.
+        """Compresses a specified folder into a single zip file to download, split into volumes if needed.
 
-        This function takes a source folder and compresses its contents into a
-        zip file. The zip file is created using the ZIP_DEFLATED compression method.
-        If the resulting zip file's size exceeds a specified threshold,
-        the function will attempt to split it into multiple smaller parts using
-        `UtilFile.split_zip_file`.
+        The folder is compressed with compress_folder_to_volumes, so every file is
+        read and compressed once, with the ZIP_DEFLATED method by default. When the archive fits in split_size_mb it
+        is returned as is. Otherwise its volumes, each a complete zip archive of at
+        most split_size_mb, are bundled into one zip file with the ZIP_STORED
+        method, so they are copied without being compressed again.
 
         Args:
             source_folder_path (str): The absolute or relative path to the folder
@@ -85,40 +92,122 @@ class UtilFile:
                 provided, the output might be "archive.zip".
             extension (str, optional): The file extension for the output zip file.
                 Defaults to "zip".
-            split_size_mb (int, optional): The maximum size in megabytes for each
-                part if the zip file needs to be split. If the total size of the
-                created zip file exceeds this value, it will be split into
-                multiple files (e.g., archive.z01, archive.z02, ...).
+            split_size_mb (int, optional): The maximum size in megabytes of each
+                volume. If the archive is larger, it is written as volumes
+                "archive_01.zip", "archive_02.zip", ... bundled into
+                "we_archive_data_<volumes>_parts.zip". Defaults to 195 MB.
+            compression (str, optional): Compression algorithm: "stored", "deflate",
+                "bzip2", "lzma" or "zstd" (Python 3.14+). Defaults to "deflate".
+            compresslevel (int | None, optional): Compression level, e.g. 1 (fastest)
+                to 9 (smallest) for deflate. Defaults to None (the algorithm's default).
+
+        Returns:
+            str | None: Path of the zip file, or None if the folder couldn't be
+                compressed.
+
+        Raises:
+            ValueError: If the compression is unknown or not supported by this Python.
+                Other exceptions encountered during the compression are caught, and
+                their error messages are printed to the standard output; these
+                exceptions are not re-raised by this function.
+
+        """
+        volumes = UtilFile.compress_folder_to_volumes(
+            source_folder_path,
+            output_zip_file_no_extension,
+            extension,
+            split_size_mb,
+            compression,
+            compresslevel,
+        )
+        if volumes is None or len(volumes) == 1:
+            return volumes[0] if volumes else None
+        try:
+            return UtilFile.bundle_volumes(volumes, f"{output_zip_file_no_extension}.{extension}")
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+    @staticmethod
+    def bundle_volumes(volumes: list[str], zip_file_path: str) -> str:
+        """Bundle zip volumes into one zip file without compressing them again.
+
+        Args:
+            volumes (list[str]): Paths of the volumes, in order.
+            zip_file_path (str): Path the archive would have had as a single volume,
+                used to name the bundle like rezip_zip_parts does.
+
+        Returns:
+            str: Path of the bundle, "{base_path}/we_{filename_without_extension}_data_{volumes}_parts.zip".
+
+        Side Effects:
+            - Deletes every volume once it is added to the bundle
+
+        """
+        base_path, _, filename_without_extension, _ = UtilFile.get_path_separated(zip_file_path)
+        bundle_path = os.path.join(base_path, f"we_{filename_without_extension}_data_{len(volumes)}_parts.zip")
+        with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_STORED) as zipf:
+            for volume in volumes:
+                zipf.write(volume, os.path.basename(volume))
+                os.remove(volume)
+        return bundle_path
+
+    @staticmethod
+    def compress_folder_to_volumes(
+        source_folder_path: str,
+        output_zip_file_no_extension: str,
+        extension: str = "zip",
+        volume_size_mb: int = 195,
+        compression: str = "deflate",
+        compresslevel: int | None = None,
+    ) -> list[str] | None:
+        """Compress a folder into size-capped zip volumes in a single pass.
+
+        Unlike zipping the folder, cutting the archive into raw chunks and zipping the
+        chunks again, as split_zip_file and rezip_zip_parts do, every file is read and
+        compressed once and written straight to the volume it fits in. Each volume is a complete zip
+        archive that can be opened on its own, and the disk used is about the size
+        of the final volumes.
+
+        Args:
+            source_folder_path (str): The folder to compress.
+            output_zip_file_no_extension (str): Path of the archive without extension.
+                A single volume is written as "<path>.<extension>", several volumes as
+                "<path>_01.<extension>", "<path>_02.<extension>", ...
+            extension (str, optional): The file extension of the volumes. Defaults to "zip".
+            volume_size_mb (int, optional): Maximum size of a volume in megabytes.
                 Defaults to 195 MB.
+            compression (str, optional): Compression algorithm: "stored", "deflate",
+                "bzip2", "lzma" or "zstd" (Python 3.14+). Defaults to "deflate".
+            compresslevel (int | None, optional): Compression level. Defaults to None
+                (the algorithm's default).
+
+        Returns:
+            list[str] | None: Paths of the volumes in order, or None if the folder
+                couldn't be compressed, in which case no volume is left behind.
 
         Raises:
-            Exception: If the `source_folder_path` does not exist.
-                Other exceptions encountered during the zipping or splitting
-                process are caught, and their error messages are printed to the
-                standard output; these exceptions are not re-raised by this function.
+            ValueError: If the compression is unknown or not supported by this Python.
+
+        Example:
+            volumes = UtilFile.compress_folder_to_volumes("/tmp/output", "/tmp/workspace", volume_size_mb=150)
 
         """
+        compression_method = ZipVolumeWriter.get_compression(compression)
+        writer = None
         try:
             if not os.path.exists(source_folder_path):
                 raise Exception(f"The source folder '{source_folder_path}' does not exist.")
 
-            with zipfile.ZipFile(f"{output_zip_file_no_extension}.{extension}", "w", zipfile.ZIP_DEFLATED) as zipf:
-                for root, _dirs, files in os.walk(source_folder_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        relative_path = os.path.relpath(file_path, source_folder_path)
-                        zipf.write(file_path, relative_path)
-
-            zip_file_size_bytes = os.path.getsize(f"{output_zip_file_no_extension}.{extension}")
-
-            if zip_file_size_bytes > split_size_mb * 1024 * 1024:
-                return UtilFile.split_zip_file(
-                    zip_file_path=f"{output_zip_file_no_extension}.{extension}",
-                    part_size_mb=split_size_mb,
-                )
-            return f"{output_zip_file_no_extension}.{extension}"
+            writer = ZipVolumeWriter(
+                output_zip_file_no_extension, volume_size_mb * 1024 * 1024, extension, compression_method, compresslevel
+            )
+            writer.write_all(ZipVolumeWriter.get_folder_entries(source_folder_path))
+            return writer.close()
 
         except Exception as e:
+            if writer:
+                writer.discard()
             print(f"Error: {e}")
             return None
 
@@ -348,15 +437,17 @@ class UtilFile:
                 log_file.write(f"   {variables_info}")
 
     @staticmethod
-    def write_file_request_(output, name_output, json_data):
+    def write_file_request_(output, name_output, json_data, manifest_name=None, part=None):
         data = json.dumps(json_data)
         os.makedirs(output, exist_ok=True)
         file_path = os.path.join(output, f"{name_output}.json")
         with open(file_path, "w") as file:
             file.write(data)
+        sha256 = hashlib.sha256(data.encode()).hexdigest()
+        Manifest.record(output, manifest_name or name_output, UtilFile.get_count(json_data), part, sha256)
 
     @staticmethod
-    def filter_data(json_data, keys):
+    def filter_data(json_data, keys, entity=None):
         if isinstance(json_data, dict):
             new_data = UtilFile.clean_dictionary(json_data, keys, {})
         elif isinstance(json_data, list):
@@ -364,6 +455,10 @@ class UtilFile:
         else:
             new_data = json_data
 
+        # The entity's secret paths are removed from the copy made above.
+        plan = ScrubPlan.get(entity) if entity is not None else None
+        if plan is not None:
+            new_data = plan.apply(new_data, copy=False)
         return new_data
 
     @staticmethod
@@ -404,11 +499,7 @@ class UtilFile:
 
     @staticmethod
     def clean_str(txt):
-        clean_string = UtilFile.replace_emails(txt)
-        clean_string = UtilFile.replace_adb_url(clean_string)
-        clean_string = UtilFile.remove_url_parameters(clean_string)
-        clean_string = UtilFile.remove_jwt(clean_string)
-        return clean_string
+        return UtilFile.anonymizer.clean_str(txt)
 
     @staticmethod
     def replace_emails(text):
@@ -0,0 +1,208 @@
+import os
+import zipfile
+
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
+
+
+class ZipVolumeWriter:
+    compressions = {
+        "stored": zipfile.ZIP_STORED,
+        "deflate": zipfile.ZIP_DEFLATED,
+        "bzip2": zipfile.ZIP_BZIP2,
+        "lzma": zipfile.ZIP_LZMA,
+    }
+    if hasattr(zipfile, "ZIP_ZSTANDARD"):
+        compressions["zstd"] = zipfile.ZIP_ZSTANDARD
+    # Room kept in every volume for the end of central directory records, zip64 included.
+    end_record_size = 22 + 56 + 20
+
+    def __init__(
+        self,
+        output_zip_file_no_extension: str,
+        max_bytes: int | None = 195 * 1024 * 1024,
+        extension: str = "zip",
+        compression: int = zipfile.ZIP_DEFLATED,
+        compresslevel: int | None = None,
+    ) -> None:
+        """Open a zip archive written as size-capped, independently readable volumes.
+
+        Every entry is added with ZipFile.write(), so the data is read, compressed
+        and written once. Before an entry is added, the space it can take at most
+        (its size plus the worst expansion of the compression) is compared to the
+        room left in the current volume, whose exact size is known from the file it
+        is written to: when the entry might not fit, the volume is closed and the
+        entry starts the next one. Each volume is a complete zip file that opens on
+        its own. Files go to "<name>.<extension>" while a single volume is enough;
+        on the first roll it is renamed to "<name>_01.<extension>" and the next
+        volumes are "<name>_02.<extension>", ... A volume holds at least one entry,
+        so an entry larger than max_bytes gets a volume of its own.
+
+        Args:
+            output_zip_file_no_extension (str): Path of the archive without extension.
+            max_bytes (int | None): Maximum size of a volume in bytes, None for a single
+                volume of any size. Defaults to 195 MiB.
+            extension (str): Extension of the volumes. Defaults to "zip".
+            compression (int): zipfile compression method, e.g. zipfile.ZIP_DEFLATED.
+                Defaults to zipfile.ZIP_DEFLATED.
+            compresslevel (int | None): Compression level passed to the compressor.
+                Defaults to None (the method's default level).
+
+        Returns:
+            None
+
+        Example:
+            writer = ZipVolumeWriter("/tmp/workspace", max_bytes=150 * 1024 * 1024)
+            writer.write_all(ZipVolumeWriter.get_folder_entries("/tmp/output"))
+            volumes = writer.close()  # ["/tmp/workspace_01.zip", "/tmp/workspace_02.zip"]
+
+        """
+        self.output_zip_file_no_extension = output_zip_file_no_extension
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.volume_number = 0
+        self.volumes = [self.get_volume_path(0)]
+        self.file, self.zip_file = self.open_volume(self.volumes[0])
+        self.central_directory_size = 0
+
+    def open_volume(self, path: str) -> tuple[BinaryIO, zipfile.ZipFile]:
+        """Open a volume on a file of its own, whose position is the size written so far."""
+        file = open(path, "w+b")
+        return file, zipfile.ZipFile(file, "w", self.compression, compresslevel=self.compresslevel)
+
+    @staticmethod
+    def get_max_entry_size(size: int, arcname: str) -> int:
+        """Return the most bytes an entry of a file can add to a volume, central directory included.
+
+        Args:
+            size (int): Size of the file in bytes.
+            arcname (str): Name of the entry in the archive.
+
+        Returns:
+            int: The size of the file, plus the worst expansion of deflate, bzip2, lzma
+                and zstd on incompressible data, plus the entry's headers.
+
+        """
+        name_size = len(arcname.encode("utf-8"))
+        # Local header and central directory entry, each with a zip64 extra field.
+        return size + size // 32 + 1024 + 30 + 20 + 46 + 28 + 2 * name_size
+
+    @staticmethod
+    def get_directory_entry_size(info: zipfile.ZipInfo) -> int:
+        """Return the size of the central directory entry of an entry, as ZipFile.close() writes it."""
+        size = 46 + len(info.filename.encode("utf-8")) + len(info.extra) + len(info.comment)
+        if max(info.file_size, info.compress_size, info.header_offset) > zipfile.ZIP64_LIMIT:
+            size += 28
+        return size
+
+    @staticmethod
+    def get_compression(name: str) -> int:
+        """Return the zipfile compression method of a compression name.
+
+        Args:
+            name (str): "stored", "deflate", "bzip2", "lzma" or "zstd".
+
+        Returns:
+            int: The zipfile constant, e.g. zipfile.ZIP_DEFLATED.
+
+        Raises:
+            ValueError: If the name is unknown, or is "zstd" and this Python's zipfile
+                doesn't support Zstandard (added in Python 3.14).
+
+        """
+        if name not in ZipVolumeWriter.compressions:
+            if name == "zstd":
+                raise ValueError("zstd compression requires a Python whose zipfile has ZIP_ZSTANDARD (3.14+)")
+            raise ValueError(f"Unknown compression '{name}', expected one of {list(ZipVolumeWriter.compressions)}")
+        return ZipVolumeWriter.compressions[name]
+
+    @staticmethod
+    def get_folder_entries(folder: str) -> Iterator[tuple[str, str]]:
+        """Yield (file path, archive name) for every file under a folder, in os.walk() order.
+
+        Hidden directories, such as ".checkpoints", ".index_cache" and the ".merge_*"
+        staging folders, are skipped.
+
+        """
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for file in files:
+                file_path = os.path.join(root, file)
+                yield file_path, os.path.relpath(file_path, folder)
+
+    def get_volume_path(self, volume_number: int) -> str:
+        """Return the path of a volume, 0 being the unsplit "<name>.<extension>"."""
+        suffix = f"_{volume_number:02d}" if volume_number else ""
+        return f"{self.output_zip_file_no_extension}{suffix}.{self.extension}"
+
+    def write(self, file_path: str, arcname: str) -> None:
+        """Compress a file and add it to the archive, starting a new volume if it might not fit.
+
+        Args:
+            file_path (str): Path of the file to add.
+            arcname (str): Name of the entry in the archive.
+
+        Side Effects:
+            - Appends the entry to the current volume, or closes it and opens the next one
+
+        """
+        if self.max_bytes is not None and self.zip_file.infolist():
+            size = self.file.tell() + self.central_directory_size + self.end_record_size
+            if size + self.get_max_entry_size(os.path.getsize(file_path), arcname) > self.max_bytes:
+                self.roll()
+        self.zip_file.write(file_path, arcname)
+        self.central_directory_size += self.get_directory_entry_size(self.zip_file.getinfo(arcname))
+
+    def write_all(self, entries: Iterable[tuple[str, str]]) -> None:
+        """Add files to the archive in order.
+
+        Args:
+            entries (Iterable[tuple[str, str]]): (file path, archive name) pairs.
+
+        Side Effects:
+            - Appends every entry, rolling over to new volumes as needed
+
+        """
+        for file_path, arcname in entries:
+            self.write(file_path, arcname)
+
+    def close_volume(self) -> None:
+        self.zip_file.close()
+        self.file.close()
+
+    def roll(self) -> None:
+        """Close the current volume and continue in the next one.
+
+        Side Effects:
+            - Renames "<name>.<extension>" to "<name>_01.<extension>" on the first roll
+            - Opens the next volume
+
+        """
+        self.close_volume()
+        if not self.volume_number:
+            self.volume_number = 1
+            os.replace(self.volumes[0], self.get_volume_path(1))
+            self.volumes[0] = self.get_volume_path(1)
+        self.volume_number += 1
+        self.volumes.append(self.get_volume_path(self.volume_number))
+        self.file, self.zip_file = self.open_volume(self.volumes[-1])
+        self.central_directory_size = 0
+
+    def close(self) -> list[str]:
+        """Close the last volume.
+
+        Returns:
+            list[str]: Paths of the volumes, in order.
+
+        """
+        self.close_volume()
+        return self.volumes
+
+    def discard(self) -> None:
+        """Close the writer and delete the volumes written so far."""
+        self.close_volume()
+        for volume in self.volumes:
+            if os.path.exists(volume):
+                os.remove(volume)
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Generator
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from tqdm import tqdm
+
+from workspace_extractor.manager import Manager
+
+
+def read_text(folder: str, name: str) -> str:
+    with open(os.path.join(folder, f"{name}.json")) as file:
+        return file.read()
+
+
+def read_json(folder: str, name: str) -> object:
+    with open(os.path.join(folder, f"{name}.json")) as file:
+        return json.load(file)
+
+
+def write_json(folder: str, name: str, data: object) -> None:
+    with open(os.path.join(folder, f"{name}.json"), "w") as file:
+        json.dump(data, file)
+
+
+def quiet_tqdm(*args, **kwargs) -> tqdm:
+    kwargs["disable"] = True
+    return tqdm(*args, **kwargs)
+
+
+class MockApi:
+    """Local HTTP/1.1 server answering workspace API paths with canned handlers."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, Callable[[dict, dict], tuple[int, dict, object]]] = {}
+        self.calls: list[tuple[str, str, dict]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _handle(self, method: str) -> None:
+                parsed = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                path = parsed.path.lstrip("/")
+                with api.lock:
+                    api.calls.append((method, path, params))
+                    api.in_flight += 1
+                    api.peak_in_flight = max(api.peak_in_flight, api.in_flight)
+                route = api.routes.get(path)
+                try:
+                    status, headers, payload = route(params, body) if route else (404, {}, {"error": "does not exist"})
+                finally:
+                    with api.lock:
+                        api.in_flight -= 1
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def route(self, path: str, handler: Callable[[dict, dict], tuple[int, dict, object]]) -> None:
+        self.routes[path] = handler
+
+
+@pytest.fixture
+def mock_api() -> Generator[MockApi, None, None]:
+    api = MockApi()
+    api.thread.start()
+    yield api
+    api.server.shutdown()
+    api.server.server_close()
+
+
+@pytest.fixture
+def temp_dir() -> Generator[str, None, None]:
+    """A temporary directory, removed with its content after the test."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_results_count() -> Generator[None, None, None]:
+    """Start every test with empty class-level result counts and silent progress bars."""
+    Manager.results_count.clear()
+    with patch("workspace_extractor.sizing.tqdm_notebook", quiet_tqdm), patch(
+        "workspace_extractor.manager.tqdm_notebook", quiet_tqdm
+    ):
+        yield
+    Manager.results_count.clear()
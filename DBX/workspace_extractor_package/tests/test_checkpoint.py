@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.sizing import Sizing
+
+from tests.conftest import read_text
+
+
+class TestResumablePagination:
+    """Tests for checkpointed pagination in get_and_save."""
+
+    @pytest.fixture
+    def flaky_api(self, mock_api):
+        mock_api.fail_on_page = 3
+
+        def runs(params: dict, body: dict) -> tuple[int, dict, dict]:
+            page = int(params.get("page_token", 0))
+            if page == mock_api.fail_on_page:
+                mock_api.fail_on_page = None
+                return 500, {}, {"error_code": "TEMPORARILY_UNAVAILABLE"}
+            payload = {"runs": [{"run_id": page * 10 + i} for i in range(10)]}
+            if page < 5:
+                payload["has_more"] = True
+                payload["next_page_token"] = str(page + 1)
+            return 200, {}, payload
+
+        mock_api.route("api/2.1/jobs/runs/list", runs)
+        return mock_api
+
+    def _fetch(self, manager: Manager, url: str) -> tuple[bool, str]:
+        return manager.get_and_save(
+            path="api/2.1/jobs/runs/list", name_output="runs", use_paging=True, url_api=url, stream=True
+        )
+
+    def test_resumes_from_last_page(self, flaky_api, temp_dir: str) -> None:
+        """A rerun continues after the last checkpointed page and produces the full file."""
+        manager = Manager(flaky_api.url, "token", temp_dir, checkpoint=True)
+
+        assert self._fetch(manager, flaky_api.url)[0] is True
+        assert os.path.exists(os.path.join(temp_dir, ".checkpoints", "runs.json"))
+        flaky_api.calls.clear()
+        assert self._fetch(Manager(flaky_api.url, "token", temp_dir, checkpoint=True), flaky_api.url)[0] is False
+
+        assert [params.get("page_token") for _, _, params in flaky_api.calls] == ["3", "4", "5"]
+        assert json.loads(read_text(temp_dir, "runs")) == [{"run_id": i} for i in range(60)]
+        assert Manager.results_count["runs"] == 60
+
+    def test_completed_endpoint_is_skipped(self, flaky_api, temp_dir: str) -> None:
+        """An endpoint marked done is not requested again."""
+        flaky_api.fail_on_page = None
+        self._fetch(Manager(flaky_api.url, "token", temp_dir, checkpoint=True), flaky_api.url)
+        flaky_api.calls.clear()
+        Manager.results_count.clear()
+
+        result = self._fetch(Manager(flaky_api.url, "token", temp_dir, checkpoint=True), flaky_api.url)
+
+        assert result == (False, "Data restored from checkpoint")
+        assert flaky_api.calls == []
+        assert Manager.results_count["runs"] == 60
+
+    def test_mismatching_file_restarts(self, flaky_api, temp_dir: str) -> None:
+        """If the partial file no longer matches the checkpoint, the endpoint starts over."""
+        self._fetch(Manager(flaky_api.url, "token", temp_dir, checkpoint=True), flaky_api.url)
+        os.remove(os.path.join(temp_dir, "runs.json"))
+        flaky_api.calls.clear()
+
+        self._fetch(Manager(flaky_api.url, "token", temp_dir, checkpoint=True), flaky_api.url)
+
+        assert flaky_api.calls[0][2].get("page_token") is None
+        assert json.loads(read_text(temp_dir, "runs")) == [{"run_id": i} for i in range(60)]
+
+
+    def test_resumes_across_rolled_parts(self, flaky_api, temp_dir: str) -> None:
+        """A rerun reopens the last part of an output already split at the byte cap."""
+        reference = os.path.join(temp_dir, "reference")
+        flaky_api.fail_on_page = None
+        self._fetch(Manager(flaky_api.url, "token", reference, max_file_bytes=200), flaky_api.url)
+        flaky_api.fail_on_page = 3
+        output = os.path.join(temp_dir, "output")
+
+        assert self._fetch(Manager(flaky_api.url, "token", output, checkpoint=True, max_file_bytes=200), flaky_api.url)[0]
+        assert self._fetch(Manager(flaky_api.url, "token", output, checkpoint=True, max_file_bytes=200), flaky_api.url)[0] is False
+
+        parts = sorted(name for name in os.listdir(reference) if name.startswith("runs_"))
+        assert len(parts) > 2
+        assert sorted(name for name in os.listdir(output) if name.startswith("runs")) == parts
+        for name in parts:
+            assert read_text(output, name[:-5]) == read_text(reference, name[:-5])
+
+
+class TestResumableFanOut:
+    """Tests for completed fan-out items."""
+
+    def test_only_unfinished_clusters_are_fetched_again(self, mock_api, temp_dir: str) -> None:
+        """Clusters saved by a previous run are skipped and still counted."""
+        failing = {"ui-2"}
+
+        def events(params: dict, body: dict) -> tuple[int, dict, dict]:
+            if params["cluster_id"] in failing:
+                return 500, {}, {"error_code": "INTERNAL_ERROR"}
+            return 200, {}, {"events": [{"type": "RUNNING"}, {"type": "EDITED"}]}
+
+        mock_api.route("api/2.0/clusters/events", events)
+        cluster_ids = [f"ui-{i}" for i in range(4)]
+
+        first = Sizing(mock_api.url, "token", temp_dir, checkpoint=True).get_clusters_events(0, cluster_ids=cluster_ids)
+        failing.clear()
+        mock_api.calls.clear()
+        second = Sizing(mock_api.url, "token", temp_dir, checkpoint=True).get_clusters_events(0, cluster_ids=cluster_ids)
+
+        assert first[0] is True and second[0] is False
+        assert [params["cluster_id"] for _, _, params in mock_api.calls] == ["ui-2"]
+        assert Manager.results_count["events"] == 8
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from workspace_extractor.utils.dag_scheduler import DagScheduler
+
+
+class TestDagScheduler:
+    """Tests for the dependency-aware step scheduler."""
+
+    def test_serial_runs_in_declaration_order(self) -> None:
+        """With one worker, steps run one at a time in the declared order."""
+        order = []
+        scheduler = DagScheduler(max_workers=1)
+        for name in ["a", "b", "c"]:
+            scheduler.add_step(name, lambda name=name: order.append(name))
+        scheduler.add_step("d", lambda: order.append("d"), depends_on=["a"])
+
+        scheduler.run()
+
+        assert order == ["a", "b", "c", "d"]
+
+    def test_independent_steps_overlap(self) -> None:
+        """Independent steps start together when workers are available."""
+        barrier = threading.Barrier(3, timeout=5)
+        scheduler = DagScheduler(max_workers=3)
+        for name in ["a", "b", "c"]:
+            scheduler.add_step(name, barrier.wait)
+
+        summary = scheduler.run()
+
+        assert not any(step["error"] for step in summary["steps"].values())
+
+    def test_dependent_step_waits_for_inputs_only(self) -> None:
+        """A dependent step starts once its own dependencies finish, not the slow unrelated ones."""
+        scheduler = DagScheduler(max_workers=3)
+        scheduler.add_step("fast", lambda: time.sleep(0.05))
+        scheduler.add_step("slow", lambda: time.sleep(0.4))
+        scheduler.add_step("child", lambda: time.sleep(0.05), depends_on=["fast"])
+
+        summary = scheduler.run()
+        steps = summary["steps"]
+
+        assert steps["child"]["start"] >= steps["fast"]["end"]
+        assert steps["child"]["end"] < steps["slow"]["end"]
+        assert summary["critical_path"] == ["slow"]
+
+    def test_critical_path_follows_last_dependency(self) -> None:
+        """The critical path walks back through the dependency that finished last."""
+        scheduler = DagScheduler(max_workers=4)
+        scheduler.add_step("clusters", lambda: time.sleep(0.05))
+        scheduler.add_step("runs", lambda: time.sleep(0.2))
+        scheduler.add_step("mapping", lambda: None, depends_on=["clusters", "runs"])
+        scheduler.add_step("events", lambda: time.sleep(0.1), depends_on=["mapping"])
+
+        summary = scheduler.run()
+
+        assert summary["critical_path"] == ["runs", "mapping", "events"]
+        assert summary["critical_path_seconds"] <= summary["wall_seconds"]
+        assert summary["steps"]["events"]["depends_on"] == ["mapping"]
+
+    def test_failures_are_recorded_and_dependents_still_run(self) -> None:
+        """Failed steps are flagged, exceptions are captured and dependents still execute."""
+        ran = []
+
+        def boom() -> None:
+            raise RuntimeError("boom")
+
+        scheduler = DagScheduler(max_workers=2)
+        scheduler.add_step("raises", boom)
+        scheduler.add_step("returns_error", lambda: (True, "failed"))
+        scheduler.add_step("child", lambda: ran.append("child"), depends_on=["raises", "returns_error"])
+
+        summary = scheduler.run()
+
+        assert summary["steps"]["raises"]["error"] is True
+        assert summary["steps"]["returns_error"]["error"] is True
+        assert summary["steps"]["child"]["error"] is False
+        assert scheduler.results["raises"] == (True, "boom")
+        assert ran == ["child"]
+
+    def test_invalid_declarations(self) -> None:
+        """Unknown dependencies and duplicate names are rejected."""
+        scheduler = DagScheduler()
+        scheduler.add_step("a", lambda: None)
+        with pytest.raises(ValueError, match="undeclared"):
+            scheduler.add_step("b", lambda: None, depends_on=["missing"])
+        with pytest.raises(ValueError, match="already declared"):
+            scheduler.add_step("a", lambda: None)
@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+from workspace_extractor.utils.folder_scrubber import FolderScrubber
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util_file import UtilFile
+
+from tests.conftest import read_text
+
+
+def get_runs(count: int) -> list[dict]:
+    return [
+        {
+            "run_id": i,
+            "run_name": f"etl_{i % 7}",
+            "creator_user_name": f"user{i % 3}@example.com",
+            "tasks": [{"task_key": "owner@example.com", "notebook_task": {"notebook_path": f"/Users/u{i}@example.com/nb"}}],
+        }
+        for i in range(count)
+    ]
+
+
+def write_output(folder: str) -> dict[str, object]:
+    """Write an output folder with split runs, per item files, a summary and a manifest."""
+    files: dict[str, object] = {
+        "runs_01": get_runs(300),
+        "runs_02": get_runs(40),
+        "events_0612-abc": [{"type": "EDITED", "details": {"user": "jane@example.com"}}],
+        "summary": {"runs": 340, "incremental": {"previous_output": "/Users/jane@example.com/out"}},
+    }
+    for name, data in files.items():
+        if name.startswith("runs_"):
+            UtilFile.write_file_request_(folder, name, data, "runs", int(name[-2:]))
+        else:
+            UtilFile.write_file_request_(folder, name, data)
+    os.makedirs(os.path.join(folder, ".checkpoints"))
+    with open(os.path.join(folder, ".checkpoints", "runs.json"), "w") as file:
+        file.write('{"next_page_token": "x@y.com"}')
+    with open(os.path.join(folder, "log_error.txt"), "w") as file:
+        file.write("log")
+    return files
+
+
+class TestFolderScrubber:
+    """Tests for the process pool anonymization of an output folder."""
+
+    def test_scrubs_every_json_file_into_the_target(self, temp_dir: str) -> None:
+        source = os.path.join(temp_dir, "output")
+        target = os.path.join(temp_dir, "shared")
+        files = write_output(source)
+        originals = {name: read_text(source, name) for name in files}
+
+        stats = FolderScrubber(source, target, processes=2).run()
+
+        for name, data in files.items():
+            assert read_text(target, name) == json.dumps(UtilFile.filter_data(data, []))
+            assert read_text(source, name) == originals[name]
+        assert stats["files"] == 4
+        assert stats["records"] == 300 + 40 + 1 + 2
+        assert stats["copied"] == 2
+        assert stats["bytes"] == sum(len(text) for text in originals.values())
+        assert stats["files_per_second"] > 0 and stats["bytes_per_second"] > 0
+        assert not os.path.exists(os.path.join(target, ".checkpoints"))
+        assert os.path.exists(os.path.join(target, "log_error.txt"))
+        for entry in Manifest.load(target).values():
+            assert entry["sha256"] == Manifest.get_sha256(os.path.join(target, entry["file"]))
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_large_files_are_scrubbed_in_batches_in_place(self, temp_dir: str, processes: int) -> None:
+        files = write_output(temp_dir)
+
+        stats = FolderScrubber(temp_dir, processes=processes, chunk_bytes=1024, chunk_records=7).run()
+
+        for name, data in files.items():
+            assert read_text(temp_dir, name) == json.dumps(UtilFile.filter_data(data, []))
+        assert stats["records"] == 343
+        assert [name for name in os.listdir(temp_dir) if ".tmp" in name] == []
+        entries = Manifest.load(temp_dir)
+        assert entries["runs_01.json"]["sha256"] == Manifest.get_sha256(os.path.join(temp_dir, "runs_01.json"))
+        assert entries["runs_01.json"]["records"] == 300
+
+    def test_plans_anonymize_every_string_and_drop_secrets(self, temp_dir: str) -> None:
+        files = write_output(temp_dir)
+
+        FolderScrubber(temp_dir, processes=1, use_plans=True, keys=["run_name"]).run()
+
+        runs = json.loads(read_text(temp_dir, "runs_02"))
+        assert runs == UtilFile.filter_data(files["runs_02"], ["run_name"])
+        assert runs[0]["tasks"][0]["task_key"] == "[EMAIL_REMOVED]"
+        assert "run_name" not in runs[0]
+        assert read_text(temp_dir, "events_0612-abc") == '[{"type": "EDITED", "details": {"user": "[EMAIL_REMOVED]"}}]'
+
+    def test_part_numbers_beyond_99_keep_the_entity(self) -> None:
+        scrubber = FolderScrubber("output", use_plans=True)
+
+        assert scrubber.get_entity("runs_07.json") == "runs"
+        assert scrubber.get_entity("runs_100.json") == "runs"
+        assert scrubber.get_entity("events_0612-abc_123.json") == "events"
+
+    def test_failure_leaves_the_files_intact(self, temp_dir: str) -> None:
+        write_output(temp_dir)
+        with open(os.path.join(temp_dir, "broken.json"), "w") as file:
+            file.write('[{"run_id": 1}, {"run_')
+
+        with pytest.raises(ValueError):
+            FolderScrubber(temp_dir, processes=1, chunk_bytes=10).run()
+
+        assert read_text(temp_dir, "broken") == '[{"run_id": 1}, {"run_'
+        assert [name for name in os.listdir(temp_dir) if ".tmp" in name] == []
+
+    def test_missing_folder_raises(self, temp_dir: str) -> None:
+        with pytest.raises(FileNotFoundError):
+            FolderScrubber(os.path.join(temp_dir, "missing")).run()
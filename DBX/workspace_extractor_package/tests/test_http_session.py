@@ -0,0 +1,89 @@
+import json
+import os
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.http_session import HttpSession
+
+
+class TestHttpSession:
+    """Tests for the shared connection-pooled session."""
+
+    def test_reuses_connection_across_requests(self, mock_api) -> None:
+        """Sequential requests to the same host share one keep-alive connection."""
+        mock_api.route("api/ping", lambda params, body: (200, {}, {"ok": True}))
+        session = HttpSession()
+
+        for _ in range(5):
+            assert session.get(f"{mock_api.url}/api/ping").status_code == 200
+
+        stats = session.get_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+        assert stats["reuse_ratio"] == 0.8
+        session.close()
+
+    def test_no_keep_alive_opens_connection_per_request(self, mock_api) -> None:
+        """Disabling keep-alive closes the connection after every request."""
+        mock_api.route("api/ping", lambda params, body: (200, {}, {"ok": True}))
+        session = HttpSession(keep_alive=False)
+
+        for _ in range(3):
+            session.get(f"{mock_api.url}/api/ping")
+
+        stats = session.get_stats()
+        assert stats["connections_opened"] == 3
+        assert stats["connections_reused"] == 0
+        session.close()
+
+    def test_reconnections_are_counted(self, mock_api) -> None:
+        """A connection closed by the server and opened again counts as a new one."""
+        mock_api.route("api/ping", lambda params, body: (200, {"Connection": "close"}, {"ok": True}))
+        session = HttpSession()
+
+        for _ in range(3):
+            assert session.get(f"{mock_api.url}/api/ping").status_code == 200
+
+        assert session.get_stats()["connections_opened"] == 3
+        session.close()
+
+    def test_empty_stats(self) -> None:
+        """Stats are zeroed before any request is made."""
+        assert HttpSession().get_stats() == {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "reuse_ratio": 0.0,
+        }
+
+
+class TestManagerSession:
+    """Tests for Manager using the shared session."""
+
+    def test_get_and_save_pages_share_connection(self, mock_api, temp_dir: str) -> None:
+        """All pages of a paginated endpoint go through the same pooled connection."""
+
+        def clusters(params: dict, body: dict) -> tuple[int, dict, dict]:
+            page = int(params.get("page_token", 0))
+            payload = {"clusters": [{"cluster_id": f"c{page}"}]}
+            if page < 2:
+                payload["next_page_token"] = str(page + 1)
+                payload["has_more"] = True
+            return 200, {}, payload
+
+        mock_api.route("api/2.0/clusters/list", clusters)
+        manager = Manager(mock_api.url, "token", temp_dir)
+
+        error, _ = manager.get_and_save(
+            path="api/2.0/clusters/list", name_output="clusters", use_paging=True, url_api=manager.url
+        )
+        manager.write_results_count_json()
+
+        assert error is False
+        with open(os.path.join(temp_dir, "clusters.json")) as file:
+            assert [c["cluster_id"] for c in json.load(file)] == ["c0", "c1", "c2"]
+        with open(os.path.join(temp_dir, "summary.json")) as file:
+            summary = json.load(file)
+        assert summary["clusters"] == 3
+        assert summary["connections"]["requests"] == 3
+        assert summary["connections"]["connections_opened"] == 1
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+
+import pytest
+
+from workspace_extractor.incremental import Incremental
+from workspace_extractor.manager import Manager
+from workspace_extractor.sizing import Sizing
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util import Util
+
+from tests.conftest import read_json, write_json
+
+
+NOW = int(time.time() * 1000)
+HOUR = 3600 * 1000
+
+
+def run(run_id: int, start_time: int, end_time: int) -> dict:
+    return {
+        "run_id": run_id,
+        "run_name": f"job-{run_id}",
+        "start_time": start_time,
+        "end_time": end_time,
+        "tasks": [{"existing_cluster_id": "job-cluster", "state": {"result_state": "SUCCESS"}}],
+    }
+
+
+class TestWatermarks:
+    """Tests for the watermarks computed from a previous output."""
+
+    def test_watermarks(self, temp_dir: str) -> None:
+        """Runs use the last end_time, lowered to the start of still active runs."""
+        write_json(temp_dir, "runs_01", [{"run_id": 1, "start_time": 100, "end_time": 900}])
+        write_json(temp_dir, "runs_02", [{"run_id": 2, "start_time": 500, "end_time": 0}])
+        write_json(temp_dir, "runs_details_1", [{"run_id": 1}])
+        write_json(temp_dir, "queries", [{"query_id": "a", "query_start_time_ms": 40}, {"query_id": "b"}])
+        write_json(temp_dir, "events_c1", [{"timestamp": 10}, {"timestamp": 30}])
+        write_json(temp_dir, "events_c2", [])
+        write_json(temp_dir, "events_c3_100", [{"timestamp": 70}])
+
+        watermarks = Incremental.get_watermarks(temp_dir)
+
+        assert watermarks == {"runs": 500, "queries": 40, "events": {"c1": 30, "c3": 70}}
+        assert Incremental.get_finished_run_ids(temp_dir) == {"1"}
+
+    def test_empty_previous_output(self, temp_dir: str) -> None:
+        """A folder without extraction files gives no watermark at all."""
+        assert Incremental.get_watermarks(temp_dir) == {"runs": None, "queries": None, "events": {}}
+
+
+class TestMergeRecords:
+    """Tests for merging new records with previous ones."""
+
+    def test_new_records_win_and_old_ones_are_trimmed(self) -> None:
+        """Duplicates keep the fresh version and records older than since are dropped."""
+        new = [{"run_id": 3, "start_time": 30}, {"run_id": 2, "start_time": 20, "state": "new"}]
+        previous = [{"run_id": 2, "start_time": 20, "state": "old"}, {"run_id": 1, "start_time": 5}]
+
+        merged = Incremental.merge_records(new, previous, ("run_id",), "start_time", since=10)
+
+        assert merged == [{"run_id": 3, "start_time": 30}, {"run_id": 2, "start_time": 20, "state": "new"}]
+
+    def test_composite_key(self) -> None:
+        """Events are identified by their timestamp and type."""
+        new = [{"timestamp": 2, "type": "RUNNING"}]
+        previous = [{"timestamp": 2, "type": "RUNNING"}, {"timestamp": 2, "type": "RESIZING"}]
+
+        merged = Incremental.merge_records(new, previous, ("timestamp", "type"))
+
+        assert merged == [{"timestamp": 2, "type": "RUNNING"}, {"timestamp": 2, "type": "RESIZING"}]
+
+
+class TestMergeOutput:
+    """Tests for merging an output folder with a previous one."""
+
+    def test_merge_past_the_size_cap_keeps_every_record(self, temp_dir: str) -> None:
+        """A merge larger than max_file_bytes is split into parts without losing records."""
+        output = os.path.join(temp_dir, "current")
+        previous_output = os.path.join(temp_dir, "previous")
+        Util.write_file_request_(output, "runs_01", [run(i, 2000 + i, 0) for i in range(100, 130)], "runs", 1)
+        Util.write_file_request_(output, "runs_02", [run(i, 2000 + i, 0) for i in range(130, 150)], "runs", 2)
+        Util.write_file_request_(previous_output, "runs", [run(i, 1000 + i, 0) for i in range(140, 0, -1)])
+
+        merged, new = Incremental.merge_output(
+            previous_output, output, "runs", ("run_id",), "start_time", since=1011, max_file_bytes=2000
+        )
+
+        files = Manifest.get_files(output, "runs")
+        records = [record for f in files for record in json.load(open(f))]
+        assert (merged, new) == (139, 50)
+        assert len(files) > 2
+        assert all(os.path.getsize(f) <= 2000 for f in files)
+        assert [record["run_id"] for record in records] == [*range(100, 150), *range(99, 10, -1)]
+        assert sum(entry["records"] for entry in Manifest.load(output).values() if entry["name"] == "runs") == 139
+        assert not os.path.exists(os.path.join(output, ".merge_runs"))
+
+    def test_failed_merge_restores_the_fetched_files(self, temp_dir: str) -> None:
+        """Fetched files and their manifest entries are put back when the previous output can't be read."""
+        output = os.path.join(temp_dir, "current")
+        previous_output = os.path.join(temp_dir, "previous")
+        Util.write_file_request_(output, "runs_01", [run(1, 1, 0), run(2, 2, 0)], "runs", 1)
+        Util.write_file_request_(output, "runs_02", [run(3, 3, 0)], "runs", 2)
+        fetched = Manifest.load(output)
+        os.makedirs(previous_output)
+        with open(os.path.join(previous_output, "runs.json"), "w") as file:
+            file.write(json.dumps([run(i, i, 0) for i in range(4, 20)])[:-1] + ', {"run_')
+
+        with pytest.raises(json.JSONDecodeError):
+            Incremental.merge_output(previous_output, output, "runs", ("run_id",), max_file_bytes=500)
+
+        assert read_json(output, "runs_01") == [run(1, 1, 0), run(2, 2, 0)]
+        assert read_json(output, "runs_02") == [run(3, 3, 0)]
+        entries = Manifest.load(output)
+        assert sorted(entries) == ["runs_01.json", "runs_02.json"]
+        assert all(entries[file]["sha256"] == fetched[file]["sha256"] for file in entries)
+        assert not os.path.exists(os.path.join(output, ".merge_runs"))
+
+
+class TestIncrementalMetadata:
+    """Tests for get_metadata with a previous output folder."""
+
+    @pytest.fixture
+    def previous_output(self, temp_dir: str) -> str:
+        folder = os.path.join(temp_dir, "previous")
+        os.makedirs(folder)
+        write_json(folder, "runs", [run(1, NOW - 3 * HOUR, NOW - 2 * HOUR)])
+        write_json(folder, "runs_details_1", [{"run_id": 1, "cached": True}])
+        write_json(folder, "queries", [{"query_id": "q1", "query_start_time_ms": NOW - 2 * HOUR}])
+        write_json(folder, "events_ui-cluster", [{"timestamp": NOW - 2 * HOUR, "type": "RUNNING"}])
+        return folder
+
+    @pytest.fixture
+    def workspace_api(self, mock_api):
+        runs = [run(2, NOW - HOUR, NOW), run(1, NOW - 3 * HOUR, NOW - 2 * HOUR)]
+        routes = {
+            "api/2.0/clusters/list-node-types": {"node_types": []},
+            "api/2.0/clusters/list": {"clusters": [{"cluster_id": "ui-cluster", "cluster_source": "UI"}]},
+            "api/2.2/jobs/list": {"jobs": []},
+            "api/2.1/jobs/runs/list": {"runs": runs},
+            "api/2.0/sql/warehouses": {"warehouses": []},
+            "api/2.0/pipelines": {"statuses": []},
+            "api/2.0/sql/history/queries": {"res": [{"query_id": "q2", "query_start_time_ms": NOW}]},
+            "api/2.0/clusters/events": {"events": [{"timestamp": NOW, "type": "RESIZING"}]},
+            "api/2.1/jobs/runs/get": {"run_id": 2},
+        }
+        for path, payload in routes.items():
+            mock_api.route(path, lambda params, body, payload=payload: (200, {}, payload))
+        return mock_api
+
+    def test_fetches_after_watermarks_and_merges(self, workspace_api, previous_output: str, temp_dir: str) -> None:
+        """Only newer data is requested and the outputs contain previous and new records."""
+        output = os.path.join(temp_dir, "current")
+        sizing = Sizing(workspace_api.url, "token", output)
+
+        sizing.get_metadata(days=1, previous_output=previous_output)
+
+        params = {path: call_params for _, path, call_params in workspace_api.calls}
+        assert params["api/2.1/jobs/runs/list"]["start_time_from"] == str(NOW - 2 * HOUR)
+        assert params["api/2.0/sql/history/queries"]["filter_by.query_start_time_range.start_time_ms"] == str(
+            NOW - 2 * HOUR
+        )
+        assert params["api/2.0/clusters/events"]["start_time"] == str(NOW - 2 * HOUR)
+        assert [run["run_id"] for run in read_json(output, "runs")] == [2, 1]
+        assert [query["query_id"] for query in read_json(output, "queries")] == ["q2", "q1"]
+        assert [event["type"] for event in read_json(output, "events_ui-cluster")] == ["RESIZING", "RUNNING"]
+        assert [event["type"] for event in read_json(output, "events_job-cluster")] == ["RESIZING"]
+        assert read_json(output, "runs_details_1") == [{"run_id": 1, "cached": True}]
+        assert read_json(output, "runs_details_2") == [{"run_id": 2}]
+        assert [call for call in workspace_api.calls if call[1] == "api/2.1/jobs/runs/get"] == [
+            ("GET", "api/2.1/jobs/runs/get", {"run_id": "2"})
+        ]
+        assert Manager.results_count["runs"] == 2
+        assert Manager.results_count["queries"] == 2
+        assert Manager.results_count["events"] == 3
+        assert Manager.results_count["runs_details"] == 2
+        assert sizing.summary_sections["incremental"]["runs"] == NOW - 2 * HOUR
+
+    def test_previous_output_must_differ(self, workspace_api, temp_dir: str) -> None:
+        """Merging into the folder being read from is rejected."""
+        sizing = Sizing(workspace_api.url, "token", temp_dir)
+
+        with pytest.raises(ValueError):
+            sizing.get_metadata(days=1, previous_output=temp_dir)
@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from workspace_extractor.mapping import Mapping
+from workspace_extractor.mapping_index import MappingIndex
+from workspace_extractor.utils.index_cache import IndexCache
+from workspace_extractor.utils.util import Util
+
+
+def run(run_id: int, run_name: str, end_time: int) -> dict:
+    return {
+        "run_id": run_id,
+        "run_name": run_name,
+        "start_time": 0,
+        "end_time": end_time,
+        "tasks": [{"existing_cluster_id": f"cluster-{run_id}", "state": {"result_state": "SUCCESS"}}],
+    }
+
+
+@pytest.fixture
+def output() -> Generator[str, None, None]:
+    temp_dir = tempfile.mkdtemp()
+    Util.write_file_request_(temp_dir, "runs", [run(1, "nightly", 10), run(2, "hourly", 5)])
+    Util.write_file_request_(temp_dir, "clusters", [{"cluster_id": "ui", "cluster_source": "UI"}])
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def index_cache_dir(output: str) -> str:
+    return os.path.join(output, MappingIndex.cache_folder)
+
+
+class TestIndexCache:
+    """Tests for the persistent cache of the mapping results."""
+
+    def test_second_index_reads_the_cache(self, output: str) -> None:
+        """A new index over unchanged files doesn't parse them again."""
+        first = MappingIndex(output, cache=True)
+        assert first.get_runs_ids() == {1, 2}
+        assert sorted(first.get_clusters_ids()) == ["cluster-1", "cluster-2", "ui"]
+
+        with (
+            patch.object(MappingIndex, "reduce_runs_file") as reduce_runs,
+            patch.object(MappingIndex, "reduce_clusters_file") as reduce_clusters,
+        ):
+            index = MappingIndex(output, cache=True)
+            assert index.get_runs_ids() == {1, 2}
+            assert sorted(index.get_clusters_ids()) == ["cluster-1", "cluster-2", "ui"]
+
+        reduce_runs.assert_not_called()
+        reduce_clusters.assert_not_called()
+        assert index.cache.hits == 2
+
+    def test_changed_file_invalidates(self, output: str) -> None:
+        assert MappingIndex(output, cache=True).get_runs_ids() == {1, 2}
+        time.sleep(0.01)
+
+        Util.write_file_request_(output, "runs", [run(1, "nightly", 10), run(3, "nightly", 20)])
+
+        index = MappingIndex(output, cache=True)
+        assert index.get_runs_ids() == {3}
+        assert index.cache.misses == 1
+
+    def test_added_part_invalidates(self, output: str) -> None:
+        assert MappingIndex(output, cache=True).get_runs_ids() == {1, 2}
+
+        Util.write_file_request_(output, "runs_02", [run(4, "weekly", 7)], "runs", 2)
+        os.rename(os.path.join(output, "runs.json"), os.path.join(output, "runs_01.json"))
+        Util.write_file_request_(output, "runs_01", [run(1, "nightly", 10), run(2, "hourly", 5)], "runs", 1)
+
+        assert MappingIndex(output, cache=True).get_runs_ids() == {1, 2, 4}
+
+    def test_table_round_trip(self, output: str) -> None:
+        table = MappingIndex(output, cache=True).runs_table
+
+        with patch.object(MappingIndex, "build_runs_table") as build:
+            cached = MappingIndex(output, cache=True).runs_table
+
+        build.assert_not_called()
+        for name in MappingIndex.runs_schema:
+            assert cached.get_values(name) == table.get_values(name)
+
+    def test_checksum_ignores_touch(self, output: str, index_cache_dir: str) -> None:
+        """With checksums, rewriting a file with the same content keeps the entry valid."""
+        cache = IndexCache(index_cache_dir, output, checksum=True)
+        assert cache.load("runs", "ids") is None
+        cache.save("runs", "ids", [1, 2])
+        path = os.path.join(output, "runs.json")
+        os.utime(path, (time.time() + 10, time.time() + 10))
+
+        assert cache.load("runs", "ids") == [1, 2]
+        assert IndexCache(index_cache_dir, output).load("runs", "ids") is None
+
+    def test_cache_is_off_by_default(self, output: str, index_cache_dir: str) -> None:
+        assert MappingIndex(output).cache is None
+        assert Mapping.get_runs_ids(output) == {1, 2}
+
+        assert not os.path.exists(index_cache_dir)
+
+    def test_mapping_reads_the_cache_when_asked(self, output: str, index_cache_dir: str) -> None:
+        """A second Mapping.get_runs_ids(output, cache=True) reads the selection from <output>/.index_cache."""
+        assert Mapping.get_runs_ids(output, cache=True) == {1, 2}
+        assert os.listdir(index_cache_dir)
+
+        with patch.object(MappingIndex, "reduce_runs_file") as reduce_runs:
+            assert Mapping.get_runs_ids(output, cache=True) == {1, 2}
+            assert sorted(Mapping.get_clusters_ids_from_runs(output, cache=True)) == ["cluster-1", "cluster-2"]
+
+        reduce_runs.assert_not_called()
+
+    def test_cache_lives_in_the_output_and_is_private(self, output: str, index_cache_dir: str) -> None:
+        MappingIndex(output, cache=True).get_runs_ids()
+
+        assert os.listdir(index_cache_dir)
+        assert os.stat(index_cache_dir).st_mode & 0o777 == 0o700
+
+    def test_selection_modes_have_their_own_entries(self, output: str) -> None:
+        """A columnar index doesn't reuse the selection cached by a streaming one, and conversely."""
+        assert MappingIndex(output, cache=True).get_runs_ids() == {1, 2}
+
+        with patch.object(MappingIndex, "select_from_table", return_value=[]) as select:
+            columnar = MappingIndex(output, columnar=True, cache=True)
+            assert columnar.get_runs_ids() == set()
+        select.assert_called_once()
+
+        with patch.object(MappingIndex, "reduce_runs_file") as reduce_runs:
+            assert MappingIndex(output, cache=True).get_runs_ids() == {1, 2}
+            assert MappingIndex(output, columnar=True, cache=True).get_runs_ids() == set()
+        reduce_runs.assert_not_called()
+
+    def test_corrupt_entry_is_a_miss(self, output: str, index_cache_dir: str) -> None:
+        cache = IndexCache(index_cache_dir, output)
+        cache.load("runs", "ids")
+        cache.save("runs", "ids", [1])
+        with open(cache._get_path("runs", "ids", "json"), "w") as file:
+            file.write("{")
+
+        assert cache.load("runs", "ids") is None
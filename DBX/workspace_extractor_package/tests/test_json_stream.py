@@ -0,0 +1,186 @@
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.json_stream import JsonArrayReader, RollingJsonWriter
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util_file import UtilFile
+
+from tests.conftest import read_text
+
+
+class TestRollingJsonWriter:
+    """Tests for the size-capped rolling writer."""
+
+    records = [{"run_id": i, "payload": "x" * (i % 7) * 10} for i in range(200)]
+
+    def _write(self, temp_dir: str, max_bytes: int, pages: int = 10) -> RollingJsonWriter:
+        writer = RollingJsonWriter(temp_dir, "runs", max_bytes)
+        size = len(self.records) // pages
+        for start in range(0, len(self.records), size):
+            writer.write(self.records[start : start + size])
+        writer.close()
+        return writer
+
+    def test_small_output_is_a_single_file(self, temp_dir: str) -> None:
+        """Below the cap, the output is "<name>.json", byte-identical to write_file_request_."""
+        writer = self._write(temp_dir, 1024 * 1024)
+        UtilFile.write_file_request_(temp_dir, "reference", self.records)
+
+        assert sorted(os.listdir(temp_dir)) == ["manifest.jsonl", "reference.json", "runs.json"]
+        assert read_text(temp_dir, "runs") == read_text(temp_dir, "reference")
+        assert writer.count == len(self.records)
+        entry = Manifest.load(temp_dir)["runs.json"]
+        assert (entry["part"], entry["records"]) == (None, len(self.records))
+        assert entry["sha256"] == Manifest.get_sha256(os.path.join(temp_dir, "runs.json"))
+
+    def test_rolls_over_at_the_cap(self, temp_dir: str) -> None:
+        """Parts stay within the cap, keep every record in order and are listed in the manifest."""
+        writer = self._write(temp_dir, 1000)
+
+        files = Manifest.get_files(temp_dir, "runs")
+        assert [os.path.basename(f) for f in files] == [f"runs_{i:02d}.json" for i in range(1, writer.part + 1)]
+        assert writer.part > 2
+        assert not os.path.exists(os.path.join(temp_dir, "runs.json"))
+        assert [record for f in files for record in json.load(open(f))] == self.records
+        entries = Manifest.load(temp_dir)
+        for f in files:
+            assert os.path.getsize(f) <= 1000
+            assert entries[os.path.basename(f)]["sha256"] == Manifest.get_sha256(f)
+        assert sum(entry["records"] for entry in entries.values()) == len(self.records)
+
+    def test_oversized_record_gets_its_own_part(self, temp_dir: str) -> None:
+        writer = RollingJsonWriter(temp_dir, "runs", 50)
+        writer.write([{"a": 1}, {"blob": "y" * 100}, {"b": 2}])
+        writer.close()
+
+        parts = [json.loads(read_text(temp_dir, f"runs_{i:02d}")) for i in range(1, 4)]
+        assert parts == [[{"a": 1}], [{"blob": "y" * 100}], [{"b": 2}]]
+
+    def test_resume_continues_the_current_part(self, temp_dir: str) -> None:
+        """An output reopened from get_state() ends up identical to an uninterrupted one."""
+        uninterrupted = os.path.join(temp_dir, "uninterrupted")
+        resumed = os.path.join(temp_dir, "resumed")
+        self._write(uninterrupted, 1000)
+        writer = RollingJsonWriter(resumed, "runs", 1000)
+        writer.write(self.records[:90])
+        writer.flush()
+        state = writer.get_state()
+        writer.write(self.records[90:95])
+        writer.suspend()
+
+        writer = RollingJsonWriter(resumed, "runs", 1000, resume_state=state)
+        writer.write(self.records[90:])
+        writer.close()
+
+        assert state["part"] > 1
+        assert writer.count == len(self.records)
+        assert sorted(os.listdir(resumed)) == sorted(os.listdir(uninterrupted))
+        for name in os.listdir(uninterrupted):
+            if name != "manifest.jsonl":
+                assert read_text(resumed, name[:-5]) == read_text(uninterrupted, name[:-5])
+                assert Manifest.load(resumed)[name]["sha256"] == Manifest.load(uninterrupted)[name]["sha256"]
+
+    def test_discard_removes_every_part(self, temp_dir: str) -> None:
+        writer = RollingJsonWriter(temp_dir, "runs", 1000)
+        writer.write(self.records)
+        writer.discard()
+
+        assert Manifest.get_files(temp_dir, "runs") == []
+        assert os.listdir(temp_dir) == ["manifest.jsonl"]
+
+
+class TestJsonArrayReader:
+    """Tests for the chunked JSON array reader."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+    def test_matches_json_load(self, temp_dir: str, chunk_size: int) -> None:
+        """Records cut anywhere by the chunk boundary decode like json.load()."""
+        records = [1, -23456, 1.5e10, "a]b,\"}", None, True, {"x": [1, {"y": "}"}]}, [], {}]
+        path = os.path.join(temp_dir, "records.json")
+        for data in (json.dumps(records), json.dumps(records, indent=2), "[]", " \n[ ]\n"):
+            with open(path, "w") as file:
+                file.write(data)
+
+            assert list(JsonArrayReader(path, chunk_size)) == json.loads(data)
+
+    @pytest.mark.parametrize("data", ["[1, 2", "[1 2]", "[1,]", "[1,,2]", "["])
+    def test_malformed_array(self, temp_dir: str, data: str) -> None:
+        path = os.path.join(temp_dir, "records.json")
+        with open(path, "w") as file:
+            file.write(data)
+
+        with pytest.raises(json.JSONDecodeError):
+            list(JsonArrayReader(path, 2))
+
+    def test_not_an_array(self, temp_dir: str) -> None:
+        path = os.path.join(temp_dir, "record.json")
+        with open(path, "w") as file:
+            file.write('{"run_id": 1}')
+
+        with pytest.raises(ValueError):
+            list(JsonArrayReader(path))
+
+
+class TestStreamingGetAndSave:
+    """Tests for get_and_save in streaming mode."""
+
+    @pytest.fixture
+    def paged_api(self, mock_api):
+        def runs(params: dict, body: dict) -> tuple[int, dict, dict]:
+            page = int(params.get("page_token", 0))
+            payload = {"runs": [{"run_id": page * 100 + i, "blob": "y" * 2000} for i in range(100)]}
+            if page < 59:
+                payload["has_more"] = True
+                payload["next_page_token"] = str(page + 1)
+            return 200, {}, payload
+
+        mock_api.route("api/2.1/jobs/runs/list", runs)
+        return mock_api
+
+    def _fetch(self, url: str, output: str, stream: bool) -> tuple[int, tuple[bool, str]]:
+        manager = Manager(url, "token", output)
+        tracemalloc.start()
+        result = manager.get_and_save(
+            path="api/2.1/jobs/runs/list", name_output="runs", use_paging=True, url_api=url, stream=stream
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, result
+
+    def test_streaming_matches_and_stays_flat(self, paged_api, temp_dir: str) -> None:
+        """Streaming writes the same split files and results_count with a much lower memory peak."""
+        streamed = os.path.join(temp_dir, "streamed")
+        buffered = os.path.join(temp_dir, "buffered")
+
+        buffered_peak, buffered_result = self._fetch(paged_api.url, buffered, False)
+        buffered_count = Manager.results_count["runs"]
+        streamed_peak, streamed_result = self._fetch(paged_api.url, streamed, True)
+
+        assert buffered_result == streamed_result == (False, "Data fetched and saved successfully")
+        assert Manager.results_count["runs"] == buffered_count == 6000
+        assert sorted(os.listdir(streamed)) == sorted(os.listdir(buffered)) == ["manifest.jsonl", "runs_01.json", "runs_02.json"]
+        for name in ["runs_01", "runs_02"]:
+            assert read_text(streamed, name) == read_text(buffered, name)
+        assert streamed_peak < buffered_peak / 3
+
+    def test_failed_stream_leaves_no_file(self, mock_api, temp_dir: str) -> None:
+        """A request failing mid-stream removes the partial output like the buffered path."""
+
+        def runs(params: dict, body: dict) -> tuple[int, dict, dict]:
+            if params.get("page_token"):
+                return 500, {}, {"error_code": "INTERNAL_ERROR"}
+            return 200, {}, {"runs": [{"run_id": 1}], "has_more": True, "next_page_token": "1"}
+
+        mock_api.route("api/2.1/jobs/runs/list", runs)
+        manager = Manager(mock_api.url, "token", temp_dir)
+
+        error, _ = manager.get_and_save(
+            path="api/2.1/jobs/runs/list", name_output="runs", use_paging=True, url_api=mock_api.url, stream=True
+        )
+
+        assert error is True
+        assert not os.path.exists(os.path.join(temp_dir, "runs.json"))
@@ -0,0 +1,76 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from workspace_extractor.utils.latest_reducer import LatestReducer
+
+
+def rank_first(rows: list[dict]) -> list[dict]:
+    """Select the latest rows the way the mapping did with pandas."""
+    df = pd.DataFrame(rows)
+    df["rank"] = df.groupby(["run_name"])["end_time"].rank("first", ascending=False)
+    return df[df["rank"] == 1].to_dict("records")
+
+
+def random_rows(seed: int, count: int = 200) -> list[dict]:
+    generator = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "run_name": generator.choice(["a", "b", "c", "d", None]),
+            "end_time": generator.choice([1.0, 2.0, 3.0, 3.0, float("nan")]),
+        }
+        for i in range(count)
+    ]
+
+
+class TestLatestReducer:
+    """Tests for the streaming and vectorized latest-per-key reductions."""
+
+    def test_ties_go_to_first_row(self) -> None:
+        rows = [
+            {"run_name": "a", "end_time": 5, "id": 1},
+            {"run_name": "a", "end_time": 5, "id": 2},
+            {"run_name": "a", "end_time": None, "id": 3},
+            {"run_name": None, "end_time": 9, "id": 4},
+            {"run_name": "b", "end_time": float("nan"), "id": 5},
+            {"run_name": "b", "end_time": 1, "id": 6},
+        ]
+
+        assert [row["id"] for row in LatestReducer().update_all(iter(rows)).get_rows()] == [1, 6]
+
+    def test_matches_groupby_rank(self) -> None:
+        for seed in range(20):
+            rows = random_rows(seed)
+
+            expected = sorted(row["id"] for row in rank_first(rows))
+            assert sorted(row["id"] for row in LatestReducer().update_all(rows).get_rows()) == expected
+
+    def test_merge_of_chunks_matches_single_pass(self) -> None:
+        """Partial states over consecutive chunks merge into the single-pass result."""
+        rows = random_rows(7)
+        reducers = [LatestReducer().update_all(rows[start : start + 30]) for start in range(0, len(rows), 30)]
+
+        merged = reducers[0]
+        for reducer in reducers[1:]:
+            merged.merge(reducer)
+
+        assert merged.get_rows() == LatestReducer().update_all(rows).get_rows()
+
+    def test_select_indices_matches_streaming(self) -> None:
+        for seed in range(20):
+            rows = random_rows(seed)
+            names = ["a", "b", "c", "d"]
+            keys = np.array([names.index(row["run_name"]) if row["run_name"] else -1 for row in rows])
+            values = np.array([row["end_time"] for row in rows])
+            mask = np.array([row["id"] % 5 != 0 for row in rows])
+
+            indices = LatestReducer.select_indices(keys, values, mask)
+
+            kept = [row for row in rows if row["id"] % 5 != 0]
+            expected = sorted(row["id"] for row in LatestReducer().update_all(kept).get_rows())
+            assert sorted(indices.tolist()) == expected
+
+    def test_select_indices_empty(self) -> None:
+        assert LatestReducer.select_indices(np.array([-1]), np.array([1.0])).tolist() == []
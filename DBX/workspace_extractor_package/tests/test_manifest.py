@@ -0,0 +1,95 @@
+import json
+import os
+
+from workspace_extractor.incremental import Incremental
+from workspace_extractor.mapping_index import MappingIndex
+from workspace_extractor.utils.manifest import Manifest
+from workspace_extractor.utils.util import Util
+
+
+def run(run_id: int, cluster_id: str) -> dict:
+    return {
+        "run_id": run_id,
+        "run_name": f"job-{run_id}",
+        "start_time": run_id,
+        "end_time": run_id + 1,
+        "tasks": [{"existing_cluster_id": cluster_id, "state": {"result_state": "SUCCESS"}}],
+    }
+
+
+class TestManifest:
+    """Tests for the output manifest kept by the file writers."""
+
+    def test_write_is_recorded(self, temp_dir: str) -> None:
+        """Every written file gets its entity, record count, size and checksum."""
+        Util.write_file_request_(temp_dir, "runs", [run(1, "a"), run(2, "b")])
+        Util.write_file_request_(temp_dir, "events_0612-abc", [{"timestamp": 1}])
+
+        entries = Manifest.load(temp_dir)
+        runs = entries["runs.json"]
+        assert runs["entity"] == "runs"
+        assert runs["records"] == 2
+        assert runs["part"] is None
+        assert runs["bytes"] == os.path.getsize(os.path.join(temp_dir, "runs.json"))
+        assert runs["sha256"] == Manifest.get_sha256(os.path.join(temp_dir, "runs.json"))
+        assert entries["events_0612-abc.json"]["entity"] == "events"
+
+    def test_split_parts_replace_the_original(self, temp_dir: str) -> None:
+        """A split file is replaced by its parts in the manifest, without losing records."""
+        runs = [{"run_id": i, "payload": "x" * 1000} for i in range(12000)]
+        Util.write_file_request_(temp_dir, "runs", runs)
+
+        Util.check_file_request_(temp_dir, "runs", runs)
+
+        entries = Manifest.load(temp_dir)
+        assert sorted(entries) == ["runs_01.json", "runs_02.json"]
+        assert sum(entry["records"] for entry in entries.values()) == 12000
+        for file, entry in entries.items():
+            assert entry["sha256"] == Manifest.get_sha256(os.path.join(temp_dir, file))
+        assert [entry["part"] for entry in entries.values()] == [1, 2]
+        assert [run["run_id"] for f in Manifest.get_files(temp_dir, "runs") for run in json.load(open(f))] == [
+            *range(12000)
+        ]
+
+    def test_parts_beyond_99_without_manifest_are_in_number_order(self, temp_dir: str) -> None:
+        for part in [100, 2, 99, 1, 101]:
+            with open(os.path.join(temp_dir, f"runs_{part:02d}.json"), "w") as file:
+                json.dump([run(part, "a")], file)
+
+        files = Manifest.get_files(temp_dir, "runs")
+
+        assert [os.path.basename(f) for f in files] == [f"runs_{part:02d}.json" for part in [1, 2, 99, 100, 101]]
+
+    def test_rewrite_drops_previous_parts(self, temp_dir: str) -> None:
+        Util.write_file_request_(temp_dir, "runs_01", [run(1, "a")], "runs", 1)
+        Util.write_file_request_(temp_dir, "runs_02", [run(2, "a")], "runs", 2)
+        Util.write_file_request_(temp_dir, "runs", [run(3, "a")])
+
+        assert list(Manifest.load(temp_dir)) == ["runs.json"]
+
+    def test_mapping_reads_only_manifest_files(self, temp_dir: str) -> None:
+        """runs_details and stray files sharing the "runs" prefix are not parsed as runs."""
+        Util.write_file_request_(temp_dir, "runs", [run(1, "a")])
+        Util.write_file_request_(temp_dir, "runs_details_1", run(1, "a"))
+        with open(os.path.join(temp_dir, "runs_backup.json"), "w") as file:
+            json.dump([run(2, "b")], file)
+
+        assert Manifest.get_files(temp_dir, "runs") == [os.path.join(temp_dir, "runs.json")]
+        assert MappingIndex(temp_dir).get_runs_ids() == {1}
+
+    def test_fallback_without_manifest(self, temp_dir: str) -> None:
+        for name in ("runs_02", "runs", "runs_01", "runs_details_1", "runs_backup"):
+            with open(os.path.join(temp_dir, f"{name}.json"), "w") as file:
+                json.dump([], file)
+
+        assert Manifest.load(temp_dir) is None
+        assert [os.path.basename(f) for f in Manifest.get_files(temp_dir, "runs")] == [
+            "runs.json",
+            "runs_01.json",
+            "runs_02.json",
+        ]
+
+    def test_events_watermarks_from_manifest(self, temp_dir: str) -> None:
+        Util.write_file_request_(temp_dir, "events_a_b", [{"timestamp": 5}, {"timestamp": 9}])
+
+        assert Incremental.get_events_watermarks(temp_dir) == {"a_b": 9}
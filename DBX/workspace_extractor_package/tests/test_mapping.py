@@ -0,0 +1,205 @@
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from workspace_extractor.mapping import Mapping
+from workspace_extractor.mapping_index import MappingIndex
+from workspace_extractor.utils.columnar_table import ColumnarTable
+from workspace_extractor.utils.util import Util
+
+
+@pytest.fixture
+def output() -> Generator[str, None, None]:
+    temp_dir = tempfile.mkdtemp()
+    runs = [
+        {
+            "run_id": 1,
+            "run_name": "nightly",
+            "start_time": 0,
+            "end_time": 10,
+            "tasks": [{"existing_cluster_id": "shared", "state": {"result_state": "SUCCESS"}}],
+        },
+        {
+            "run_id": 2,
+            "run_name": "nightly",
+            "start_time": 20,
+            "end_time": 30,
+            "tasks": [{"cluster_instance": {"cluster_id": "job-2"}, "state": {"result_state": "SUCCESS"}}],
+        },
+        {
+            "run_id": 3,
+            "run_name": "hourly",
+            "start_time": 5,
+            "end_time": 8,
+            "tasks": [{"existing_cluster_id": "shared", "state": {"result_state": "FAILED"}}],
+        },
+    ]
+    clusters = [
+        {"cluster_id": "ui", "cluster_source": "UI"},
+        {
+            "cluster_id": "job-2",
+            "cluster_source": "JOB",
+            "default_tags": {"RunName": "nightly", "JobId": "9"},
+            "start_time": 20,
+            "end_time": 30,
+            "termination_reason": {"type": "SUCCESS"},
+        },
+    ]
+    with open(os.path.join(temp_dir, "runs.json"), "w") as file:
+        json.dump(runs, file)
+    with open(os.path.join(temp_dir, "clusters.json"), "w") as file:
+        json.dump(clusters, file)
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestMappingIndex:
+    """Tests for the single-pass mapping loader."""
+
+    def test_ids(self, output: str) -> None:
+        """The latest successful run of each job gives both the run and cluster IDs."""
+        index = MappingIndex(output)
+
+        assert index.get_runs_ids() == {2}
+        assert index.get_clusters_ids_from_runs() == {"job-2"}
+        assert index.get_clusters_ids_from_clusters() == ["ui", "job-2"]
+        assert index.get_clusters_ids() == ["job-2", "ui", "job-2"]
+
+    def test_files_are_parsed_once(self, output: str) -> None:
+        index = MappingIndex(output)
+
+        with (
+            patch.object(MappingIndex, "reduce_runs_file", wraps=MappingIndex.reduce_runs_file) as reduce_runs,
+            patch.object(MappingIndex, "reduce_clusters_file", wraps=MappingIndex.reduce_clusters_file) as reduce_clusters,
+        ):
+            index.get_clusters_ids()
+            index.get_runs_ids()
+            index.get_clusters_ids_from_clusters()
+
+        assert reduce_runs.call_count == 1
+        assert reduce_clusters.call_count == 1
+
+    def test_process_pool_matches_single_process(self, output: str) -> None:
+        """Split parts reduced in worker processes and merged in file order give the same selection."""
+        runs = [
+            {
+                "run_id": i,
+                "run_name": f"job-{i % 7}",
+                "start_time": 0,
+                "end_time": i % 11 + 1,
+                "tasks": [{"existing_cluster_id": f"cluster-{i}", "state": {"result_state": "SUCCESS"}}],
+            }
+            for i in range(400)
+        ]
+        clusters = [
+            {
+                "cluster_id": f"c-{i}",
+                "cluster_source": "JOB" if i % 3 else "UI",
+                "default_tags": {"RunName": f"job-{i % 5}", "JobId": "1"},
+                "start_time": 0,
+                "end_time": i % 13 + 1,
+                "termination_reason": {"type": "SUCCESS"},
+            }
+            for i in range(200)
+        ]
+        os.remove(os.path.join(output, "runs.json"))
+        os.remove(os.path.join(output, "clusters.json"))
+        for part in range(4):
+            Util.write_file_request_(output, f"runs_{part + 1:02d}", runs[part * 100 : (part + 1) * 100], "runs", part + 1)
+            Util.write_file_request_(
+                output, f"clusters_{part + 1:02d}", clusters[part * 50 : (part + 1) * 50], "clusters", part + 1
+            )
+
+        single = MappingIndex(output)
+        pooled = MappingIndex(output, processes=2)
+
+        assert pooled.latest_runs == single.latest_runs
+        assert pooled.get_runs_ids() == single.get_runs_ids() == {10 + 11 * job for job in range(7)}
+        assert sorted(pooled.get_clusters_ids()) == sorted(single.get_clusters_ids())
+
+    def test_selection_memory_is_bounded(self, output: str) -> None:
+        """Selecting the IDs of many task runs keeps one row per job, not the whole file."""
+        runs = [
+            {
+                "run_id": i,
+                "run_name": f"job-{i % 10}",
+                "start_time": i,
+                "end_time": i + 1,
+                "tasks": [{"existing_cluster_id": f"cluster-{i}", "state": {"result_state": "SUCCESS"}}] * 5,
+            }
+            for i in range(20000)
+        ]
+        with open(os.path.join(output, "runs.json"), "w") as file:
+            json.dump(runs, file)
+        del runs
+
+        tracemalloc.start()
+        with open(os.path.join(output, "runs.json")) as file:
+            json.load(file)
+        _, load_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run_ids = MappingIndex(output).get_runs_ids()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert run_ids == set(range(19990, 20000))
+        assert peak < load_peak / 5
+
+    def test_columnar_index_matches_streaming(self, output: str) -> None:
+        """Selecting from the columnar tables gives the same IDs as streaming the rows."""
+        streaming = MappingIndex(output)
+        columnar = MappingIndex(output, columnar=True)
+
+        assert columnar.get_runs_ids() == streaming.get_runs_ids()
+        assert columnar.get_clusters_ids_from_runs() == streaming.get_clusters_ids_from_runs()
+        assert sorted(columnar.get_clusters_ids_from_clusters()) == sorted(streaming.get_clusters_ids_from_clusters())
+
+    def test_mapping_selects_from_the_columnar_tables_when_asked(self, output: str) -> None:
+        with patch.object(MappingIndex, "select_from_table", wraps=MappingIndex.select_from_table) as select:
+            run_ids = Mapping.get_runs_ids(output, columnar=True)
+            cluster_ids = Mapping.get_clusters_ids(output, columnar=True)
+
+        assert select.called
+        assert run_ids == Mapping.get_runs_ids(output)
+        assert sorted(cluster_ids) == sorted(Mapping.get_clusters_ids(output))
+
+class TestColumnarTable:
+    """Tests for the dictionary-encoded columnar tables."""
+
+    def test_from_rows(self) -> None:
+        schema = {"run_name": ColumnarTable.CATEGORY, "end_time": ColumnarTable.FLOAT}
+        rows = [("a", 10), ("b", None), (None, 30), ("a", 40)]
+
+        table = ColumnarTable.from_rows(iter(rows), schema)
+
+        assert len(table) == 4
+        assert table.columns["run_name"].tolist() == [0, 1, -1, 0]
+        assert table.categories["run_name"] == ["a", "b"]
+        assert table.get_values("run_name") == ["a", "b", None, "a"]
+        assert table.get_values("end_time") == [10, None, 30, 40]
+        assert table.get_code("run_name", "b") == 1
+        assert table.get_code("run_name", "missing") == -2
+        assert table.to_pandas()["run_name"].dtype == "category"
+
+    def test_unknown_kind(self) -> None:
+        with pytest.raises(ValueError):
+            ColumnarTable.from_rows([], {"run_name": "string"})
+
+    def test_runs_table_matches_get_runs(self, output: str) -> None:
+        """The columnar runs table holds the same values as Mapping.get_runs(), minus cluster_instance."""
+        runs = Mapping.get_runs(output)
+        table = MappingIndex(output).runs_table
+
+        assert len(table) == len(runs)
+        for name in MappingIndex.runs_schema:
+            assert table.get_values(name) == [run[name] for run in runs]
+        clusters = Mapping.get_clusters(output)
+        for name in MappingIndex.clusters_schema:
+            assert MappingIndex(output).clusters_table.get_values(name) == [cluster[name] for cluster in clusters]
+        assert len(MappingIndex(None).runs_table) == 0
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.projection import Projection
+
+from tests.conftest import read_json
+
+
+def get_run(run_id: int) -> dict:
+    return {
+        "run_id": run_id,
+        "run_name": "etl",
+        "creator_user_name": "jane@example.com",
+        "start_time": 1700000000000 + run_id,
+        "overriding_parameters": {"notebook_params": {"token": "x" * 500}},
+        "tasks": [
+            {
+                "task_key": "ingest",
+                "notebook_task": {"notebook_path": "/Users/jane@example.com/etl", "base_parameters": {"a": "b"}},
+                "new_cluster": {"spark_version": "14.3.x-scala2.12", "spark_env_vars": {"TOKEN": "secret"}},
+            }
+        ],
+    }
+
+
+class TestProjection:
+    """Tests for the per page projection and anonymization policy."""
+
+    def test_drops_default_fields(self) -> None:
+        run = get_run(1)
+
+        [result] = Projection("runs", drop=Projection.default_drop["runs"]).apply([run])
+
+        assert "overriding_parameters" not in result
+        assert result["tasks"][0]["notebook_task"] == {"notebook_path": "/Users/jane@example.com/etl"}
+        assert result["tasks"][0]["new_cluster"] == {"spark_version": "14.3.x-scala2.12"}
+        assert run == get_run(1)
+
+    def test_keeps_only_the_given_paths(self) -> None:
+        projection = Projection(keep=["run_id", "tasks.task_key", "tasks.new_cluster", "tasks.new_cluster.x"])
+
+        assert projection.apply([get_run(1)]) == [
+            {
+                "run_id": 1,
+                "tasks": [
+                    {
+                        "task_key": "ingest",
+                        "new_cluster": {"spark_version": "14.3.x-scala2.12", "spark_env_vars": {"TOKEN": "secret"}},
+                    }
+                ],
+            }
+        ]
+
+    def test_anonymizes_with_the_entity_plan(self) -> None:
+        [result] = Projection("runs", drop=["tasks.notebook_task.base_parameters"], anonymize=True).apply([get_run(1)])
+
+        assert result["creator_user_name"] == "[EMAIL_REMOVED]"
+        assert result["tasks"][0]["notebook_task"] == {"notebook_path": "/Users/[EMAIL_REMOVED]/etl"}
+        assert result["run_name"] == "etl"
+
+    def test_anonymizes_every_string_without_a_plan(self) -> None:
+        projection = Projection("events", drop=["details.user"], anonymize=True)
+
+        result = projection.apply([{"type": "EDITED", "details": {"user": "jane", "reason": "by jane@example.com"}}])
+
+        assert result == [{"type": "EDITED", "details": {"reason": "by [EMAIL_REMOVED]"}}]
+
+
+class TestProjectedGetAndSave:
+    """Tests for get_and_save with a projection."""
+
+    @pytest.fixture
+    def paged_api(self, mock_api):
+        def runs(params: dict, body: dict) -> tuple[int, dict, dict]:
+            page = int(params.get("page_token", 0))
+            payload = {"runs": [get_run(page * 10 + i) for i in range(10)]}
+            if page < 2:
+                payload["has_more"] = True
+                payload["next_page_token"] = str(page + 1)
+            return 200, {}, payload
+
+        mock_api.route("api/2.1/jobs/runs/list", runs)
+        return mock_api
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_each_page_is_projected_before_it_is_saved(self, paged_api, temp_dir: str, stream: bool) -> None:
+        manager = Manager(paged_api.url, "token", temp_dir, projections=Projection.get_defaults(anonymize=True))
+
+        result = manager.get_and_save(
+            path="api/2.1/jobs/runs/list", name_output="runs", use_paging=True, url_api=paged_api.url, stream=stream
+        )
+
+        runs = read_json(temp_dir, "runs")
+        assert result == (False, "Data fetched and saved successfully")
+        assert [run["run_id"] for run in runs] == list(range(30))
+        assert runs[0] == Projection.get_defaults(anonymize=True)["runs"].apply([get_run(0)])[0]
+        assert "spark_env_vars" not in json.dumps(runs)
+        assert "jane@example.com" not in json.dumps(runs)
+        assert Manager.results_count["runs"] == 30
+
+    def test_explicit_projection_overrides_the_configured_one(self, paged_api, temp_dir: str) -> None:
+        manager = Manager(paged_api.url, "token", temp_dir, projections=Projection.get_defaults())
+
+        manager.get_and_save(
+            path="api/2.1/jobs/runs/list",
+            name_output="runs",
+            use_paging=True,
+            url_api=paged_api.url,
+            projection=Projection(keep=["run_id"]),
+        )
+
+        assert read_json(temp_dir, "runs") == [{"run_id": run_id} for run_id in range(30)]
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import pytest
+
+from workspace_extractor.exceptions.throttled_error import ThrottledError
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.rate_limiter import RateLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+
+
+class TestRateLimiter:
+    """Tests for the AIMD controller and the retry delays."""
+
+    def test_parse_retry_after(self) -> None:
+        """Both delay-seconds and HTTP-date values are supported."""
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        assert RateLimiter.parse_retry_after("2") == 2.0
+        assert 28 <= RateLimiter.parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+        assert RateLimiter.parse_retry_after("soon") is None
+        assert RateLimiter.parse_retry_after(None) is None
+
+    def test_get_family(self) -> None:
+        assert RateLimiter.get_family("api/2.1/jobs/runs/get") == "api/2.1/jobs"
+        assert RateLimiter.get_family("api/2.2/jobs/list") == "api/2.2/jobs"
+        assert RateLimiter.get_family(None) == "default"
+
+    def test_backoff_uses_full_jitter(self) -> None:
+        """Without Retry-After the delay is drawn between 0 and the exponential cap."""
+        limiter = RateLimiter(base_delay=1, max_delay=5)
+
+        with patch("workspace_extractor.utils.rate_limiter.random.uniform", side_effect=lambda a, b: b):
+            assert [limiter.get_delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+        assert limiter.get_delay(3, retry_after=0.5) == 0.5
+
+    def test_aimd_limit(self) -> None:
+        """A throttle halves the limit once per burst, successes raise it slowly."""
+        limiter = RateLimiter(max_concurrency=8, max_retries=3)
+        responses = iter([FakeResponse(429, {"Retry-After": "0"}), FakeResponse(200)])
+
+        limiter.request("api/2.0/clusters", lambda: next(responses))
+
+        assert limiter.get_stats()["api/2.0/clusters"]["min_limit"] == 4
+        for _ in range(4):
+            limiter.request("api/2.0/clusters", lambda: FakeResponse(200))
+        stats = limiter.get_stats()["api/2.0/clusters"]
+        assert 4.9 < stats["limit"] < 6
+        assert stats["throttles"] == 1
+        assert stats["requests"] == 6
+
+    def test_gives_up_after_max_retries(self) -> None:
+        limiter = RateLimiter(max_retries=2)
+
+        with pytest.raises(ThrottledError) as error:
+            limiter.request("api/2.0/sql", lambda: FakeResponse(503, {"Retry-After": "0"}))
+
+        assert error.value.status_code == 503
+        assert limiter.get_stats()["api/2.0/sql"]["requests"] == 3
+
+    def test_in_flight_requests_follow_the_limit(self) -> None:
+        """A family never has more requests in flight than its limit."""
+        limiter = RateLimiter(max_concurrency=2)
+        state = {"in_flight": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def send() -> FakeResponse:
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return FakeResponse(200)
+
+        threads = [threading.Thread(target=limiter.request, args=("api/2.0/clusters", send)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert state["peak"] == 2
+
+
+class TestManagerThrottling:
+    """Tests for throttled responses through get_and_save."""
+
+    def test_retries_after_retry_after(self, mock_api, temp_dir: str) -> None:
+        """Throttled pages are retried and the statistics land in summary.json."""
+        attempts = {"count": 0}
+
+        def clusters(params: dict, body: dict) -> tuple[int, dict, dict]:
+            attempts["count"] += 1
+            if attempts["count"] <= 2:
+                return 429, {"Retry-After": "0"}, {"error_code": "REQUEST_LIMIT_EXCEEDED"}
+            return 200, {}, {"clusters": [{"cluster_id": "a"}]}
+
+        mock_api.route("api/2.0/clusters/list", clusters)
+        manager = Manager(mock_api.url, "token", temp_dir)
+
+        error, _ = manager.get_and_save(path="api/2.0/clusters/list", name_output="clusters", url_api=mock_api.url)
+        manager.write_results_count_json()
+
+        assert not error
+        assert Manager.results_count["clusters"] == 1
+        with open(os.path.join(temp_dir, "summary.json")) as file:
+            rate_limits = json.load(file)["rate_limits"]
+        assert rate_limits["api/2.0/clusters"]["throttles"] == 2
+        assert rate_limits["api/2.0/clusters"]["requests"] == 3
+
+    def test_endpoint_fails_when_still_throttled(self, mock_api, temp_dir: str) -> None:
+        mock_api.route("api/2.0/clusters/list", lambda params, body: (429, {"Retry-After": "0"}, {}))
+        manager = Manager(mock_api.url, "token", temp_dir, max_retries=1)
+
+        error, message = manager.get_and_save(
+            path="api/2.0/clusters/list", name_output="clusters", url_api=mock_api.url
+        )
+
+        assert error
+        assert "Throttled by api/2.0/clusters after 2 attempts" in message
@@ -0,0 +1,102 @@
+import copy
+
+from workspace_extractor.utils.scrub_plan import ScrubPlan
+from workspace_extractor.utils.util_file import UtilFile
+
+
+def get_run() -> dict:
+    return {
+        "run_id": 42,
+        "run_name": "etl for jane@example.com",
+        "creator_user_name": "jane@example.com",
+        "run_as_user_name": "jane@ex.com",
+        "start_time": 1700000000000,
+        "token": "top-level-secret",
+        "trigger_info": {"run_id": 41},
+        "state": {"life_cycle_state": "TERMINATED", "state_message": "Failed: see https://adb-1234567.8/x"},
+        "tasks": [
+            {
+                "task_key": "ingest@example.com",
+                "token": "nested-secret",
+                "libraries": [{"whl": "/Workspace/Users/jane@ex.com/lib.whl"}, {"pypi": {"package": "numpy"}}],
+                "notebook_task": {"notebook_path": "/Users/jane@example.com/etl", "base_parameters": {"a": "x@y.com"}},
+                "new_cluster": {
+                    "spark_version": "14.3.x-scala2.12",
+                    "custom_tags": {"owner": "john@example.org"},
+                    "spark_env_vars": {"TOKEN": "secret"},
+                },
+            },
+            {"task_key": "report", "sql_task": {"query": {"query_id": "q1"}, "parameters": ["x@y.com", 3]}},
+        ],
+    }
+
+
+def without_env_vars(run: dict) -> dict:
+    run = copy.deepcopy(run)
+    for task in run["tasks"]:
+        task.get("new_cluster", {}).pop("spark_env_vars", None)
+    return run
+
+
+class TestScrubPlan:
+    """Tests for the per entity anonymization plans."""
+
+    def test_unlisted_fields_holding_emails_are_anonymized(self) -> None:
+        [result] = UtilFile.filter_data([get_run()], ["token"], entity="runs")
+
+        assert result["run_as_user_name"] == "[EMAIL_REMOVED]"
+        assert result["tasks"][0]["libraries"][0]["whl"] == "/Workspace/Users/[EMAIL_REMOVED]/lib.whl"
+        assert result["tasks"][0]["task_key"] == "[EMAIL_REMOVED]"
+
+    def test_keys_are_dropped_at_any_depth(self) -> None:
+        [result] = UtilFile.filter_data([get_run()], ["token"], entity="runs")
+
+        assert "token" not in result
+        assert "token" not in result["tasks"][0]
+
+    def test_matches_filter_data_plus_the_entity_drops(self) -> None:
+        run = get_run()
+
+        result = UtilFile.filter_data([run], ["token"], entity="runs")
+
+        assert result == UtilFile.filter_data([without_env_vars(run)], ["token"])
+        assert "spark_env_vars" not in result[0]["tasks"][0]["new_cluster"]
+
+    def test_input_is_not_modified_and_values_off_the_paths_are_shared(self) -> None:
+        run = get_run()
+        original = copy.deepcopy(run)
+
+        result = ScrubPlan.get("runs").apply(run)
+
+        assert run == original
+        assert result == without_env_vars(run)
+        assert result["tasks"][0]["new_cluster"] is not run["tasks"][0]["new_cluster"]
+        assert result["trigger_info"] is run["trigger_info"]
+        assert result["tasks"][1] is run["tasks"][1]
+
+    def test_paths_are_removed_in_place_without_copy(self) -> None:
+        run = get_run()
+
+        result = ScrubPlan.get("runs").apply(run, copy=False)
+
+        assert result is run
+        assert run == without_env_vars(get_run())
+
+    def test_drop_paths(self) -> None:
+        plan = ScrubPlan(drop=["spec.spark_env_vars", "secret"])
+
+        result = plan.apply({"secret": "x", "spec": {"spark_env_vars": {"A": "b"}, "name": "jane@example.com"}})
+
+        assert result == {"spec": {"name": "jane@example.com"}}
+
+    def test_plans_are_compiled_once_per_entity_and_drop(self) -> None:
+        assert ScrubPlan.get("clusters") is ScrubPlan.get("clusters")
+        assert ScrubPlan.get("clusters", ["driver"]) is not ScrubPlan.get("clusters")
+        assert ScrubPlan.get("runs_details") is not None
+        assert ScrubPlan.get("unknown") is None
+
+    def test_filter_data_without_a_plan_is_the_full_walk(self) -> None:
+        runs = [get_run()]
+
+        assert UtilFile.filter_data(runs, [], entity="unknown") == UtilFile.filter_data(runs, [])
+        assert UtilFile.filter_data(runs, [])[0]["tasks"][0]["new_cluster"]["spark_env_vars"] == {"TOKEN": "secret"}
@@ -0,0 +1,224 @@
+import io
+import os
+import shutil
+import time
+from unittest.mock import patch
+
+import pytest
+from tqdm import tqdm
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.mapping_index import MappingIndex
+from workspace_extractor.sizing import Sizing
+
+from tests.conftest import read_json, write_json
+
+
+class TestGetClustersEvents:
+    """Tests for the per-cluster events fan-out."""
+
+    @pytest.fixture
+    def clusters_output(self, temp_dir: str) -> str:
+        clusters = [{"cluster_id": f"ui-{i}", "cluster_source": "UI"} for i in range(12)]
+        write_json(temp_dir, "clusters", clusters)
+        return temp_dir
+
+    @pytest.fixture
+    def events_api(self, mock_api):
+        def events(params: dict, body: dict) -> tuple[int, dict, dict]:
+            time.sleep(0.02)
+            cluster_id = params["cluster_id"]
+            if cluster_id == "ui-3":
+                return 500, {}, {"error_code": "INTERNAL_ERROR"}
+            index = int(cluster_id.split("-")[1])
+            return 200, {}, {"events": [{"cluster_id": cluster_id, "type": "RUNNING"}] * (index + 1)}
+
+        mock_api.route("api/2.0/clusters/events", events)
+        return mock_api
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_events_files_and_counts(self, events_api, clusters_output: str, max_workers: int) -> None:
+        """Every cluster gets its own file and results_count holds the total across clusters."""
+        sizing = Sizing(events_api.url, "token", clusters_output, max_workers=max_workers)
+
+        error, message = sizing.get_clusters_events(0)
+
+        assert error is True
+        assert "1 of 12 clusters failed" in message
+        for i in range(12):
+            exists = os.path.exists(os.path.join(clusters_output, f"events_ui-{i}.json"))
+            assert exists is (i != 3)
+        assert read_json(clusters_output, "events_ui-5") == [{"cluster_id": "ui-5", "type": "RUNNING"}] * 6
+        assert sizing.results_count["events"] == sum(i + 1 for i in range(12) if i != 3)
+
+    def test_concurrency_is_bounded(self, events_api, clusters_output: str) -> None:
+        """No more than max_workers requests are in flight at once."""
+        sizing = Sizing(events_api.url, "token", clusters_output, max_workers=3)
+
+        sizing.get_clusters_events(0)
+
+        assert 1 < events_api.peak_in_flight <= 3
+
+    def test_progress_bar_counts_every_cluster(self, events_api, clusters_output: str) -> None:
+        """The shared progress bar advances once per cluster across all workers."""
+        bars = []
+
+        def recording_tqdm(*args, **kwargs) -> tqdm:
+            bars.append(tqdm(*args, file=io.StringIO(), **kwargs))
+            return bars[-1]
+
+        sizing = Sizing(events_api.url, "token", clusters_output, max_workers=4)
+        with patch("workspace_extractor.sizing.tqdm_notebook", recording_tqdm):
+            sizing.get_clusters_events(0)
+
+        assert bars[0].n == 12
+
+
+class TestGetRunsDetails:
+    """Tests for the concurrent runs/get hydration."""
+
+    @pytest.fixture
+    def runs_output(self, temp_dir: str) -> str:
+        runs = [
+            {
+                "run_id": 1000 + i,
+                "run_name": f"job_{i}",
+                "start_time": 1,
+                "end_time": 2,
+                "tasks": [{"existing_cluster_id": f"c{i}", "state": {"result_state": "SUCCESS"}}],
+            }
+            for i in range(16)
+        ]
+        write_json(temp_dir, "runs", runs)
+        return temp_dir
+
+    @pytest.fixture
+    def runs_api(self, mock_api):
+        def run_get(params: dict, body: dict) -> tuple[int, dict, dict]:
+            time.sleep(0.05)
+            run_id = int(params["run_id"])
+            if run_id == 1007:
+                return 500, {}, {"error_code": "INTERNAL_ERROR"}
+            return 200, {}, {"run_id": run_id, "tasks": [{"task_key": "main"}]}
+
+        mock_api.route("api/2.1/jobs/runs/get", run_get)
+        return mock_api
+
+    def test_parallel_output_matches_serial(self, runs_api, runs_output: str, temp_dir: str) -> None:
+        """Concurrent hydration writes the same files as the serial path, with requests in flight at once."""
+        parallel_output = os.path.join(temp_dir, "parallel")
+        os.makedirs(parallel_output)
+        shutil.copy(os.path.join(runs_output, "runs.json"), parallel_output)
+
+        serial_result = Sizing(runs_api.url, "token", runs_output, max_workers=1).get_runs_details()
+        serial_count = Manager.results_count["runs_details"]
+        serial_peak = runs_api.peak_in_flight
+        runs_api.peak_in_flight = 0
+        parallel_result = Sizing(runs_api.url, "token", parallel_output, max_workers=8).get_runs_details()
+
+        assert serial_result == parallel_result
+        assert serial_result[0] is True and "1 of 16 runs failed" in serial_result[1]
+        assert Manager.results_count["runs_details"] == serial_count == 15
+        serial_files = sorted(f for f in os.listdir(runs_output) if f.startswith("runs_details_"))
+        parallel_files = sorted(f for f in os.listdir(parallel_output) if f.startswith("runs_details_"))
+        assert serial_files == parallel_files
+        assert "runs_details_1007.json" not in serial_files
+        for name in serial_files:
+            with open(os.path.join(runs_output, name)) as a, open(os.path.join(parallel_output, name)) as b:
+                assert a.read() == b.read()
+        assert serial_peak == 1
+        assert 3 < runs_api.peak_in_flight <= 8
+
+
+class TestGetMetadata:
+    """Tests for the scheduled get_metadata flow."""
+
+    @pytest.fixture
+    def workspace_api(self, mock_api):
+        runs = [
+            {
+                "run_id": 7,
+                "run_name": "nightly",
+                "start_time": 1,
+                "end_time": 5,
+                "tasks": [{"existing_cluster_id": "job-cluster", "state": {"result_state": "SUCCESS"}}],
+            }
+        ]
+        routes = {
+            "api/2.0/clusters/list-node-types": {"node_types": [{"node_type_id": "i3.xlarge"}]},
+            "api/2.0/clusters/list": {"clusters": [{"cluster_id": "ui-cluster", "cluster_source": "UI"}]},
+            "api/2.2/jobs/list": {"jobs": [{"job_id": 1}]},
+            "api/2.1/jobs/runs/list": {"runs": runs},
+            "api/2.0/sql/warehouses": {"warehouses": []},
+            "api/2.0/pipelines": {"statuses": []},
+            "api/2.0/sql/history/queries": {"res": [{"query_id": "q1"}]},
+            "api/2.0/clusters/events": {"events": [{"type": "RUNNING"}]},
+            "api/2.1/jobs/runs/get": {"run_id": 7},
+        }
+        for path, payload in routes.items():
+            mock_api.route(path, lambda params, body, payload=payload: (200, {}, payload))
+        return mock_api
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_get_metadata_writes_outputs_and_schedule(self, workspace_api, temp_dir: str, max_workers: int) -> None:
+        """All endpoints are collected and the schedule lands in summary.json."""
+        sizing = Sizing(workspace_api.url, "token", temp_dir)
+
+        sizing.get_metadata(days=1, max_workers=max_workers)
+        sizing.show_results(1)
+
+        for name in ["node_types", "clusters", "jobs", "runs", "queries", "events_ui-cluster", "events_job-cluster"]:
+            assert os.path.exists(os.path.join(temp_dir, f"{name}.json"))
+        assert read_json(temp_dir, "runs_details_7") == [{"run_id": 7}]
+        summary = read_json(temp_dir, "summary")
+        schedule = summary["schedule"]
+        assert set(schedule["steps"]) == {
+            "node_types",
+            "clusters",
+            "jobs",
+            "runs",
+            "warehouses",
+            "pipelines",
+            "queries",
+            "mapping",
+            "events",
+            "runs_details",
+        }
+        assert schedule["steps"]["events"]["start"] >= schedule["steps"]["mapping"]["end"]
+        assert schedule["steps"]["mapping"]["start"] >= schedule["steps"]["runs"]["end"]
+        assert schedule["critical_path"][-1] in ("events", "runs_details")
+        assert summary["events"] == 2
+
+    def test_deadline_applies_to_its_call_only(self, workspace_api, temp_dir: str) -> None:
+        """A later call without a deadline is not stopped by the deadline of an earlier one."""
+        sizing = Sizing(workspace_api.url, "token", temp_dir)
+
+        sizing.get_metadata(days=1, deadline=0)
+        assert not os.path.exists(os.path.join(temp_dir, "runs.json"))
+
+        sizing.get_metadata(days=1)
+        assert sizing.deadline is None
+        assert os.path.exists(os.path.join(temp_dir, "runs.json"))
+
+    def test_mapping_cache_is_reused_on_resume(self, workspace_api, temp_dir: str) -> None:
+        """A resumed extraction with mapping_cache reads the selection from .index_cache."""
+        workspace_api.route("api/2.0/clusters/events", lambda params, body: (404, {}, {"error_code": "NOT_FOUND"}))
+        Sizing(workspace_api.url, "token", temp_dir, checkpoint=True).get_metadata(days=1, mapping_cache=True)
+        assert os.listdir(os.path.join(temp_dir, MappingIndex.cache_folder))
+
+        workspace_api.route("api/2.0/clusters/events", lambda params, body: (200, {}, {"events": []}))
+        with patch.object(MappingIndex, "reduce_runs_file") as reduce_runs:
+            Sizing(workspace_api.url, "token", temp_dir, checkpoint=True).get_metadata(days=1, mapping_cache=True)
+
+        reduce_runs.assert_not_called()
+        assert os.path.exists(os.path.join(temp_dir, "events_ui-cluster.json"))
+
+    def test_mapping_can_select_from_columnar_tables(self, workspace_api, temp_dir: str) -> None:
+        sizing = Sizing(workspace_api.url, "token", temp_dir)
+
+        with patch.object(MappingIndex, "select_from_table", wraps=MappingIndex.select_from_table) as select:
+            sizing.get_metadata(days=1, mapping_columnar=True)
+
+        assert select.called
+        for name in ["events_ui-cluster", "events_job-cluster", "runs_details_7"]:
+            assert os.path.exists(os.path.join(temp_dir, f"{name}.json"))
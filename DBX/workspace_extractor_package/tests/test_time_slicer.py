@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.time_slicer import TimeSlicer
+
+
+class TestTimeSlicer:
+    """Tests for the slice arithmetic."""
+
+    def test_slices_are_contiguous_and_newest_first(self) -> None:
+        """Slices cover the range exactly, sharing their boundaries."""
+        slices = TimeSlicer.get_slices(0, 100, 3)
+
+        assert slices == [(66, 100), (33, 66), (0, 33)]
+
+    def test_slice_count_adapts_to_volume(self) -> None:
+        """A dense first page gives more slices, bounded by max_slices."""
+        page = [{"start_time": t} for t in range(1000, 900, -10)]
+
+        assert TimeSlicer.get_slice_count(page, "start_time", window_start=500, max_slices=8) == 3
+        assert TimeSlicer.get_slice_count(page, "start_time", window_start=0, max_slices=4) == 4
+        assert TimeSlicer.get_slice_count(page, "start_time", window_start=900, max_slices=8) == 1
+        assert TimeSlicer.get_slice_count([], "start_time", window_start=0, max_slices=8) == 1
+
+    def test_merge_drops_boundary_duplicates(self) -> None:
+        """Records returned by two neighbouring slices are kept once."""
+        merged = TimeSlicer.merge([[{"run_id": 3}, {"run_id": 2}], [{"run_id": 2}, {"run_id": 1}]], ("run_id",))
+
+        assert merged == [{"run_id": 3}, {"run_id": 2}, {"run_id": 1}]
+
+    def test_unknown_preset(self) -> None:
+        with pytest.raises(ValueError):
+            TimeSlicer.get_preset("clusters")
+
+
+class TestSlicedPagination:
+    """Tests for get_and_save with time slicing."""
+
+    @pytest.fixture
+    def runs_api(self, mock_api):
+        runs = [{"run_id": i, "start_time": i * 1000} for i in range(200)]
+
+        def runs_list(params: dict, body: dict) -> tuple[int, dict, dict]:
+            start = int(params.get("start_time_from", 0))
+            end = int(params.get("start_time_to", 10**12))
+            selected = [run for run in reversed(runs) if start <= run["start_time"] <= end]
+            position = int(params.get("page_token", 0))
+            page = selected[position : position + 10]
+            more = position + 10 < len(selected)
+            payload = {"runs": page, "has_more": more}
+            if more:
+                payload["next_page_token"] = str(position + 10)
+            return 200, {}, payload
+
+        mock_api.route("api/2.1/jobs/runs/list", runs_list)
+        return mock_api
+
+    def _fetch(self, url: str, output: str, **kwargs) -> tuple[list, Manager]:
+        manager = Manager(url, "token", output)
+        error, _ = manager.get_and_save(
+            path="api/2.1/jobs/runs/list", name_output="runs", use_paging=True, url_api=url, stream=True, **kwargs
+        )
+        assert not error
+        with open(os.path.join(output, "runs.json")) as file:
+            return json.load(file), manager
+
+    def test_sliced_output_matches_single_chain(self, runs_api, temp_dir: str) -> None:
+        """Slicing returns every record of the window once, newest first."""
+        serial, _ = self._fetch(runs_api.url, os.path.join(temp_dir, "serial"))
+        sliced, manager = self._fetch(
+            runs_api.url,
+            os.path.join(temp_dir, "sliced"),
+            time_slicing="runs",
+            time_window=(0, 199 * 1000),
+            max_slices=4,
+        )
+
+        assert sliced == serial
+        assert Manager.results_count["runs"] == 200
+        assert manager.summary_sections["time_slices"]["runs"] == {"slices": 4, "first_page_records": 10}
+        windows = {
+            (call[2]["start_time_from"], call[2]["start_time_to"]) for call in runs_api.calls if "start_time_to" in call[2]
+        }
+        assert len(windows) == 5
+
+    def test_single_page_is_not_sliced(self, runs_api, temp_dir: str) -> None:
+        """A window that fits in the first page is fetched with one request."""
+        sliced, manager = self._fetch(
+            runs_api.url, temp_dir, time_slicing="runs", time_window=(190 * 1000, 199 * 1000), max_slices=4
+        )
+
+        assert [run["run_id"] for run in sliced] == list(range(199, 189, -1))
+        assert len(runs_api.calls) == 1
+        assert manager.summary_sections["time_slices"]["runs"]["slices"] == 0
@@ -0,0 +1,178 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from workspace_extractor.exceptions.deadline_exceeded_error import DeadlineExceededError
+from workspace_extractor.manager import Manager
+from workspace_extractor.utils.dag_scheduler import DagScheduler
+from workspace_extractor.utils.deadline import Deadline
+from workspace_extractor.utils.fan_out import FanOut
+from workspace_extractor.utils.hedger import Hedger
+from workspace_extractor.utils.rate_limiter import RateLimiter
+
+
+class TestTimeouts:
+    """Tests for request timeouts and the extraction deadline."""
+
+    def test_stalled_request_times_out(self, mock_api, temp_dir: str) -> None:
+        """A response slower than the read timeout fails the endpoint instead of hanging."""
+
+        def stalled(params: dict, body: dict) -> tuple[int, dict, dict]:
+            time.sleep(1)
+            return 200, {}, {"clusters": []}
+
+        mock_api.route("api/2.0/clusters/list", stalled)
+        manager = Manager(mock_api.url, "token", temp_dir, timeout=(1, 0.2))
+
+        start = time.perf_counter()
+        error, message = manager.get_and_save(path="api/2.0/clusters/list", name_output="clusters", url_api=mock_api.url)
+
+        assert error
+        assert "timed out" in message
+        assert time.perf_counter() - start < 1
+
+    def test_expired_deadline_stops_requests(self, mock_api, temp_dir: str) -> None:
+        mock_api.route("api/2.0/clusters/list", lambda params, body: (200, {}, {"clusters": []}))
+        manager = Manager(mock_api.url, "token", temp_dir)
+        manager.deadline = Deadline(0)
+
+        error, message = manager.get_and_save(path="api/2.0/clusters/list", name_output="clusters", url_api=mock_api.url)
+
+        assert error
+        assert "Deadline of 0s exceeded" in message
+        assert mock_api.calls == []
+
+    def test_read_timeout_is_capped_by_deadline(self, temp_dir: str) -> None:
+        manager = Manager("https://workspace", "token", temp_dir, timeout=(10, 300))
+        manager.deadline = Deadline(5)
+
+        connect, read = manager.get_request_timeout("api/2.0/clusters/list")
+
+        assert connect <= 5
+        assert read <= 5
+
+    def test_deadline_check(self) -> None:
+        with pytest.raises(DeadlineExceededError):
+            Deadline(0).check("runs")
+        Deadline(60).check("runs")
+
+
+class TestDeadlineScheduling:
+    """Tests for steps and fan-out items skipped once the deadline has passed."""
+
+    def test_scheduler_skips_steps_after_deadline(self) -> None:
+        scheduler = DagScheduler(max_workers=2)
+        scheduler.add_step("slow", lambda: time.sleep(0.2))
+        scheduler.add_step("fast", lambda: None)
+        scheduler.add_step("after", lambda: None, depends_on=["slow"])
+
+        summary = scheduler.run(deadline=Deadline(0.1))
+
+        assert summary["steps"]["fast"]["skipped"] is False
+        assert summary["steps"]["after"]["skipped"] is True
+        assert summary["steps"]["after"]["error"] is True
+        assert scheduler.results["after"][0] is True
+
+    def test_fan_out_skips_items_after_deadline(self) -> None:
+        def task(item: int) -> tuple[bool, str]:
+            time.sleep(0.1)
+            return False, "ok"
+
+        results = FanOut.run([1, 2, 3], task, deadline=Deadline(0.15))
+
+        assert results[:2] == [(False, "ok"), (False, "ok")]
+        assert results[2][0] is True
+        assert "Deadline" in results[2][1]
+
+
+class TestHedger:
+    """Tests for hedged requests."""
+
+    def test_slow_request_is_hedged(self) -> None:
+        """A call slower than p95 gets a copy, and the faster copy is returned."""
+        hedger = Hedger(min_samples=5)
+        for _ in range(5):
+            hedger.record("api/2.1/jobs/runs/get", 0.01)
+        calls = {"count": 0}
+        lock = threading.Lock()
+
+        def send() -> str:
+            with lock:
+                calls["count"] += 1
+                attempt = calls["count"]
+            if attempt == 1:
+                time.sleep(0.5)
+                return "slow"
+            return "fast"
+
+        start = time.perf_counter()
+        assert hedger.request("api/2.1/jobs/runs/get", send) == "fast"
+        assert time.perf_counter() - start < 0.4
+        assert hedger.get_stats()["api/2.1/jobs/runs/get"]["hedged"] == 1
+        assert hedger.get_stats()["api/2.1/jobs/runs/get"]["hedge_wins"] == 1
+        hedger.close()
+
+    def test_no_hedging_before_enough_samples(self) -> None:
+        hedger = Hedger(min_samples=5)
+
+        assert hedger.request("api/2.0/clusters/list", lambda: "only") == "only"
+        assert hedger.get_threshold("api/2.0/clusters/list") is None
+        assert hedger.get_stats() == {}
+        hedger.close()
+
+    def test_failed_copy_falls_back_to_the_other(self) -> None:
+        hedger = Hedger(min_samples=1)
+        hedger.record("api/2.0/clusters/list", 0.01)
+        calls = {"count": 0}
+
+        def send() -> str:
+            calls["count"] += 1
+            if calls["count"] == 1:
+                time.sleep(0.1)
+                return "first"
+            raise ConnectionError("reset")
+
+        assert hedger.request("api/2.0/clusters/list", send) == "first"
+        hedger.close()
+
+    def test_copy_takes_its_own_rate_limiter_slot(self) -> None:
+        """The copy is counted in flight, and is not sent when the family has no free slot."""
+        family = "api/2.1/jobs"
+        ok = requests.Response()
+        ok.status_code = 200
+
+        def send() -> requests.Response:
+            time.sleep(0.1)
+            return ok
+
+        for max_concurrency, hedged in [(2, 1), (1, 0)]:
+            limiter = RateLimiter(max_concurrency=max_concurrency)
+            hedger = Hedger(min_samples=1, rate_limiter=limiter)
+            hedger.record("api/2.1/jobs/runs/get", 0.01)
+
+            response = limiter.request(family, lambda: hedger.request("api/2.1/jobs/runs/get", send, family))
+
+            stats = limiter.get_stats()[family]
+            assert response is ok
+            assert stats["peak_in_flight"] == 1 + hedged
+            assert stats["requests"] == 1 + hedged
+            assert hedger.get_stats()["api/2.1/jobs/runs/get"]["hedged"] == hedged
+            assert hedger.get_stats()["api/2.1/jobs/runs/get"]["skipped"] == 1 - hedged
+            hedger.close()
+            time.sleep(0.15)
+            assert limiter.families[family]["in_flight"] == 0
+
+    def test_manager_reports_hedging(self, mock_api, temp_dir: str) -> None:
+        mock_api.route("api/2.0/clusters/list", lambda params, body: (200, {}, {"clusters": [{"cluster_id": "a"}]}))
+        manager = Manager(mock_api.url, "token", temp_dir, hedge=True)
+        manager.hedger.min_samples = 1
+
+        for _ in range(3):
+            error, _ = manager.get_and_save(path="api/2.0/clusters/list", name_output="clusters", url_api=mock_api.url)
+            assert not error
+
+        assert len(manager.hedger.latencies["api/2.0/clusters/list"]) == 3
+        manager.close()
+        assert manager.hedger._executor is None
@@ -245,17 +245,20 @@ class TestCompressFolderToZip(TestZipFileOperations):
 
         assert result is None
 
-    @patch('workspace_extractor.utils.util_file.UtilFile.split_zip_file')
-    def test_compress_folder_to_zip_triggers_split(self, mock_split, sample_large_folder: str, temp_dir: str) -> None:
-        """Test that large zip files trigger splitting."""
+    @patch('workspace_extractor.utils.util_file.UtilFile.bundle_volumes')
+    def test_compress_folder_to_zip_triggers_split(self, mock_bundle, sample_large_folder: str, temp_dir: str) -> None:
+        """Test that large archives are split into volumes that get bundled."""
         output_path = os.path.join(temp_dir, "large_archive")
-        mock_split.return_value = "split_result.zip"
+        mock_bundle.return_value = "split_result.zip"
 
         result = UtilFile.compress_folder_to_zip(
             sample_large_folder, output_path, split_size_mb=1
         )
 
-        mock_split.assert_called_once()
+        mock_bundle.assert_called_once()
+        volumes, zip_file_path = mock_bundle.call_args[0]
+        assert len(volumes) > 1
+        assert zip_file_path == f"{output_path}.zip"
         assert result == "split_result.zip"
 
     @patch('builtins.print')
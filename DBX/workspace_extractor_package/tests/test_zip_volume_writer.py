@@ -0,0 +1,166 @@
+import os
+import random
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from workspace_extractor.utils.util_file import UtilFile
+from workspace_extractor.utils.zip_volume_writer import ZipVolumeWriter
+
+
+@pytest.fixture
+def output_folder(temp_dir: str) -> str:
+    """An output folder of JSON files, some of them poorly compressible."""
+    folder = os.path.join(temp_dir, "output")
+    generator = random.Random(7)
+    for i in range(30):
+        name = f"events/events_{i}.json" if i % 3 else f"runs_{i:02d}.json"
+        os.makedirs(os.path.dirname(os.path.join(folder, name)), exist_ok=True)
+        with open(os.path.join(folder, name), "wb") as file:
+            file.write(b'[{"run_id": %d, "blob": "' % i + generator.randbytes(20_000).hex().encode() + b'"}]')
+    open(os.path.join(folder, "empty.json"), "w").close()
+    return folder
+
+
+def read_folder(folder: str) -> dict[str, bytes]:
+    contents = {}
+    for root, _, files in os.walk(folder):
+        for file in files:
+            with open(os.path.join(root, file), "rb") as f:
+                contents[os.path.relpath(os.path.join(root, file), folder).replace(os.sep, "/")] = f.read()
+    return contents
+
+
+def read_volumes(volumes: list[str]) -> dict[str, bytes]:
+    contents = {}
+    for volume in volumes:
+        with zipfile.ZipFile(volume) as zip_file:
+            assert zip_file.testzip() is None
+            for name in zip_file.namelist():
+                assert name not in contents
+                contents[name] = zip_file.read(name)
+    return contents
+
+
+class TestZipVolumeWriter:
+    """Tests for the size-capped zip volume writer."""
+
+    def test_single_volume_keeps_the_archive_name(self, output_folder: str, temp_dir: str) -> None:
+        volumes = UtilFile.compress_folder_to_volumes(output_folder, os.path.join(temp_dir, "archive"))
+
+        assert volumes == [os.path.join(temp_dir, "archive.zip")]
+        assert read_volumes(volumes) == read_folder(output_folder)
+
+    def test_volumes_are_capped_and_independently_readable(self, output_folder: str, temp_dir: str) -> None:
+        """Every volume stays within the cap, opens on its own, and together they hold the folder."""
+        base = os.path.join(temp_dir, "archive")
+        writer = ZipVolumeWriter(base, max_bytes=100_000)
+        for name, _ in sorted(read_folder(output_folder).items()):
+            writer.write(os.path.join(output_folder, name), name)
+        volumes = writer.close()
+
+        assert len(volumes) > 2
+        assert volumes == [f"{base}_{i:02d}.zip" for i in range(1, len(volumes) + 1)]
+        assert not os.path.exists(f"{base}.zip")
+        assert all(os.path.getsize(volume) <= 100_000 for volume in volumes)
+        assert read_volumes(volumes) == read_folder(output_folder)
+
+    def test_oversized_entry_gets_its_own_volume(self, output_folder: str, temp_dir: str) -> None:
+        writer = ZipVolumeWriter(os.path.join(temp_dir, "archive"), max_bytes=1000)
+        writer.write(os.path.join(output_folder, "empty.json"), "empty.json")
+        writer.write(os.path.join(output_folder, "runs_00.json"), "runs_00.json")
+        writer.write(os.path.join(output_folder, "empty.json"), "last.json")
+        volumes = writer.close()
+
+        assert [list(read_volumes([volume])) for volume in volumes] == [["empty.json"], ["runs_00.json"], ["last.json"]]
+
+    @pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA])
+    def test_matches_zipfile_write(self, output_folder: str, temp_dir: str, compression: int) -> None:
+        """A single volume is the archive ZipFile.write() gives."""
+        reference = os.path.join(temp_dir, "reference.zip")
+        with zipfile.ZipFile(reference, "w", compression) as zip_file:
+            for file_path, arcname in ZipVolumeWriter.get_folder_entries(output_folder):
+                zip_file.write(file_path, arcname)
+        writer = ZipVolumeWriter(os.path.join(temp_dir, "archive"), None, compression=compression)
+        writer.write_all(ZipVolumeWriter.get_folder_entries(output_folder))
+        volumes = writer.close()
+
+        with open(reference, "rb") as expected, open(volumes[0], "rb") as actual:
+            assert actual.read() == expected.read()
+
+    @pytest.mark.parametrize("compression", sorted(ZipVolumeWriter.compressions))
+    def test_every_codec_round_trips(self, output_folder: str, temp_dir: str, compression: str) -> None:
+        """Volumes of every codec stay within the cap and read back as the folder."""
+        writer = ZipVolumeWriter(
+            os.path.join(temp_dir, "archive"), max_bytes=100_000, compression=ZipVolumeWriter.get_compression(compression)
+        )
+        writer.write_all(ZipVolumeWriter.get_folder_entries(output_folder))
+        volumes = writer.close()
+
+        assert len(volumes) > 1
+        assert all(os.path.getsize(volume) <= 100_000 for volume in volumes)
+        assert read_volumes(volumes) == read_folder(output_folder)
+
+    def test_every_file_is_compressed_once(self, output_folder: str, temp_dir: str) -> None:
+        """Files are only read by ZipFile.write(), once each, even when volumes roll."""
+        writer = ZipVolumeWriter(os.path.join(temp_dir, "archive"), max_bytes=100_000)
+        with patch.object(zipfile.ZipFile, "write", autospec=True, side_effect=zipfile.ZipFile.write) as write:
+            writer.write_all(ZipVolumeWriter.get_folder_entries(output_folder))
+        volumes = writer.close()
+
+        assert len(volumes) > 2
+        assert sorted(call.args[2] for call in write.call_args_list) == sorted(read_folder(output_folder))
+
+    @pytest.mark.parametrize("compression, level", [("stored", None), ("deflate", 1), ("deflate", 9), ("lzma", None)])
+    def test_compression_is_configurable(self, output_folder: str, temp_dir: str, compression: str, level: int | None) -> None:
+        result = UtilFile.compress_folder_to_zip(
+            output_folder, os.path.join(temp_dir, "archive"), compression=compression, compresslevel=level
+        )
+
+        with zipfile.ZipFile(result) as zip_file:
+            assert {info.compress_type for info in zip_file.infolist()} == {ZipVolumeWriter.get_compression(compression)}
+        assert read_volumes([result]) == read_folder(output_folder)
+
+    def test_large_archive_is_bundled_as_stored_volumes(self, output_folder: str, temp_dir: str) -> None:
+        """Volumes of an archive over the split size are bundled into one file, without recompression."""
+        result = UtilFile.compress_folder_to_zip(
+            output_folder, os.path.join(temp_dir, "archive"), split_size_mb=1, compression="stored"
+        )
+
+        assert result == os.path.join(temp_dir, "we_archive_data_2_parts.zip")
+        assert sorted(os.listdir(temp_dir)) == ["output", "we_archive_data_2_parts.zip"]
+        extracted = os.path.join(temp_dir, "extracted")
+        with zipfile.ZipFile(result) as bundle:
+            assert bundle.namelist() == ["archive_01.zip", "archive_02.zip"]
+            assert {info.compress_type for info in bundle.infolist()} == {zipfile.ZIP_STORED}
+            bundle.extractall(extracted)
+        volumes = [os.path.join(extracted, name) for name in sorted(os.listdir(extracted))]
+        assert all(os.path.getsize(volume) <= 1024 * 1024 for volume in volumes)
+        assert read_volumes(volumes) == read_folder(output_folder)
+
+    def test_hidden_directories_are_not_archived(self, output_folder: str, temp_dir: str) -> None:
+        expected = read_folder(output_folder)
+        for hidden in [".checkpoints", ".index_cache", ".merge_runs"]:
+            os.makedirs(os.path.join(output_folder, hidden))
+            with open(os.path.join(output_folder, hidden, "state.json"), "w") as file:
+                file.write("{}")
+
+        volumes = UtilFile.compress_folder_to_volumes(output_folder, os.path.join(temp_dir, "archive"))
+
+        assert read_volumes(volumes) == expected
+
+    def test_unknown_compression(self, output_folder: str, temp_dir: str) -> None:
+        with pytest.raises(ValueError, match="Unknown compression"):
+            UtilFile.compress_folder_to_volumes(output_folder, os.path.join(temp_dir, "archive"), compression="brotli")
+
+    @pytest.mark.skipif(hasattr(zipfile, "ZIP_ZSTANDARD"), reason="zipfile supports Zstandard")
+    def test_zstd_requires_zipfile_support(self) -> None:
+        with pytest.raises(ValueError, match="ZIP_ZSTANDARD"):
+            ZipVolumeWriter.get_compression("zstd")
+
+    def test_failure_leaves_no_volume(self, temp_dir: str) -> None:
+        result = UtilFile.compress_folder_to_volumes(os.path.join(temp_dir, "missing"), os.path.join(temp_dir, "archive"))
+
+        assert result is None
+        assert os.listdir(temp_dir) == []